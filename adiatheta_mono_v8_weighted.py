@@ -5,165 +5,509 @@ Dashboard για Αδιάθετα Ραντεβου - 401 ΓΣΝ Αθηνών
 
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import dash
+import flask
 from dash import dcc, html, Input, Output, callback, dash_table, State
 import dash_bootstrap_components as dbc
 from datetime import datetime, timedelta
 import warnings
 import os
+import json
+import hashlib
+import importlib.util
+import io
+import codecs
+import queue
+import urllib.parse
+import shutil
+import functools
+import bisect
+import contextlib
+import cProfile
+import pstats
+import logging
+import glob
+import heapq
+import threading
+import time
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 warnings.filterwarnings('ignore')
 
+# Μηνύματα φόρτωσης/ανανέωσης σε INFO, λεπτομέρειες ανά αλληλεπίδραση (φίλτρα, ανακατανομή) σε DEBUG
+log = logging.getLogger('adiatheta')
+LOG_LEVEL = 'INFO'
+
+
+def configure_logging(level=LOG_LEVEL):
+    """Έξοδος των μηνυμάτων του dashboard στο stderr με χρόνο και επίπεδο (για εκτέλεση ως script)"""
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s %(message)s', '%H:%M:%S'))
+        log.addHandler(handler)
+    log.setLevel(level)
+
 # ══════════════════════════════════════════════════════════════════════════════
 # ΦΟΡΤΩΣΗ ΔΕΔΟΜΕΝΩΝ
 # ══════════════════════════════════════════════════════════════════════════════
 
-def load_unavailable_appointments_data():
+# Δυαδική cache (στήλες .npy + manifest.json) του καθαρισμένου DataFrame.
+# Αυξήστε το CACHE_VERSION όταν αλλάζει η λογική καθαρισμού, ώστε να ακυρώνονται οι παλιές caches.
+CACHE_VERSION = 4
+CACHE_DIR_NAME = '.adiatheta_cache'
+USE_DATA_CACHE = True
+
+
+def _hash_file(path, block_size=1 << 20, limit=None):
+    """Hash περιεχομένου αρχείου (blake2b) με ανάγνωση σε blocks - με limit μόνο των πρώτων limit bytes"""
+    digest = hashlib.blake2b(digest_size=16)
+    remaining = limit
+    with open(path, 'rb') as fh:
+        while remaining is None or remaining > 0:
+            block = fh.read(block_size if remaining is None else min(block_size, remaining))
+            if not block:
+                break
+            digest.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return digest.hexdigest()
+
+
+def _cache_dir_for(csv_path):
+    """Φάκελος cache για ένα αρχείο CSV (δίπλα στο αρχείο)"""
+    folder = os.path.dirname(os.path.abspath(csv_path))
+    return os.path.join(folder, CACHE_DIR_NAME, os.path.basename(csv_path))
+
+
+def _save_frame_cache(df, csv_path, variant='full'):
     """
-    Φόρτωση πραγματικών δεδομένων με εστίαση στα αδιάθετα ραντεβου
+    Αποθήκευση του καθαρισμένου DataFrame σε στήλες .npy.
+    Το variant διακρίνει caches που παράχθηκαν με διαφορετικό τρόπο φόρτωσης (π.χ. full / chunked).
+    Το manifest γράφεται τελευταίο (atomic replace), οπότε μια μισογραμμένη cache δεν διαβάζεται ποτέ.
     """
-    print("📄 Φόρτωση δεδομένων αδιάθετων ραντεβου...")
-    
-    # Προσπάθεια φόρτωσης του CSV αρχείου
-    possible_files = ['OPSY_401_clean.csv']
-    df = None
-    used_file = None
-    
-    for filename in possible_files:
-        try:
-            df = pd.read_csv(filename, encoding='utf-8')
-            used_file = filename
-            print(f"✅ Επιτυχής φόρτωση: {filename}")
-            print(f"📋 Στήλες αρχείου: {list(df.columns)}")
-            print(f"📏 Μέγεθος δεδομένων: {df.shape}")
-            break
-        except UnicodeDecodeError:
-            try:
-                df = pd.read_csv(filename, encoding='latin-1')
-                used_file = filename
-                print(f"✅ Επιτυχής φόρτωση με latin-1 encoding: {filename}")
-                break
-            except Exception as e:
-                print(f"❌ Σφάλμα φόρτωσης {filename}: {str(e)}")
-                continue
-        except Exception as e:
-            print(f"❌ Σφάλμα φόρτωσης {filename}: {str(e)}")
+    try:
+        cache_dir = _cache_dir_for(csv_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        stat = os.stat(csv_path)
+        generation = os.urandom(6).hex()
+
+        def save_array(name, values):
+            filename = f"{generation}_{name}.npy"
+            np.save(os.path.join(cache_dir, filename), values, allow_pickle=False)
+            return filename
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            entry = {'name': col}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                entry['kind'] = 'category'
+                entry['ordered'] = bool(series.cat.ordered)
+                entry['codes'] = save_array(f"c{i}_codes", series.cat.codes.to_numpy())
+                # Οι κατηγορίες κρατούν τον τύπο τους (κείμενο ως unicode array, αριθμοί/ημερομηνίες ως έχουν)
+                categories = series.cat.categories
+                entry['categories_dtype'] = str(categories.dtype)
+                entry['categories'] = save_array(f"c{i}_cats", categories.to_numpy(dtype=str) if categories.dtype == object
+                                                 else categories.to_numpy())
+            elif pd.api.types.is_datetime64_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+                entry['kind'] = 'array'
+                entry['values'] = save_array(f"c{i}", series.to_numpy())
+            else:
+                # Στήλες κειμένου: factorize σε κωδικούς + μοναδικές τιμές (χωρίς pickle)
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                entry['kind'] = 'object'
+                entry['codes'] = save_array(f"c{i}_codes", codes)
+                entry['categories'] = save_array(f"c{i}_cats", np.asarray(uniques, dtype=object).astype(str))
+            columns.append(entry)
+
+        manifest = {
+            'version': CACHE_VERSION,
+            'variant': variant,
+            'source': {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'blake2b': _hash_file(csv_path),
+            },
+            'index': save_array('index', df.index.to_numpy()),
+            'columns': columns,
+        }
+        _write_manifest(cache_dir, manifest)
+
+        # Καθαρισμός αρχείων από προηγούμενες γενιές της cache
+        for filename in os.listdir(cache_dir):
+            if filename.endswith('.npy') and not filename.startswith(generation + '_'):
+                os.remove(os.path.join(cache_dir, filename))
+        log.info(f"💾 Αποθήκευση cache: {cache_dir}")
+    except Exception as e:
+        log.warning(f"⚠️ Αδυναμία αποθήκευσης cache για {csv_path}: {e}")
+
+
+def _write_manifest(cache_dir, manifest):
+    tmp_path = os.path.join(cache_dir, f"manifest.json.tmp-{os.getpid()}")
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(cache_dir, 'manifest.json'))
+
+
+def _load_frame_cache(csv_path, variant='full'):
+    """
+    Φόρτωση του καθαρισμένου DataFrame από την cache, αν είναι έγκυρη για το τρέχον CSV.
+    Επιστρέφει None αν η cache λείπει, είναι άλλης έκδοσης ή το αρχείο έχει αλλάξει.
+    """
+    cache_dir = _cache_dir_for(csv_path)
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, encoding='utf-8') as fh:
+            manifest = json.load(fh)
+        if manifest.get('version') != CACHE_VERSION:
+            log.info(f"   ♻️ Cache παλιάς έκδοσης ({manifest.get('version')} ≠ {CACHE_VERSION}) - αναδημιουργία")
+            return None
+        if manifest.get('variant') != variant:
+            return None
+
+        source = manifest['source']
+        stat = os.stat(csv_path)
+        if stat.st_size != source['size']:
+            return None
+        if stat.st_mtime_ns != source['mtime_ns']:
+            # Ίδιο μέγεθος αλλά άλλο mtime: ελέγχουμε το περιεχόμενο πριν ακυρώσουμε την cache
+            if _hash_file(csv_path) != source['blake2b']:
+                return None
+            source['mtime_ns'] = stat.st_mtime_ns
+            _write_manifest(cache_dir, manifest)
+
+        def load_array(filename):
+            return np.load(os.path.join(cache_dir, filename), allow_pickle=False)
+
+        data = {}
+        for entry in manifest['columns']:
+            if entry['kind'] == 'category':
+                data[entry['name']] = pd.Categorical.from_codes(
+                    load_array(entry['codes']),
+                    categories=load_array(entry['categories']).astype(entry['categories_dtype']),
+                    ordered=entry['ordered']
+                )
+            elif entry['kind'] == 'object':
+                data[entry['name']] = pd.Categorical.from_codes(
+                    load_array(entry['codes']),
+                    categories=load_array(entry['categories']).astype(object)
+                ).astype(object)
+            else:
+                data[entry['name']] = load_array(entry['values'])
+
+        return pd.DataFrame(data, index=load_array(manifest['index']))
+    except Exception as e:
+        log.warning(f"⚠️ Άκυρη cache για {csv_path}: {e}")
+        return None
+
+
+def clear_frame_cache(csv_path):
+    """Διαγραφή της cache ενός αρχείου CSV"""
+    shutil.rmtree(_cache_dir_for(csv_path), ignore_errors=True)
+
+
+# Δημιουργία λεξικού για τις επιθυμητές στήλες και τα πιθανά ονόματά τους
+COLUMN_MAPPING = {
+    'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': ['ΑΔΙΑΘΕΤΑ ΡΑΝΤΕΒΟΥ', 'Ο ΛΥΥ ΔΕΝ ΠΡΟΣΗΛΘΕ', 'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'unavailable', 'ΑΔΙΑΘΕΤΑ'],
+    'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': ['ΔΙΑΘΕΣΙΜΑ ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'available', 'ΔΙΑΘΕΣΙΜΑ'],
+    'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ': ['ΡΑΝΤΕΒΟΥ ΠΟΥ ΚΛΕΙΣΤΗΚΑΝ', 'ΠΡΑΓΜΑΤΟΠΟΙΗΘΗΚΑΝ', 'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ', 'booked', 'ΚΛΕΙΣΤΗΚΑΝ'],
+    'ΤΜΗΜΑ': ['ΤΜΗΜΑ', 'department', 'DEPARTMENT', 'ΤΜΗΜΑΤΑ', 'DEPT'],
+    'ΟΝΟΜΑ_ΟΜΑΔΑΣ': ['ΟΝΟΜΑ ΟΜΑΔΑΣ', 'ΟΜΑΔΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ', 'team', 'ΚΑΤΗΓΟΡΙΑ ΛΥΥ', 'ΟΜΑΔΕΣ'],
+    'ΜΗΝΑΣ-ΕΤΟΣ': ['ΜΗΝΑΣ-ΕΤΟΣ', 'ΜΗΝΑΣΕΤΟΣ', 'ΜΗΝΑΣ_ΕΤΟΣ', 'MONTH-YEAR', 'date', 'DATE', 'ΜΗΝΑΣ', 'ΗΜΕΡΟΜΗΝΙΑ']
+}
+REQUIRED_COLUMNS = ['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'ΤΜΗΜΑ']
+NUMERIC_COLUMNS = ['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ']
+# Στήλες που διαβάζονται πάντα ως κείμενο (ο τύπος δεν εξαρτάται από το αν ένα chunk έχει μόνο αριθμητικούς κωδικούς)
+TEXT_COLUMNS = ['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ', 'ΜΗΝΑΣ-ΕΤΟΣ']
+TEXT_DTYPES = {name: str for col in TEXT_COLUMNS for name in [col] + COLUMN_MAPPING[col]}
+DATE_FORMATS = ['%Y-%m', '%m/%Y', '%Y/%m', '%m-%Y', '%d/%m/%Y', '%Y-%m-%d']
+DATE_SAMPLE_SIZE = 200  # πλήθος μοναδικών τιμών ΜΗΝΑΣ-ΕΤΟΣ για την ανίχνευση formats
+
+# Μέγεθος chunk για streaming ανάγνωση (None = ανάγνωση ολόκληρου του αρχείου).
+# Για πολύ μεγάλα exports (π.χ. όλο το νοσοκομείο) ορίστε π.χ. 250_000 γραμμές.
+INGEST_CHUNKSIZE = None
+
+
+def _resolve_column_mapping(columns, verbose=True):
+    """
+    Αντιστοίχιση στηλών αρχείου → τυποποιημένα ονόματα.
+    Επιστρέφει λεξικό {όνομα στο αρχείο: τυποποιημένο όνομα} για τις στήλες που χρειάζονται.
+    """
+    columns = list(columns)
+    mapping = {}
+    for standard_name, possible_names in COLUMN_MAPPING.items():
+        if standard_name in columns:
+            mapping[standard_name] = standard_name
+            if verbose:
+                log.info(f"   ✅ Στήλη {standard_name} υπάρχει ήδη")
             continue
-    
-    if df is None:
-        print("❌ ΣΦΑΛΜΑ: Δεν βρέθηκε κανένα έγκυρο CSV αρχείο!")
-        print("📋 Βεβαιωθείτε ότι έχετε ένα από τα παρακάτω αρχεία στον φάκελο:")
-        for filename in possible_files:
-            print(f"   - {filename}")
-        return pd.DataFrame()  # Επιστροφή κενού DataFrame
-    
-    print("🧹 Καθαρισμός και προετοιμασία δεδομένων...")
-    
-    # Εκκαθάριση ονομάτων στηλών
-    df.columns = df.columns.str.strip()
-    
-    # Διορθωμένη αντιστοίχιση στηλών
-    print("🔍 Έλεγχος και αντιστοίχιση στηλών...")
-    
-    # Δημιουργία λεξικού για τις επιθυμητές στήλες και τα πιθανά ονόματά τους
-    column_mapping = {
-        'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': ['ΑΔΙΑΘΕΤΑ ΡΑΝΤΕΒΟΥ', 'Ο ΛΥΥ ΔΕΝ ΠΡΟΣΗΛΘΕ', 'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'unavailable', 'ΑΔΙΑΘΕΤΑ'],
-        'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': ['ΔΙΑΘΕΣΙΜΑ ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'available', 'ΔΙΑΘΕΣΙΜΑ'],
-        'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ': ['ΡΑΝΤΕΒΟΥ ΠΟΥ ΚΛΕΙΣΤΗΚΑΝ', 'ΠΡΑΓΜΑΤΟΠΟΙΗΘΗΚΑΝ', 'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ', 'booked', 'ΚΛΕΙΣΤΗΚΑΝ'],
-        'ΤΜΗΜΑ': ['ΤΜΗΜΑ', 'department', 'DEPARTMENT', 'ΤΜΗΜΑΤΑ', 'DEPT'],
-        'ΟΝΟΜΑ_ΟΜΑΔΑΣ': ['ΟΝΟΜΑ ΟΜΑΔΑΣ', 'ΟΜΑΔΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ', 'team', 'ΚΑΤΗΓΟΡΙΑ ΛΥΥ', 'ΟΜΑΔΕΣ'],
-        'ΜΗΝΑΣ-ΕΤΟΣ': ['ΜΗΝΑΣ-ΕΤΟΣ', 'ΜΗΝΑΣΕΤΟΣ', 'ΜΗΝΑΣ_ΕΤΟΣ', 'MONTH-YEAR', 'date', 'DATE', 'ΜΗΝΑΣ', 'ΗΜΕΡΟΜΗΝΙΑ']
-    }
-    
-    # Ελέγχουμε αν οι στήλες υπάρχουν ήδη ή χρειάζονται mapping
-    for standard_name, possible_names in column_mapping.items():
-        if standard_name in df.columns:
-            print(f"   ✅ Στήλη {standard_name} υπάρχει ήδη")
+        for possible_name in possible_names:
+            if possible_name in columns and possible_name not in mapping:
+                mapping[possible_name] = standard_name
+                if verbose:
+                    log.info(f"   ✅ Mapping: {possible_name} → {standard_name}")
+                break
         else:
-            found = False
-            for possible_name in possible_names:
-                if possible_name in df.columns:
-                    df[standard_name] = df[possible_name]
-                    print(f"   ✅ Mapping: {possible_name} → {standard_name}")
-                    found = True
-                    break
-            if not found:
-                print(f"   ❌ Δεν βρέθηκε στήλη για: {standard_name}")
-    
-    # Έλεγχος για απαραίτητες στήλες μετά το mapping
-    required_columns = ['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'ΤΜΗΜΑ']
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    
-    if missing_columns:
-        print(f"❌ ΣΦΑΛΜΑ: Λείπουν απαραίτητες στήλες: {missing_columns}")
-        print("📋 Διαθέσιμες στήλες μετά το mapping:")
-        for i, col in enumerate(df.columns):
-            print(f"   {i+1}. {col}")
-        return pd.DataFrame()
-    
+            if verbose:
+                log.error(f"   ❌ Δεν βρέθηκε στήλη για: {standard_name}")
+    return mapping
+
+
+def _detect_date_formats(sample):
+    """
+    Ανίχνευση των formats ημερομηνίας σε ένα μικρό δείγμα μοναδικών τιμών.
+    Επιστρέφει τα formats που ταιριάζουν σε τουλάχιστον μία τιμή, με φθίνουσα συχνότητα.
+    """
+    matches = {}
+    for date_format in DATE_FORMATS:
+        count = int(pd.to_datetime(sample, format=date_format, errors='coerce').notna().sum())
+        if count > 0:
+            matches[date_format] = count
+    return sorted(matches, key=lambda f: (-matches[f], DATE_FORMATS.index(f)))
+
+
+def _parse_month_year(values):
+    """
+    Parsing της στήλης ΜΗΝΑΣ-ΕΤΟΣ.
+    Κάθε διακριτή τιμή γίνεται parse μία φορά (οι μήνες είναι λίγες εκατοντάδες) και το αποτέλεσμα
+    αντιστοιχίζεται πίσω στις γραμμές, οπότε το κόστος είναι O(μοναδικές τιμές) και τα αρχεία
+    με ανάμεικτα formats διαβάζονται σωστά.
+    Επιστρέφει (Series με datetimes/NaT, περιγραφή των formats που χρησιμοποιήθηκαν).
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    unique_strings = pd.Index(uniques).astype(str).str.strip()
+    parsed_uniques = pd.Series(pd.NaT, index=range(len(unique_strings)), dtype='datetime64[ns]')
+
+    # Ανίχνευση formats σε δείγμα (ισαπέχουσες μοναδικές τιμές) και εφαρμογή τους στις υπόλοιπες
+    step = max(1, len(unique_strings) // DATE_SAMPLE_SIZE)
+    detected = _detect_date_formats(unique_strings[::step])
+    candidate_formats = detected + [f for f in DATE_FORMATS if f not in detected]
+
+    used_formats = []
+    for date_format in candidate_formats:
+        pending = parsed_uniques.isna().to_numpy()
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(unique_strings[pending], format=date_format, errors='coerce')
+        if parsed.notna().any():
+            parsed_uniques[pending] = parsed
+            used_formats.append(date_format)
+
+    # Ό,τι απομένει: γενικό parsing ανά τιμή (λίγες διακριτές τιμές, άρα φθηνό)
+    pending = parsed_uniques.isna().to_numpy()
+    if pending.any():
+        try:
+            parsed = pd.to_datetime(unique_strings[pending], format='mixed', errors='coerce')
+            if parsed.notna().any():
+                parsed_uniques[pending] = parsed
+                used_formats.append('mixed')
+        except Exception:
+            pass
+
+    # Αντιστοίχιση πίσω στις γραμμές (ο κωδικός -1 δείχνει στο NaT που προστίθεται στο τέλος)
+    lookup = np.append(parsed_uniques.to_numpy(), np.datetime64('NaT', 'ns'))
+    result = pd.Series(lookup[codes], index=values.index)
+    return result, (', '.join(used_formats) if used_formats else None)
+
+
+def _clean_frame(df, mapping, keep_raw=True, verbose=True):
+    """
+    Εφαρμογή mapping στηλών, μετατροπής αριθμητικών τιμών και parsing ημερομηνιών σε ένα DataFrame (ή chunk).
+    Με keep_raw=False κρατούνται μόνο οι στήλες που χρειάζεται το dashboard.
+    """
+    # Μετονομασία αντί για αντιγραφή: οι αντιστοιχισμένες στήλες δεν διπλασιάζονται στη μνήμη
+    df = df.rename(columns=mapping)
+    if not keep_raw:
+        df = df[[col for col in COLUMN_MAPPING if col in df.columns]]
+
     # Δημιουργία στήλης ομάδας αν δεν υπάρχει
     if 'ΟΝΟΜΑ_ΟΜΑΔΑΣ' not in df.columns:
         df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'] = 'ΓΕΝΙΚΗ ΟΜΑΔΑ'
-        print("   ➕ Δημιουργήθηκε προεπιλεγμένη στήλη ΟΝΟΜΑ_ΟΜΑΔΑΣ")
-    
+        if verbose:
+            log.info("   ➕ Δημιουργήθηκε προεπιλεγμένη στήλη ΟΝΟΜΑ_ΟΜΑΔΑΣ")
+
     # Μετατροπή σε αριθμητικές τιμές
-    numeric_cols = ['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ']
-    if 'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ' in df.columns:
-        numeric_cols.append('ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ')
-    
-    print("🔢 Μετατροπή αριθμητικών στηλών...")
-    for col in numeric_cols:
+    if verbose:
+        log.info("🔢 Μετατροπή αριθμητικών στηλών...")
+    for col in NUMERIC_COLUMNS:
         if col in df.columns:
             original_type = df[col].dtype
             df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
-            print(f"   ✅ {col}: {original_type} → int64")
-    
+            if verbose:
+                log.info(f"   ✅ {col}: {original_type} → int64")
+
     # Ημερομηνία parsing - διορθωμένο για να αναγνωρίζει το ΜΗΝΑΣΕΤΟΣ
-    print("📅 Επεξεργασία ημερομηνιών...")
-    
+    if verbose:
+        log.info("📅 Επεξεργασία ημερομηνιών...")
+
     if 'ΜΗΝΑΣ-ΕΤΟΣ' in df.columns:
-        date_formats = ['%Y-%m', '%m/%Y', '%Y/%m', '%m-%Y', '%d/%m/%Y', '%Y-%m-%d']
-        
-        df['parsed_date'] = None
-        for date_format in date_formats:
-            try:
-                df['parsed_date'] = pd.to_datetime(df['ΜΗΝΑΣ-ΕΤΟΣ'], format=date_format, errors='coerce')
-                successful_parsing = df['parsed_date'].notna().sum()
-                if successful_parsing > 0:
-                    print(f"   ✅ Επιτυχής parsing με format {date_format}: {successful_parsing} εγγραφές")
-                    break
-            except:
-                continue
-        
-        # Αν δεν λειτούργησε κανένας format, δοκίμασε infer
-        if df['parsed_date'].isna().all():
-            try:
-                df['parsed_date'] = pd.to_datetime(df['ΜΗΝΑΣ-ΕΤΟΣ'], infer_datetime_format=True, errors='coerce')
-                successful_parsing = df['parsed_date'].notna().sum()
-                print(f"   ✅ Επιτυχής parsing με infer_datetime_format: {successful_parsing} εγγραφές")
-            except:
-                print("   ❌ Αποτυχία parsing ημερομηνιών")
-        
+        df['parsed_date'], used_format = _parse_month_year(df['ΜΗΝΑΣ-ΕΤΟΣ'])
+        if verbose:
+            if used_format is None:
+                log.error("   ❌ Αποτυχία parsing ημερομηνιών")
+            else:
+                log.info(f"   ✅ Επιτυχής parsing με format(s) {used_format}: {df['parsed_date'].notna().sum()} εγγραφές")
+
         # Απάλειψη NaT values
         original_count = len(df)
         df = df.dropna(subset=['parsed_date'])
-        if len(df) < original_count:
-            print(f"   ⚠️ Αφαιρέθηκαν {original_count - len(df)} εγγραφές με άκυρες ημερομηνίες")
+        if verbose and len(df) < original_count:
+            log.warning(f"   ⚠️ Αφαιρέθηκαν {original_count - len(df)} εγγραφές με άκυρες ημερομηνίες")
     else:
-        print("   ❌ Δεν βρέθηκε στήλη ημερομηνίας - θα δημιουργηθεί προεπιλεγμένη")
         # Δημιουργία προεπιλεγμένης ημερομηνίας
         df['parsed_date'] = pd.to_datetime('2024-01-01')
-        print("   ⚠️ Χρησιμοποιήθηκε προεπιλεγμένη ημερομηνία")
-    
-    if df.empty:
-        print("❌ ΣΦΑΛΜΑ: Δεν υπάρχουν έγκυρα δεδομένα μετά την επεξεργασία")
+        if verbose:
+            log.error("   ❌ Δεν βρέθηκε στήλη ημερομηνίας - θα δημιουργηθεί προεπιλεγμένη")
+            log.warning("   ⚠️ Χρησιμοποιήθηκε προεπιλεγμένη ημερομηνία")
+
+    return df
+
+
+def _text_category(values):
+    """
+    Categorical με κατηγορίες κειμένου (str). Κωδικοί τμημάτων/ομάδων που το CSV διάβασε ως αριθμούς (101)
+    γίνονται '101', ώστε ο τύπος να μην αλλάζει ανάμεσα σε αρχεία, chunks, cache και φόρτωση.
+    """
+    categories = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else values
+    if categories.dtype != object or pd.api.types.infer_dtype(categories, skipna=True) != 'string':
+        values = values.astype(object)
+        values = values.where(values.isna(), values.astype(str))
+    return values.astype('category')
+
+
+def _read_csv_chunked(filename, encoding, chunksize):
+    """
+    Streaming ανάγνωση CSV σε chunks: κάθε chunk καθαρίζεται, παίρνει τις μετρικές και μετατρέπεται αμέσως
+    σε συμπαγή μορφή (_compact_frame), οπότε συσσωρεύονται μόνο οι συμπαγείς στήλες (categorical, month_ord
+    int32, downcast μετρητές) και όχι τα strings/datetimes του αρχείου. Η μέγιστη μνήμη είναι περίπου το
+    συμπαγές αποτέλεσμα δύο φορές (chunks + ένωση) συν ένα chunk σε πλήρη μορφή.
+    Επιστρέφει ήδη συμπαγές DataFrame (ίδιο με _compact_frame(_add_metrics(...)) της πλήρους ανάγνωσης).
+    """
+    header = pd.read_csv(filename, encoding=encoding, nrows=0)
+    header.columns = header.columns.str.strip()
+    raw_columns = list(header.columns)
+    mapping = _resolve_column_mapping(raw_columns)
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in mapping.values()]
+    if missing_columns:
+        log.error(f"❌ ΣΦΑΛΜΑ: Λείπουν απαραίτητες στήλες: {missing_columns}")
+        return pd.DataFrame()
+
+    # Διαβάζουμε μόνο τις στήλες που αντιστοιχίζονται (με βάση τη θέση, λόγω strip στα ονόματα)
+    usecols = [i for i, col in enumerate(raw_columns) if col in mapping]
+    names = [raw_columns[i] for i in usecols]
+
+    chunks = []
+    total_rows = 0
+    dtype = {raw: str for raw, standard in mapping.items() if standard in TEXT_COLUMNS}
+    reader = pd.read_csv(filename, encoding=encoding, usecols=usecols, header=0, names=names, dtype=dtype,
+                         chunksize=chunksize)
+    for i, chunk in enumerate(reader, start=1):
+        total_rows += len(chunk)
+        chunk = _clean_frame(chunk, mapping, keep_raw=False, verbose=False)
+        if not chunk.empty:
+            chunks.append(_compact_frame(_add_metrics(chunk), verbose=False))
+        log.info(f"   📦 Chunk {i}: {total_rows:,} γραμμές αρχείου, {sum(len(c) for c in chunks):,} έγκυρες εγγραφές")
+
+    if not chunks:
         return pd.DataFrame()
+
+    # Τα categorical τμήματα/ομάδες ενώνονται ταξινομημένα, οι μετρητές παίρνουν τον κοινό (μεγαλύτερο) τύπο
+    df = _concat_frames(chunks)
+    log.info(f"   ✅ Streaming ανάγνωση: {total_rows:,} γραμμές → {len(df):,} έγκυρες εγγραφές "
+             f"({_format_bytes(df.memory_usage(deep=True, index=False).sum())})")
+    return df
+
+
+def _month_ordinal(dates):
+    """Αύξων αριθμός μήνα (μήνες από 1970-01) από datetimes"""
+    return np.asarray(dates, dtype='datetime64[ns]').astype('datetime64[M]').astype(np.int32)
+
+
+def _ordinal_to_timestamp(ordinals):
+    """Αντίστροφη μετατροπή: αύξων αριθμός μήνα → Timestamp(s) πρώτης ημέρας του μήνα"""
+    if np.ndim(ordinals) == 0:
+        return pd.Timestamp(np.datetime64(int(ordinals), 'M'))
+    return pd.to_datetime(np.asarray(ordinals, dtype=np.int64).astype('datetime64[M]'))
+
+
+def _format_bytes(num_bytes):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if num_bytes < 1024 or unit == 'GB':
+            return f"{num_bytes:,.1f} {unit}"
+        num_bytes /= 1024
+
+
+def _compact_frame(df, verbose=True):
+    """
+    Συμπαγής αναπαράσταση του DataFrame για τα callbacks:
+    categorical για τμήμα/ομάδα, αύξων αριθμός μήνα (month_ord) αντί για datetimes,
+    downcast των μετρητών και float32 για τα ποσοστά. Οι υπόλοιπες στήλες του αρχείου αφαιρούνται.
+    """
+    memory_before = df.memory_usage(deep=True, index=False) if verbose else None
+
+    compact = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    for col in ['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']:
+        values = _text_category(df[col])
+        if values.isna().any():
+            values = values.cat.add_categories(['Άγνωστο']).fillna('Άγνωστο')
+        compact[col] = values.cat.remove_unused_categories().values
+    compact['month_ord'] = _month_ordinal(df['parsed_date'])
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            compact[col] = pd.to_numeric(df[col].to_numpy(), downcast='integer')
+    for col in ['ΠΟΣΟΣΤΟ_ΑΔΙΑΘΕΤΩΝ', 'ΧΡΗΣΗ_ΡΑΝΤΕΒΟΥ']:
+        if col in df.columns:
+            compact[col] = df[col].to_numpy(dtype=np.float32)
+    compact['ΚΑΤΗΓΟΡΙΑ_ΑΔΙΑΘΕΤΩΝ'] = df['ΚΑΤΗΓΟΡΙΑ_ΑΔΙΑΘΕΤΩΝ'].values
+    if not verbose:
+        return compact
+
+    # Αναφορά μνήμης ανά στήλη
+    memory_after = compact.memory_usage(deep=True, index=False)
+    log.info("🧮 Μνήμη ανά στήλη (πριν → μετά):")
+    for col in memory_before.index:
+        target = 'month_ord' if col == 'parsed_date' else col
+        after = _format_bytes(memory_after[target]) if target in memory_after.index else "αφαιρέθηκε"
+        log.info(f"   {col}: {_format_bytes(memory_before[col])} → {after} ({compact[target].dtype if target in compact.columns else '-'})")
+    log.info(f"   Σύνολο: {_format_bytes(memory_before.sum())} → {_format_bytes(memory_after.sum())} "
+             f"(×{memory_before.sum() / max(1, memory_after.sum()):.1f} μικρότερο)")
+    return compact
+
+
+def _prepare_frame(df, verbose=True):
+    """
+    Καθαρισμός ενός ολόκληρου (όχι chunked) DataFrame όπως διαβάστηκε από το CSV: ονόματα στηλών,
+    mapping, έλεγχος απαραίτητων στηλών και _clean_frame. Επιστρέφει None αν λείπουν στήλες.
+    """
+    # Εκκαθάριση ονομάτων στηλών
+    df.columns = df.columns.str.strip()
+    
+    # Διορθωμένη αντιστοίχιση στηλών
+    if verbose:
+        log.info("🔍 Έλεγχος και αντιστοίχιση στηλών...")
+    mapping = _resolve_column_mapping(df.columns, verbose=verbose)
+    
+    # Έλεγχος για απαραίτητες στήλες μετά το mapping
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in mapping.values()]
+    if missing_columns:
+        log.error(f"❌ ΣΦΑΛΜΑ: Λείπουν απαραίτητες στήλες: {missing_columns}")
+        log.info("📋 Διαθέσιμες στήλες αρχείου:")
+        for i, col in enumerate(df.columns):
+            log.info(f"   {i+1}. {col}")
+        return None
     
-    # Υπολογισμός βασικών μετρικών
-    print("📊 Υπολογισμός μετρικών...")
+    return _clean_frame(df, mapping, verbose=verbose)
+
+
+def _add_metrics(df):
+    """Ποσοστά αδιάθετων/χρήσης και κατηγορία αδιάθετων ανά γραμμή"""
     df['ΠΟΣΟΣΤΟ_ΑΔΙΑΘΕΤΩΝ'] = (df['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] / df['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].replace(0, 1) * 100).clip(0, 100)
     
     if 'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ' in df.columns:
@@ -173,300 +517,2077 @@ def load_unavailable_appointments_data():
     df['ΚΑΤΗΓΟΡΙΑ_ΑΔΙΑΘΕΤΩΝ'] = pd.cut(df['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'], 
                                        bins=[0, 5, 15, 30, float('inf')],
                                        labels=['Λίγα (0-5)', 'Μέτρια (6-15)', 'Πολλά (16-30)', 'Πάρα πολλά (30+)'])
+    return df
+
+
+# Αρχεία δεδομένων κατά σειρά προτίμησης - φορτώνεται το πρώτο που διαβάζεται επιτυχώς
+DATA_FILES = ['OPSY_401_clean.csv']
+# Φάκελος ή glob με διαμερισμένα extracts (π.χ. 'extracts/' ή 'extracts/OPSY_*.csv'). Αν οριστεί,
+# φορτώνονται όλα τα αρχεία του (παράλληλα) αντί για το πρώτο από τα DATA_FILES.
+DATA_SOURCE = None
+INGEST_WORKERS = None       # διεργασίες για την παράλληλη φόρτωση αρχείων (None = όλοι οι πυρήνες)
+SOURCE_COLUMN = 'ΑΡΧΕΙΟ'    # στήλη προέλευσης: το αρχείο από το οποίο προήλθε κάθε γραμμή
+
+
+def resolve_data_files(source=None):
+    """Τα αρχεία δεδομένων: όλα τα CSV του φακέλου/glob source (προεπιλογή DATA_SOURCE) ταξινομημένα, αλλιώς τα DATA_FILES"""
+    source = DATA_SOURCE if source is None else source
+    if not source:
+        return list(DATA_FILES)
+    pattern = os.path.join(source, '*.csv') if os.path.isdir(source) else source
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+def _with_source(df, path):
+    """Προσθήκη της στήλης προέλευσης (categorical με μία κατηγορία - 1 byte ανά γραμμή)"""
+    df[SOURCE_COLUMN] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[path])
+    return df
+
+
+def _concat_frames(frames):
+    """
+    Ένωση συμπαγών DataFrames (βλ. _compact_frame) - τα categorical τμήματα/ομάδες/αρχεία ενώνονται ταξινομημένα.
+    Κάθε μέρος περνά πρώτα από το _text_category, ώστε αρχεία με αριθμητικούς κωδικούς (ή κενά μέρη)
+    να μη σπάνε το union_categoricals με κατηγορίες διαφορετικού τύπου.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    combined = pd.concat(frames, ignore_index=True)
+    for col in ['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ', SOURCE_COLUMN]:
+        if col in combined.columns:
+            parts = [_text_category(frame[col]) for frame in frames]
+            combined[col] = pd.api.types.union_categoricals(parts, sort_categories=True)
+    return combined
+
+
+def _load_data_file(filename, use_cache=USE_DATA_CACHE, chunksize=INGEST_CHUNKSIZE, verbose=True):
+    """
+    Φόρτωση ενός CSV σε συμπαγή μορφή: cache ή ανάγνωση (utf-8, αλλιώς latin-1), καθαρισμός, μετρικές,
+    _compact_frame και αποθήκευση cache. Επιστρέφει None αν το αρχείο δεν διαβάζεται και κενό DataFrame
+    αν δεν έχει έγκυρα δεδομένα.
+    """
+    cache_variant = 'chunked' if chunksize else 'full'
+    if use_cache and os.path.exists(filename):
+        cached_df = _load_frame_cache(filename, cache_variant)
+        if cached_df is not None:
+            if verbose:
+                log.info(f"⚡ Φόρτωση από cache: {filename} ({len(cached_df)} εγγραφές)")
+            return cached_df
+
+    df = None
+    for encoding in ['utf-8', 'latin-1']:
+        try:
+            if chunksize:
+                if verbose:
+                    log.info(f"🌊 Streaming ανάγνωση {filename} ανά {chunksize:,} γραμμές ({encoding})...")
+                df = _read_csv_chunked(filename, encoding, chunksize)
+            else:
+                df = pd.read_csv(filename, encoding=encoding, dtype=TEXT_DTYPES)
+            if verbose:
+                log.info(f"✅ Επιτυχής φόρτωση: {filename}" + (f" με {encoding} encoding" if encoding != 'utf-8' else ""))
+                log.info(f"📋 Στήλες αρχείου: {list(df.columns)}")
+                log.info(f"📏 Μέγεθος δεδομένων: {df.shape}")
+            break
+        except UnicodeDecodeError:
+            df = None
+            continue
+        except Exception as e:
+            log.error(f"❌ Σφάλμα φόρτωσης {filename}: {str(e)}")
+            df = None
+            break
+    if df is None:
+        return None
+
+    if not chunksize:
+        if verbose:
+            log.info("🧹 Καθαρισμός και προετοιμασία δεδομένων...")
+        df = _prepare_frame(df, verbose=verbose)
+        if df is None:
+            return pd.DataFrame()
+
+    if df.empty:
+        log.error(f"❌ ΣΦΑΛΜΑ: Δεν υπάρχουν έγκυρα δεδομένα μετά την επεξεργασία ({filename})")
+        return pd.DataFrame()
+
+    # Υπολογισμός βασικών μετρικών (η streaming ανάγνωση τις έχει ήδη υπολογίσει ανά chunk)
+    if not chunksize:
+        if verbose:
+            log.info("📊 Υπολογισμός μετρικών...")
+        df = _compact_frame(_add_metrics(df), verbose=verbose)
+
+    if use_cache:
+        _save_frame_cache(df, filename, cache_variant)
+    return df
+
+
+def _ingest_file(filename, use_cache, chunksize):
+    """Φόρτωση ενός αρχείου στο process pool της _ingest_files - επιστρέφει (DataFrame ή None, δευτερόλεπτα)"""
+    started = time.perf_counter()
+    return _load_data_file(filename, use_cache, chunksize, verbose=False), time.perf_counter() - started
+
+
+def _ingest_files(files, use_cache=USE_DATA_CACHE, chunksize=INGEST_CHUNKSIZE):
+    """
+    Παράλληλη φόρτωση διαμερισμένων CSV (π.χ. ένα ανά μήνα ή κλινική): κάθε αρχείο περνά ολόκληρη τη ροή
+    του _load_data_file (mapping, αριθμητικές στήλες, ημερομηνίες, cache) σε ξεχωριστή διεργασία και τα
+    συμπαγή αποτελέσματα ενώνονται με τη στήλη προέλευσης. Αρχεία που δεν διαβάζονται παραλείπονται.
+    Επιστρέφει None αν δεν διαβάστηκε κανένα αρχείο.
+    """
+    if not files:
+        return None
+    workers = min(len(files), INGEST_WORKERS or os.cpu_count() or 1)
+    log.info(f"🗂️ Φόρτωση {len(files)} αρχείων με {workers} διεργασίες...")
+    started = time.perf_counter()
+    ingest = functools.partial(_ingest_file, use_cache=use_cache, chunksize=chunksize)
+    if workers > 1:
+        # Τρέχει και στα threads του loader/watcher ενώ εξυπηρετούνται requests - βλ. _process_pool_context
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_process_pool_context()) as pool:
+            results = list(pool.map(ingest, files))
+    else:
+        results = [ingest(filename) for filename in files]
+
+    frames = []
+    for filename, (df, seconds) in zip(files, results):
+        if df is None:
+            log.warning(f"   ⚠️ {filename}: δεν διαβάστηκε - παραλείπεται")
+            continue
+        log.info(f"   📄 {filename}: {len(df):,} εγγραφές σε {seconds:.2f}s")
+        if not df.empty:
+            frames.append(_with_source(df, filename))
+    if not frames:
+        return pd.DataFrame() if any(df is not None for df, _ in results) else None
+    df = _concat_frames(frames)
+    log.info(f"✅ {len(frames)} αρχεία, {len(df):,} εγγραφές σε {time.perf_counter() - started:.2f}s")
+    return df
+
+
+def load_unavailable_appointments_data(use_cache=USE_DATA_CACHE, chunksize=INGEST_CHUNKSIZE, source=None):
+    """
+    Φόρτωση πραγματικών δεδομένων με εστίαση στα αδιάθετα ραντεβου
+    
+    :param use_cache: χρήση της δυαδικής cache του καθαρισμένου DataFrame (αναδημιουργείται αυτόματα όταν αλλάζει το CSV)
+    :param chunksize: αν δοθεί, streaming ανάγνωση ανά chunksize γραμμές κρατώντας μόνο τις απαραίτητες στήλες
+    :param source: φάκελος ή glob με διαμερισμένα CSV (προεπιλογή DATA_SOURCE) - φορτώνονται όλα, παράλληλα
+    """
+    log.info("📄 Φόρτωση δεδομένων αδιάθετων ραντεβου...")
+    
+    source = DATA_SOURCE if source is None else source
+    if source:
+        possible_files = [os.path.join(source, '*.csv') if os.path.isdir(source) else source]
+        df = _ingest_files(resolve_data_files(source), use_cache, chunksize)
+    else:
+        # Προσπάθεια φόρτωσης του CSV αρχείου
+        possible_files = DATA_FILES
+        df = None
+        for filename in possible_files:
+            df = _load_data_file(filename, use_cache, chunksize)
+            if df is not None:
+                df = _with_source(df, filename) if not df.empty else df
+                break
+    
+    if df is None:
+        log.error("❌ ΣΦΑΛΜΑ: Δεν βρέθηκε κανένα έγκυρο CSV αρχείο!")
+        log.info("📋 Βεβαιωθείτε ότι έχετε ένα από τα παρακάτω αρχεία στον φάκελο:")
+        for filename in possible_files:
+            log.info(f"   - {filename}")
+        return pd.DataFrame()  # Επιστροφή κενού DataFrame
+    
+    if df.empty:
+        return df
     
     # Τελική αναφορά
-    print(f"✅ Δεδομένα επεξεργάστηκαν επιτυχώς!")
-    print(f"📏 Τελικό μέγεθος: {len(df)} εγγραφές")
-    print(f"📊 Συνολικά αδιάθετα: {df['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum():,}")
-    print(f"📅 Εύρος ημερομηνιών: {df['parsed_date'].min().strftime('%Y-%m')} έως {df['parsed_date'].max().strftime('%Y-%m')}")
-    print(f"🏥 Τμήματα: {df['ΤΜΗΜΑ'].nunique()}")
-    print(f"👥 Ομάδες: {df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].nunique()}")
+    log.info(f"✅ Δεδομένα επεξεργάστηκαν επιτυχώς!")
+    log.info(f"📏 Τελικό μέγεθος: {len(df)} εγγραφές")
+    log.info(f"📊 Συνολικά αδιάθετα: {df['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum():,}")
+    log.info(f"📅 Εύρος ημερομηνιών: {_ordinal_to_timestamp(df['month_ord'].min()).strftime('%Y-%m')} έως {_ordinal_to_timestamp(df['month_ord'].max()).strftime('%Y-%m')}")
+    log.info(f"🏥 Τμήματα: {df['ΤΜΗΜΑ'].nunique()}")
+    log.info(f"👥 Ομάδες: {df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].nunique()}")
     
     return df
 
+
+def _file_signature(path):
+    """(μέγεθος, mtime_ns, blake2b) ενός αρχείου ή None αν δεν υπάρχει - βλ. DataFileWatcher"""
+    try:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns, _hash_file(path, limit=stat.st_size)
+    except OSError:
+        return None
+
+
+def _read_appended_rows(path, offset, end):
+    """
+    Ανάγνωση μόνο των bytes [offset, end) ενός CSV (γραμμές που προστέθηκαν στο τέλος του) μαζί με
+    την κεφαλίδα του, με τον ίδιο καθαρισμό/μετρικές/συμπαγή μορφή με τη φόρτωση (offset 0 = νέο αρχείο).
+    Επιστρέφει κενό DataFrame αν δεν υπάρχουν έγκυρες γραμμές.
+    """
+    with open(path, 'rb') as fh:
+        header = fh.readline()
+        start = max(offset, len(header))
+        fh.seek(start)
+        appended = fh.read(max(0, end - start))
+
+    for encoding in ['utf-8', 'latin-1']:
+        try:
+            raw = pd.read_csv(io.BytesIO(header + appended), encoding=encoding, dtype=TEXT_DTYPES)
+            break
+        except UnicodeDecodeError:
+            continue
+    if raw.empty:
+        return pd.DataFrame()
+    df = _prepare_frame(raw, verbose=False)
+    if df is None or df.empty:
+        return pd.DataFrame()
+    return _with_source(_compact_frame(_add_metrics(df), verbose=False), path)
+
 # ══════════════════════════════════════════════════════════════════════════════
-# ΑΝΑΛΥΤΙΚΗ ΚΛΑΣΗ ΓΙΑ ΑΔΙΑΘΕΤΑ ΡΑΝΤΕΒΟΥ
+# ΜΕΤΡΙΚΕΣ ΚΑΘΥΣΤΕΡΗΣΗΣ
 # ══════════════════════════════════════════════════════════════════════════════
 
-class UnavailableAppointmentsAnalyzer:
+# Άνω όρια (δευτερόλεπτα) των κάδων των ιστογραμμάτων - κάθε κάδος μετρά τις διάρκειες ≤ του ορίου του
+METRICS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Ιστόγραμμα διαρκειών με σταθερούς κάδους: πλήθος ανά κάδο (+ ένας για +Inf), άθροισμα και πλήθος"""
+
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+class LatencyMetrics:
     """
-    Κλάση για ανάλυση αδιάθετων ραντεβου και προτάσεις ανακατανομής
+    Ιστογράμματα διάρκειας ανά (callback, στάδιο). Τα στάδια είναι αποκλειστικά: ο χρόνος ενός εμφωλευμένου
+    σταδίου δεν χρεώνεται και στο εξωτερικό, και ό,τι δεν ανήκει σε κανένα στάδιο ενός callback καταγράφεται
+    ως 'figure' (κατασκευή figures/components), οπότε filter + groupby + redistribution + figure = callback.
+    Το 'serialize' είναι ο υπόλοιπος χρόνος του αιτήματος (JSON του αποτελέσματος και dispatch του Dash).
     """
-    
-    def __init__(self, df):
-        self.df = df
-    
-    def calculate_unavailable_kpis(self, filtered_df=None):
-        """
-        Υπολογισμός KPI για αδιάθετα ραντεβου
-        """
-        data = filtered_df if filtered_df is not None else self.df
-        
-        if data.empty:
-            return {}
-        
-        # ✅ ENSURE ALL VALUES ARE PYTHON NATIVE TYPES, NOT PANDAS OBJECTS
-        total_unavailable = int(data['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum())
+
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def observe(self, name, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get((name, stage))
+            if histogram is None:
+                histogram = self._histograms[(name, stage)] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def stage(self, stage):
+        """Μέτρηση ενός σταδίου για το callback του τρέχοντος thread ('background' εκτός callbacks)"""
+        stack = self._stack()
+        if any(frame[0] == stage for frame in stack):
+            yield  # αναδρομή στο ίδιο στάδιο (π.χ. ανακατανομή ανά τμήμα) - μετράει μόνο η εξωτερική κλήση
+            return
+        frame = [stage, 0.0]  # [στάδιο, χρόνος εμφωλευμένων σταδίων]
+        stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            self.observe(getattr(self._local, 'name', 'background'), stage, elapsed - frame[1])
+
+    @contextlib.contextmanager
+    def callback(self, name):
+        """Μέτρηση ολόκληρου callback (στάδιο 'callback') και του χρόνου εκτός σταδίων ('figure')"""
+        previous = getattr(self._local, 'name', None)
+        self._local.name = name
+        stack = self._stack()
+        frame = ['callback', 0.0]
+        stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            if previous is None:
+                del self._local.name
+            else:
+                self._local.name = previous
+            self.observe(name, 'callback', elapsed)
+            self.observe(name, 'figure', elapsed - frame[1])
+            self._local.last = (name, elapsed)
+
+    def begin_request(self):
+        self._local.last = None
+        self._local.request_started = time.perf_counter()
+
+    def end_request(self):
+        """Στο τέλος ενός HTTP αιτήματος που εκτέλεσε callback: στάδια 'request' και 'serialize'"""
+        last, started = getattr(self._local, 'last', None), getattr(self._local, 'request_started', None)
+        if last is None or started is None:
+            return
+        name, callback_seconds = last
+        elapsed = time.perf_counter() - started
+        self.observe(name, 'request', elapsed)
+        self.observe(name, 'serialize', max(0.0, elapsed - callback_seconds))
+        self._local.last = None
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self):
+        """{(callback, στάδιο): (counts, sum, count)} - αντίγραφο για ανάγνωση εκτός lock"""
+        with self._lock:
+            return {key: (list(h.counts), h.sum, h.count) for key, h in self._histograms.items()}
+
+    def render(self):
+        """Τα ιστογράμματα σε μορφή κειμένου Prometheus (adiatheta_stage_seconds)"""
+        lines = ['# HELP adiatheta_stage_seconds Διάρκεια σταδίων ανά callback',
+                 '# TYPE adiatheta_stage_seconds histogram']
+        bounds = [f"{b:g}" for b in self.buckets] + ['+Inf']
+        for (name, stage), (counts, total, count) in sorted(self.snapshot().items()):
+            labels = f'callback="{name}",stage="{stage}"'
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                lines.append(f'adiatheta_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'adiatheta_stage_seconds_sum{{{labels}}} {total:.6f}')
+            lines.append(f'adiatheta_stage_seconds_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = LatencyMetrics()
+
+
+def timed_stage(stage):
+    """Decorator: κάθε κλήση καταγράφεται στο ιστόγραμμα του σταδίου για το τρέχον callback"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΠΡΟΦΙΛ (cProfile) ΑΡΓΩΝ ΑΛΛΗΛΕΠΙΔΡΑΣΕΩΝ
+# ══════════════════════════════════════════════════════════════════════════════
+
+PROFILE_DIR = 'adiatheta_profiles'  # φάκελος για τα .prof / .collapsed / .json κάθε καταγραφής
+PROFILE_KEEP = 100                  # μέγιστο πλήθος καταγραφών στον φάκελο (οι παλαιότερες διαγράφονται)
+PROFILE_MAX_DEPTH = 64              # μέγιστο βάθος στοίβας στα collapsed stacks
+
+
+def _collapsed_stacks(profile):
+    """
+    Collapsed stacks (μορφή flamegraph.pl / speedscope: «f1;f2;f3 μs») από ένα cProfile. Το cProfile κρατά
+    μόνο ζεύγη καλούντος → καλούμενου, οπότε ο χρόνος μιας συνάρτησης μοιράζεται στις στοίβες αναλογικά
+    με τον χρόνο που πέρασε από κάθε καλούντα (προσέγγιση· το .prof έχει τα ακριβή στοιχεία).
+    """
+    stats = pstats.Stats(profile).stats
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    def label(func):
+        filename, lineno, name = func
+        return name if filename == '~' else f"{name} ({os.path.basename(filename)}:{lineno})"
+
+    stacks = {}
+
+    def visit(func, path, scale):
+        path = path + [label(func)]
+        own = stats[func][2] * scale * 1e6
+        if own >= 1:
+            key = ';'.join(path)
+            stacks[key] = stacks.get(key, 0) + own
+        if len(path) >= PROFILE_MAX_DEPTH:
+            return
+        for callee, edge_seconds in callees.get(func, []):
+            total = stats[callee][3]
+            if total > 0 and edge_seconds * scale * 1e6 >= 1 and label(callee) not in path:
+                visit(callee, path, scale * edge_seconds / total)
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            visit(func, [], 1.0)
+    return [f"{stack} {int(round(us))}" for stack, us in sorted(stacks.items()) if us >= 0.5]
+
+
+class CallbackProfiler:
+    """
+    Προφίλ callbacks κατ' απαίτηση, χωρίς επανεκκίνηση: οι επόμενες N εκτελέσεις (arm) και/ή όσες
+    ξεπερνούν ένα όριο δευτερολέπτων (threshold - τότε προφίλ γίνεται σε κάθε εκτέλεση και κρατούνται
+    μόνο οι αργές, με το ανάλογο κόστος). Κάθε καταγραφή σώζεται ως .prof (pstats / snakeviz), .collapsed
+    (flamegraph) και .json με το callback, τη διάρκεια, την έκδοση δεδομένων και τα ορίσματα (filter-state).
+    Μόνο ένα προφίλ τρέχει κάθε στιγμή· ταυτόχρονες εκτελέσεις τρέχουν χωρίς προφίλ.
+    """
+
+    def __init__(self, directory=PROFILE_DIR, keep=PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+        self.remaining = 0
+        self.threshold = None
+        self.callbacks = None  # None = όλα τα callbacks
+        self.captures = []
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    def configure(self, n=0, threshold=None, callbacks=None):
+        """Προφίλ στις επόμενες n εκτελέσεις και/ή σε όσες διαρκούν ≥ threshold s (n=0, threshold=None: ανενεργό)"""
+        if n < 0 or (threshold is not None and threshold < 0):
+            raise ValueError("τα n και threshold δεν μπορεί να είναι αρνητικά")
+        with self._lock:
+            self.remaining = n
+            self.threshold = threshold
+            self.callbacks = set(callbacks) if callbacks else None
+        log.info(f"🔬 Profiler: επόμενες {n} εκτελέσεις, όριο {threshold if threshold is not None else '-'} s, "
+                 f"callbacks {sorted(self.callbacks) if self.callbacks else 'όλα'}")
+
+    def _claim(self, name):
+        """Ελάχιστη διάρκεια (s) για να κρατηθεί το προφίλ της εκτέλεσης του name ή None χωρίς προφίλ"""
+        with self._lock:
+            if self.callbacks is not None and name not in self.callbacks:
+                return None
+            if self.remaining > 0:
+                self.remaining -= 1
+                return 0.0
+            return self.threshold
+
+    def call(self, name, func, args):
+        """Εκτέλεση func(*args) - με προφίλ αν έχει ζητηθεί για αυτή την εκτέλεση"""
+        keep_after = self._claim(name)
+        if keep_after is None or not self._active.acquire(blocking=False):
+            return func(*args)
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                result = func(*args)
+            finally:
+                profile.disable()
+        finally:
+            self._active.release()
+        elapsed = time.perf_counter() - started
+        if elapsed >= keep_after:
+            try:
+                self._save(name, profile, elapsed, args)
+            except Exception as e:
+                log.warning(f"⚠️ Αποτυχία αποθήκευσης προφίλ για {name}: {e}")
+        return result
+
+    def _save(self, name, profile, elapsed, args):
+        state = next((arg for arg in args if isinstance(arg, dict) and 'key' in arg), None)
+        tag = hashlib.blake2b(json.dumps(state['key'] if state else args, default=str).encode(), digest_size=4).hexdigest()
+        data = DATA.current
+        base = os.path.join(self.directory, f"{datetime.now():%Y%m%d_%H%M%S_%f}_{name}_{elapsed * 1000:.0f}ms_{tag}")
+        os.makedirs(self.directory, exist_ok=True)
+        profile.dump_stats(base + '.prof')
+        with open(base + '.collapsed', 'w', encoding='utf-8') as fh:
+            fh.write('\n'.join(_collapsed_stacks(profile)) + '\n')
+        meta = {'callback': name, 'seconds': round(elapsed, 4), 'data_version': data.version if data else None,
+                'filter_state': state, 'args': list(args), 'captured_at': datetime.now().isoformat(timespec='seconds')}
+        with open(base + '.json', 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh, ensure_ascii=False, indent=1, default=str)
+
+        with self._lock:
+            self.captures.append(base)
+            expired, self.captures = self.captures[:-self.keep], self.captures[-self.keep:]
+        for old in expired:
+            for ext in ('.prof', '.collapsed', '.json'):
+                with contextlib.suppress(OSError):
+                    os.remove(old + ext)
+        log.info(f"🔬 Προφίλ {name} ({elapsed * 1000:.0f} ms): {base}.prof")
+
+    def status(self):
+        with self._lock:
+            return {
+                'remaining': self.remaining,
+                'threshold': self.threshold,
+                'callbacks': sorted(self.callbacks) if self.callbacks else None,
+                'directory': os.path.abspath(self.directory),
+                'captures': [os.path.basename(base) for base in self.captures[-20:]]
+            }
+
+
+PROFILER = CallbackProfiler()
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΑΝΑΛΥΤΙΚΗ ΚΛΑΣΗ ΓΙΑ ΑΔΙΑΘΕΤΑ ΡΑΝΤΕΒΟΥ
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _allocate_greedy(donor_unavailable, shares, max_donor_fraction):
+    """
+    Άπληστη κατανομή: κάθε δέκτης (με τη σειρά του) παίρνει από τους δότες (σε φθίνουσα σειρά αδιάθετων)
+    έως max(1, int(υπόλοιπο δότη × max_donor_fraction)) ανά μεταφορά, μέχρι να καλυφθεί το μερίδιό του.
+    Ανά δέκτη κάθε δότης συμμετέχει το πολύ μία φορά, οπότε τα όρια όλων των δοτών υπολογίζονται μαζί
+    και το σημείο όπου καλύπτεται το μερίδιο βρίσκεται με cumsum + searchsorted.
+    Επιστρέφει πίνακες (δείκτης δότη, δείκτης δέκτη, ποσότητα, υπόλοιπο δότη πριν τη μεταφορά).
+    """
+    remaining = donor_unavailable.astype(np.int64).copy()
+    donor_idx, receiver_idx, amounts, donor_before = [], [], [], []
+
+    for r, need in enumerate(shares):
+        if need <= 0:
+            continue
+        caps = np.where(remaining > 0,
+                        np.minimum(np.maximum(1, (remaining * max_donor_fraction).astype(np.int64)), remaining),
+                        0)
+        cumulative = np.cumsum(caps)
+        last = min(int(np.searchsorted(cumulative, need)), len(caps) - 1)
+        given = caps[:last + 1].copy()
+        given[last] = min(given[last], need - (cumulative[last - 1] if last > 0 else 0))
+
+        donors_used = np.flatnonzero(given > 0)
+        donor_idx.append(donors_used)
+        receiver_idx.append(np.full(len(donors_used), r))
+        amounts.append(given[donors_used])
+        donor_before.append(remaining[donors_used])
+        remaining[:last + 1] -= given
+
+    if not donor_idx:
+        return (np.empty(0, dtype=np.int64),) * 4
+    return tuple(np.concatenate(parts) for parts in (donor_idx, receiver_idx, amounts, donor_before))
+
+
+TRANSFER_COLUMNS = ['Τμήμα', 'Από Ομάδα', 'Προς Ομάδα', 'Αδιάθετα Δότη (Αρχικά)', 'Αδιάθετα Δέκτη (Αρχικά)',
+                    'Προτεινόμενη Μεταφορά', 'Νέα Αδιάθετα Δότη', 'Νέα Αδιάθετα Δέκτη', 'Βελτίωση Δέκτη', 'Αιτιολόγηση']
+
+
+def _transfers_frame(donors, receivers, donor_idx, receiver_idx, amounts, donor_before):
+    """Πίνακας μεταφορών στη μορφή που εμφανίζει το dashboard"""
+    if len(amounts) == 0:
+        return pd.DataFrame()
+
+    donor_teams = donors['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].to_numpy(dtype=object)[donor_idx]
+    receiver_teams = receivers['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].to_numpy(dtype=object)[receiver_idx]
+    receiver_before = receivers['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy(dtype=np.int64)[receiver_idx]
+    amounts = amounts.astype(np.int64)
+
+    return pd.DataFrame({
+        'Τμήμα': donors['ΤΜΗΜΑ'].to_numpy(dtype=object)[donor_idx],
+        'Από Ομάδα': donor_teams,
+        'Προς Ομάδα': receiver_teams,
+        'Αδιάθετα Δότη (Αρχικά)': donor_before.astype(int),
+        'Αδιάθετα Δέκτη (Αρχικά)': receiver_before.astype(int),
+        'Προτεινόμενη Μεταφορά': amounts.astype(int),
+        'Νέα Αδιάθετα Δότη': (donor_before - amounts).astype(int),
+        'Νέα Αδιάθετα Δέκτη': np.maximum(0, receiver_before - amounts).astype(int),
+        'Βελτίωση Δέκτη': [f"+{a} (από {b} → {b + a})" for a, b in zip(amounts.tolist(), receiver_before.tolist())],
+        'Αιτιολόγηση': [f"Μείωση αδιάθετων: {a} ραντεβού από '{d}' στην '{r}'"
+                        for a, d, r in zip(amounts.tolist(), donor_teams, receiver_teams)]
+    })
+
+
+REDISTRIBUTION_SOLVERS = {
+    'greedy': 'Άπληστη κατανομή',
+    'mincost': 'Βέλτιστη ροή (min-cost flow)'
+}
+REDISTRIBUTION_SOLVER = 'greedy'    # προεπιλεγμένος επιλυτής στο dashboard
+REDISTRIBUTION_TIME_BUDGET = 2.0    # μέγιστος χρόνος (δευτερόλεπτα) του min-cost flow - μετά χρησιμοποιείται η άπληστη κατανομή
+MCF_COST_LEVELS = 16                # επίπεδα στα οποία κβαντίζεται το κόστος ανά ραντεβού κάθε δέκτη
+# Επιπλέον κόστος ανά ραντεβού όταν δότης και δέκτης ανήκουν σε άλλο τμήμα. Με 0 το κόστος εξαρτάται μόνο από
+# την ανάγκη (βάρος) του δέκτη· με MCF_COST_LEVELS κάθε δέκτης του ίδιου τμήματος προηγείται οποιουδήποτε άλλου.
+MCF_DEPT_PENALTY = 0
+
+REDISTRIBUTION_SCOPES = {
+    'hospital': 'Όλο το νοσοκομείο',
+    'department': 'Ανά τμήμα'
+}
+REDISTRIBUTION_SCOPE = 'hospital'         # προεπιλεγμένο εύρος ανακατανομής στο dashboard
+REDISTRIBUTION_WORKERS = None             # διεργασίες για την ανακατανομή ανά τμήμα (None = όλοι οι πυρήνες)
+REDISTRIBUTION_PARALLEL_MIN_TEAMS = 2000  # κάτω από τόσες ομάδες τα τμήματα λύνονται σειριακά (κόστος IPC)
+
+_redistribution_pool = None
+_redistribution_pool_lock = threading.Lock()
+
+
+def _process_pool_context():
+    """
+    Context για process pools που δημιουργούνται ενώ τρέχουν άλλα threads (Flask requests, loader, watcher):
+    forkserver (ή spawn) αντί για fork, γιατί ένα fork τη στιγμή που κάποιο thread κρατά lock (METRICS,
+    logging) αφήνει το lock κλειδωμένο στο παιδί και ο worker κολλά. Οι workers κάνουν μόνο import του
+    module (που δεν φορτώνει δεδομένα) και παίρνουν ό,τι χρειάζονται ως ορίσματα.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _get_redistribution_pool():
+    """Κοινό process pool (δημιουργείται με την πρώτη χρήση και ξαναχρησιμοποιείται)"""
+    global _redistribution_pool
+    with _redistribution_pool_lock:
+        if _redistribution_pool is None:
+            # Δημιουργείται μέσα σε Dash request - βλ. _process_pool_context για το γιατί όχι fork
+            _redistribution_pool = ProcessPoolExecutor(max_workers=REDISTRIBUTION_WORKERS,
+                                                       mp_context=_process_pool_context())
+        return _redistribution_pool
+
+
+def _redistribute_department(summary, redistribute_ratio, max_donor_fraction, solver, time_budget):
+    """Ανακατανομή μέσα σε ένα τμήμα - top-level ώστε να εκτελείται σε process pool"""
+    return UnavailableAppointmentsAnalyzer(None, team_summary=summary).suggest_fair_redistribution(
+        redistribute_ratio=redistribute_ratio,
+        max_donor_fraction=max_donor_fraction,
+        solver=solver,
+        time_budget=time_budget
+    )
+
+
+class _MinCostFlow:
+    """
+    Ροή ελάχιστου κόστους (primal-dual) σε ακέραια κόστη ≥ 0: ένα Dijkstra με δυναμικά ανά φάση και μετά
+    blocking flow (Dinic) στις ακμές μηδενικού ανηγμένου κόστους, ώστε όλα τα συντομότερα μονοπάτια ίδιου
+    κόστους να γεμίζουν μαζί. Οι φάσεις είναι όσες οι διαφορετικές αποστάσεις πηγής-καταβόθρας.
+    """
+
+    def __init__(self, n_nodes):
+        self.graph = [[] for _ in range(n_nodes)]
+
+    def add_edge(self, u, v, capacity, cost):
+        """Προσθήκη ακμής - επιστρέφει αναφορά για την ανάγνωση της ροής της με flow()"""
+        self.graph[u].append([v, capacity, cost, len(self.graph[v])])
+        self.graph[v].append([u, 0, -cost, len(self.graph[u]) - 1])
+        return u, len(self.graph[u]) - 1
+
+    def flow(self, edge):
+        u, i = edge
+        v, _, _, rev = self.graph[u][i]
+        return self.graph[v][rev][1]
+
+    def _shortest_paths(self, source, potential):
+        """Dijkstra με ανηγμένα κόστη - ενημερώνει τα δυναμικά των προσβάσιμων κόμβων"""
+        dist = [None] * len(self.graph)
+        dist[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, capacity, cost, _ in self.graph[u]:
+                if capacity > 0:
+                    nd = d + cost + potential[u] - potential[v]
+                    if dist[v] is None or nd < dist[v]:
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+        for v, d in enumerate(dist):
+            if d is not None:
+                potential[v] += d
+        return dist
+
+    def _admissible(self, u, v, capacity, cost, potential):
+        return capacity > 0 and cost + potential[u] - potential[v] == 0
+
+    def _blocking_flow(self, source, sink, limit, potential):
+        """Dinic σε ακμές μηδενικού ανηγμένου κόστους - επιστρέφει τη ροή που στάλθηκε"""
+        graph = self.graph
+        level = [-1] * len(graph)
+        level[source] = 0
+        queue = [source]
+        for u in queue:
+            for v, capacity, cost, _ in graph[u]:
+                if level[v] < 0 and self._admissible(u, v, capacity, cost, potential):
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[sink] < 0:
+            return 0
+
+        pushed = 0
+        current = [0] * len(graph)
+        path = []
+        u = source
+        while pushed < limit:
+            if u == sink:
+                push = min([limit - pushed] + [graph[x][i][1] for x, i in path])
+                for x, i in path:
+                    edge = graph[x][i]
+                    edge[1] -= push
+                    graph[edge[0]][edge[3]][1] += push
+                pushed += push
+                path.clear()
+                u = source
+                continue
+            edges = graph[u]
+            while current[u] < len(edges):
+                v, capacity, cost, _ = edges[current[u]]
+                if level[v] == level[u] + 1 and self._admissible(u, v, capacity, cost, potential):
+                    break
+                current[u] += 1
+            if current[u] < len(edges):
+                path.append((u, current[u]))
+                u = edges[current[u]][0]
+            elif path:
+                # Αδιέξοδο: ο κόμβος αποκλείεται και επιστρέφουμε ένα βήμα
+                level[u] = -1
+                u, _ = path.pop()
+                current[u] += 1
+            else:
+                break
+        return pushed
+
+    def solve(self, source, sink, max_flow, deadline=None):
+        """
+        Στέλνει έως max_flow μονάδες. Επιστρέφει (ροή, κόστος, ολοκληρώθηκε).
+        Αν λήξει το deadline, η ροή που έχει σταλεί είναι ήδη ελάχιστου κόστους για το μέγεθός της.
+        """
+        potential = [0] * len(self.graph)
+        total_flow = total_cost = 0
+
+        while total_flow < max_flow:
+            if deadline is not None and time.perf_counter() > deadline:
+                return total_flow, total_cost, False
+            if self._shortest_paths(source, potential)[sink] is None:
+                break
+            while total_flow < max_flow:
+                pushed = self._blocking_flow(source, sink, max_flow - total_flow, potential)
+                if not pushed:
+                    break
+                total_flow += pushed
+                total_cost += pushed * (potential[sink] - potential[source])
+                if deadline is not None and time.perf_counter() > deadline:
+                    return total_flow, total_cost, False
+
+        return total_flow, total_cost, True
+
+
+def _allocate_min_cost_flow(donors, receivers, receiver_weights, total_to_redistribute, max_donor_fraction,
+                            time_budget=REDISTRIBUTION_TIME_BUDGET):
+    """
+    Βέλτιστη κατανομή ως ροή ελάχιστου κόστους:
+        πηγή → τμήμα δοτών → ομάδα δεκτών του ίδιου τμήματος, ή → κοινός κόμβος (+MCF_DEPT_PENALTY) → ομάδα δεκτών → καταβόθρα
+    Κάθε δότης δίνει έως max(1, int(αδιάθετα × max_donor_fraction)) και κάθε δέκτης δέχεται έως
+    ΔΙΑΘΕΣΙΜΑ − ΑΔΙΑΘΕΤΑ. Το κόστος ανά ραντεβού ενός δέκτη είναι το βάρος του κβαντισμένο σε
+    MCF_COST_LEVELS επίπεδα (μεγαλύτερο βάρος = φθηνότερο).
+    Δότες του ίδιου τμήματος και δέκτες ίδιου (τμήματος, επιπέδου) είναι ισοδύναμοι ως προς το κόστος,
+    οπότε ο γράφος χτίζεται πάνω σε αυτές τις ομάδες και η λύση μοιράζεται μετά σε δότες/δέκτες·
+    το μέγεθος του γράφου δεν εξαρτάται από το πλήθος των ομάδων του νοσοκομείου.
+    Επιστρέφει τους ίδιους πίνακες με το _allocate_greedy, ή None αν εξαντληθεί το time_budget
+    (ο καλών περνά τότε στην άπληστη κατανομή).
+    """
+    started = time.perf_counter()
+
+    donor_unavailable = donors['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy(dtype=np.int64)
+    supply = np.where(donor_unavailable > 0,
+                      np.minimum(np.maximum(1, (donor_unavailable * max_donor_fraction).astype(np.int64)), donor_unavailable),
+                      0)
+    receiver_unavailable = receivers['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy(dtype=np.int64)
+    capacity = np.maximum(0, receivers['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].to_numpy(dtype=np.int64) - receiver_unavailable)
+
+    # Κβαντισμός κόστους δεκτών
+    weight_min, weight_max = receiver_weights.min(), receiver_weights.max()
+    if weight_max > weight_min:
+        level = np.rint((weight_max - receiver_weights) / (weight_max - weight_min) * (MCF_COST_LEVELS - 1)).astype(np.int64)
+    else:
+        level = np.zeros(len(receivers), dtype=np.int64)
+
+    # Κοινοί κωδικοί τμημάτων για δότες και δέκτες, ομάδες δεκτών ανά (τμήμα, επίπεδο)
+    dept_codes, _ = pd.factorize(np.concatenate([donors['ΤΜΗΜΑ'].to_numpy(dtype=object),
+                                                 receivers['ΤΜΗΜΑ'].to_numpy(dtype=object)]))
+    donor_dept, receiver_dept = dept_codes[:len(donors)], dept_codes[len(donors):]
+    receiver_group, group_keys = pd.factorize(receiver_dept * MCF_COST_LEVELS + level)
+    group_dept, group_level = group_keys // MCF_COST_LEVELS, group_keys % MCF_COST_LEVELS
+    dept_supply = np.bincount(donor_dept, weights=supply, minlength=dept_codes.max() + 1).astype(np.int64)
+    group_capacity = np.bincount(receiver_group, weights=capacity, minlength=len(group_keys)).astype(np.int64)
+
+    # Γράφος: 0 πηγή, 1 καταβόθρα, 2 κοινός κόμβος, μετά τα τμήματα και οι ομάδες δεκτών
+    n_depts, n_groups = len(dept_supply), len(group_keys)
+    dept_node, group_node = 3, 3 + n_depts
+    unlimited = int(supply.sum()) + 1
+    network = _MinCostFlow(3 + n_depts + n_groups)
+    direct, to_shared, from_shared = {}, {}, {}
+    for k in np.flatnonzero(dept_supply > 0).tolist():
+        network.add_edge(0, dept_node + k, int(dept_supply[k]), 0)
+        to_shared[k] = network.add_edge(dept_node + k, 2, unlimited, MCF_DEPT_PENALTY)
+    for g in range(n_groups):
+        k = int(group_dept[g])
+        if k in to_shared:
+            direct[k, g] = network.add_edge(dept_node + k, group_node + g, unlimited, int(group_level[g]))
+        from_shared[g] = network.add_edge(2, group_node + g, unlimited, int(group_level[g]))
+        network.add_edge(group_node + g, 1, int(group_capacity[g]), 0)
+
+    deadline = started + time_budget if time_budget else None
+    shipped, cost, completed = network.solve(0, 1, int(total_to_redistribute), deadline)
+    if not completed:
+        log.warning(f"   ⚠️ Εξαντλήθηκε το χρονικό όριο ({time_budget}s) του min-cost flow - χρησιμοποιείται η άπληστη κατανομή")
+        return None
+
+    # Ροές (τμήμα δοτών, ομάδα δεκτών): απευθείας + μέσω του κοινού κόμβου (οποιοδήποτε ταίριασμα έχει το ίδιο κόστος)
+    flows = {pair: network.flow(edge) for pair, edge in direct.items()}
+    shared_in = [[k, network.flow(edge)] for k, edge in to_shared.items() if network.flow(edge) > 0]
+    position = 0
+    for g, edge in from_shared.items():
+        amount = network.flow(edge)
+        while amount > 0:
+            k, available = shared_in[position]
+            moved = min(amount, available)
+            flows[k, g] = flows.get((k, g), 0) + moved
+            amount -= moved
+            shared_in[position][1] -= moved
+            if shared_in[position][1] == 0:
+                position += 1
+
+    # Μοίρασμα σε δότες (σειρά αδιάθετων) και δέκτες (σειρά βάρους) κάθε ομάδας
+    donors_of = {k: np.flatnonzero(donor_dept == k).tolist() for k in to_shared}
+    receivers_of = {g: members[np.argsort(-receiver_weights[members], kind='stable')].tolist()
+                    for g, members in enumerate(np.flatnonzero(receiver_group == g) for g in range(n_groups))}
+    donor_at, donor_left = {k: 0 for k in donors_of}, {k: int(supply[members[0]]) for k, members in donors_of.items()}
+    receiver_at, receiver_left = {g: 0 for g in receivers_of}, {g: int(capacity[members[0]]) for g, members in receivers_of.items()}
+
+    pairs = {}
+    for (k, g), amount in sorted(flows.items()):
+        while amount > 0:
+            while donor_left[k] == 0:
+                donor_at[k] += 1
+                donor_left[k] = int(supply[donors_of[k][donor_at[k]]])
+            while receiver_left[g] == 0:
+                receiver_at[g] += 1
+                receiver_left[g] = int(capacity[receivers_of[g][receiver_at[g]]])
+            d, r = donors_of[k][donor_at[k]], receivers_of[g][receiver_at[g]]
+            moved = min(amount, donor_left[k], receiver_left[g])
+            pairs[d, r] = pairs.get((d, r), 0) + moved
+            amount -= moved
+            donor_left[k] -= moved
+            receiver_left[g] -= moved
+
+    elapsed = (time.perf_counter() - started) * 1000
+    log.debug(f"   📐 Min-cost flow: {shipped:,}/{int(total_to_redistribute):,} ραντεβού, κόστος {cost:,}, "
+              f"γράφος {3 + n_depts + n_groups} κόμβων, {elapsed:.0f} ms")
+
+    if not pairs:
+        return (np.empty(0, dtype=np.int64),) * 4
+    donor_idx, receiver_idx = (np.array(x, dtype=np.int64) for x in zip(*sorted(pairs)))
+    amounts = np.array([pairs[p] for p in sorted(pairs)], dtype=np.int64)
+    # Υπόλοιπο κάθε δότη πριν από κάθε μεταφορά του (με τη σειρά του πίνακα)
+    given_before = np.cumsum(amounts) - amounts
+    block_start = np.flatnonzero(np.r_[True, donor_idx[1:] != donor_idx[:-1]])
+    given_before -= np.repeat(given_before[block_start], np.diff(np.r_[block_start, len(amounts)]))
+    return donor_idx, receiver_idx, amounts, donor_unavailable[donor_idx] - given_before
+
+
+SANKEY_MAX_LINKS = 150         # πάνω από τόσες ροές εμφανίζονται οι μεγαλύτερες, οι υπόλοιπες ενώνονται σε «Λοιποί»
+SANKEY_MIN_LINKS = 20          # κάτω όριο όταν το όριο ροών μειώνεται για να χωρέσει το JSON
+SANKEY_JSON_BUDGET = 250_000   # μέγιστο μέγεθος (bytes) του Sankey που στέλνεται στον browser
+SANKEY_DONOR_COLOR = 'rgba(255, 150, 100, 0.8)'     # Πορτοκαλί για δότες με πολλά αδιάθετα
+SANKEY_RECEIVER_COLOR = 'rgba(100, 200, 255, 0.8)'  # Γαλάζιο για δέκτες με λίγα αδιάθετα
+SANKEY_OTHER_COLOR = 'rgba(180, 180, 180, 0.8)'
+
+
+def _sankey_links(redistribution_df, max_links):
+    """
+    Κόμβοι και ροές του Sankey: οι μεταφορές ενώνονται ανά (δότης, δέκτης) και οι κόμβοι δεικτοδοτούνται με dict.
+    Αν οι ροές είναι περισσότερες από max_links, κρατούνται οι μεγαλύτερες. Κάθε υπόλοιπη ροή πηγαίνει από τον
+    δότη της (αν εμφανίζεται ήδη) στους «Λοιποί δέκτες», αλλιώς από τους «Λοιποί δότες» στον δέκτη της (αν εμφανίζεται)
+    ή στους «Λοιποί δέκτες» - έτσι οι ροές μένουν το πολύ ~3 × max_links και τα σύνολα των δοτών διατηρούνται.
+    Επιστρέφει (labels, colors, sources, targets, values, πλήθος ροών που ενώθηκαν).
+    """
+    flows = redistribution_df.groupby(['Από Ομάδα', 'Προς Ομάδα'], sort=False)['Προτεινόμενη Μεταφορά'].sum()
+    donors = flows.index.get_level_values(0).to_numpy(dtype=object)
+    receivers = flows.index.get_level_values(1).to_numpy(dtype=object)
+    values = flows.to_numpy(dtype=np.int64)
+
+    folded = 0
+    other_donor, other_receiver = object(), object()
+    if max_links and len(values) > max_links:
+        kept = np.zeros(len(values), dtype=bool)
+        kept[np.argsort(-values, kind='stable')[:max_links]] = True
+        donor_shown = np.isin(donors, donors[kept])
+        receiver_shown = np.isin(receivers, receivers[kept]) & ~donor_shown
+        tail_donors = np.where(donor_shown, donors, other_donor)
+        tail_receivers = np.where(receiver_shown, receivers, other_receiver)
+        tail = pd.Series(values[~kept]).groupby([tail_donors[~kept], tail_receivers[~kept]], sort=False).sum()
+        folded = int((~kept).sum())
+        donors = np.concatenate([donors[kept], tail.index.get_level_values(0).to_numpy(dtype=object)])
+        receivers = np.concatenate([receivers[kept], tail.index.get_level_values(1).to_numpy(dtype=object)])
+        values = np.concatenate([values[kept], tail.to_numpy(dtype=np.int64)])
+
+    # Κόμβοι: πρώτα οι δότες, μετά οι δέκτες, με τη σειρά εμφάνισης
+    nodes, labels, colors = {}, [], []
+    for role, names, color, other, other_label in (
+            ('ΔΟΤΗΣ', donors, SANKEY_DONOR_COLOR, other_donor, "Λοιποί δότες"),
+            ('ΔΕΚΤΗΣ', receivers, SANKEY_RECEIVER_COLOR, other_receiver, "Λοιποί δέκτες")):
+        for name in names:
+            if (role, name) not in nodes:
+                nodes[role, name] = len(labels)
+                labels.append(other_label if name is other else f"{role}: {name}")
+                colors.append(SANKEY_OTHER_COLOR if name is other else color)
+
+    sources = [nodes['ΔΟΤΗΣ', name] for name in donors]
+    targets = [nodes['ΔΕΚΤΗΣ', name] for name in receivers]
+    return labels, colors, sources, targets, values.tolist(), folded
+
+
+class UnavailableAppointmentsAnalyzer:
+    """
+    Κλάση για ανάλυση αδιάθετων ραντεβου και προτάσεις ανακατανομής
+    """
+    
+    def __init__(self, df, team_summary=None):
+        """
+        :param team_summary: προαιρετικοί έτοιμοι μέσοι όροι ανά (ΤΜΗΜΑ, ΟΝΟΜΑ_ΟΜΑΔΑΣ) (π.χ. από τον κύβο),
+                             ώστε η ανακατανομή να μη χρειάζεται groupby στο DataFrame
+        """
+        self.df = df
+        self.team_summary = team_summary
+        self._candidates = None
+        self._departments = None
+    
+    @timed_stage('groupby')
+    def _team_summary(self):
+        """Μέσοι όροι αδιάθετων/διαθέσιμων ανά (ΤΜΗΜΑ, ΟΝΟΜΑ_ΟΜΑΔΑΣ)"""
+        if self.team_summary is not None:
+            return self.team_summary.copy()
+        return self.df.groupby(['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ'], observed=True).agg({
+            'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': 'mean',
+            'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': 'mean'
+        }).reset_index().round(0).astype({'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': int, 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': int})
+    
+    @timed_stage('groupby')
+    def calculate_unavailable_kpis(self, filtered_df=None):
+        """
+        Υπολογισμός KPI για αδιάθετα ραντεβου
+        """
+        data = filtered_df if filtered_df is not None else self.df
+        
+        if data.empty:
+            return {}
+        
+        # ✅ ENSURE ALL VALUES ARE PYTHON NATIVE TYPES, NOT PANDAS OBJECTS
+        total_unavailable = int(data['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum())
         total_available = int(data['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].sum())
         avg_unavailable_rate = float((total_unavailable / total_available * 100) if total_available > 0 else 0)
         
         # Τμήμα με τα περισσότερα αδιάθετα
-        dept_unavailable = data.groupby('ΤΜΗΜΑ')['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum()
+        dept_unavailable = data.groupby('ΤΜΗΜΑ', observed=True)['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum()
         worst_dept = str(dept_unavailable.idxmax()) if not dept_unavailable.empty else "Άγνωστο"
         worst_dept_count = int(dept_unavailable.max()) if not dept_unavailable.empty else 0
 
-        # Τμήμα με τα λιγότερα αδιάθετα
-        best_dept = str(dept_unavailable.idxmin()) if not dept_unavailable.empty else "Άγνωστο"
-        best_dept_count = int(dept_unavailable.min()) if not dept_unavailable.empty else 0
+        # Τμήμα με τα λιγότερα αδιάθετα
+        best_dept = str(dept_unavailable.idxmin()) if not dept_unavailable.empty else "Άγνωστο"
+        best_dept_count = int(dept_unavailable.min()) if not dept_unavailable.empty else 0
+
+        
+        return {
+            'total_unavailable': total_unavailable,
+            'total_available': total_available,
+            'avg_unavailable_rate': round(avg_unavailable_rate, 1),
+            'worst_dept': worst_dept,
+            'worst_dept_count': worst_dept_count,
+            'best_dept': best_dept,                 # ← ΝΕΟ
+            'best_dept_count': best_dept_count,     # ← ΝΕΟ
+            'total_departments': int(data['ΤΜΗΜΑ'].nunique()),
+            'total_teams': int(data['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].nunique()),
+            'months_analyzed': int(data['month_ord'].nunique())
+        }
+    
+    @timed_stage('groupby')
+    def redistribution_candidates(self):
+        """
+        Δότες, δέκτες και βάρη δεκτών. Δεν εξαρτώνται από το ratio ή το όριο δότη, οπότε υπολογίζονται
+        μία φορά ανά αναλυτή και ξαναχρησιμοποιούνται σε κάθε κίνηση του slider.
+        Επιστρέφει κενό dict όταν δεν υπάρχουν καθαροί δότες και δέκτες.
+        """
+        if self._candidates is not None:
+            return self._candidates
+
+        summary = self._team_summary()
+        candidates = {}
+
+        if not summary.empty and len(summary) >= 2:
+            mean_unavailable = summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].mean()
+            std_unavailable = summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].std()
+            high_threshold = mean_unavailable + (std_unavailable * 0.5)
+            low_threshold  = mean_unavailable - (std_unavailable * 0.5)
+
+            donors = summary[summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] > high_threshold].sort_values('ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', ascending=False)
+            receivers = summary[summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] < low_threshold]
+
+            if not donors.empty and not receivers.empty:
+                # Βάρη δεκτών: 3×σπανιότητα + 2×δυναμικότητα (διανυσματικά)
+                receiver_unavailable = receivers['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy(dtype=np.int64)
+                receiver_available = receivers['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].to_numpy(dtype=np.int64)
+                scarcity_weight = np.maximum(1, mean_unavailable - receiver_unavailable + 1)
+                capacity_weight = receiver_available / max(1, receiver_available.max())
+                receiver_weights = scarcity_weight * 3 + capacity_weight * 2
+
+                candidates = {
+                    'donors': donors,
+                    'receivers': receivers,
+                    'donor_unavailable': donors['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy(dtype=np.int64),
+                    'receiver_weights': receiver_weights,
+                    # Άθροισμα με τη σειρά των δεκτών (όπως το sum της Python) ώστε οι στρογγυλοποιήσεις να μην αλλάζουν
+                    'total_receiver_weight': sum(receiver_weights.tolist())
+                }
+
+        self._candidates = candidates
+        return candidates
+
+    @timed_stage('redistribution')
+    def suggest_fair_redistribution(self, redistribute_ratio=0.30, max_donor_fraction=0.25,
+                                    solver='greedy', time_budget=REDISTRIBUTION_TIME_BUDGET, scope='hospital'):
+        """
+        Νέος αλγόριθμος έξυπνης ανακατανομής.
+        :param redistribute_ratio: ποσοστό από το σύνολο των αδιάθετων των δοτών που θα ανακατανεμηθεί (π.χ. 0.30 = 30%)
+        :param max_donor_fraction: μέγιστο ποσοστό που «δίνει» κάθε δότης σε μία μεταφορά (π.χ. 0.25 = 25%)
+        :param solver: 'greedy' (άπληστη κατανομή) ή 'mincost' (ροή ελάχιστου κόστους με χωρητικότητες δεκτών)
+        :param time_budget: χρονικό όριο (δευτερόλεπτα) του 'mincost' - αν εξαντληθεί, επιστρέφεται η άπληστη κατανομή
+        :param scope: 'hospital' (δότες/δέκτες σε όλο το νοσοκομείο) ή 'department' (ισορροπία μέσα σε κάθε τμήμα)
+        """
+        if solver not in REDISTRIBUTION_SOLVERS:
+            raise ValueError(f"Άγνωστος επιλυτής ανακατανομής: {solver}")
+        if scope not in REDISTRIBUTION_SCOPES:
+            raise ValueError(f"Άγνωστο εύρος ανακατανομής: {scope}")
+        if scope == 'department':
+            return self.suggest_department_redistribution(redistribute_ratio, max_donor_fraction, solver, time_budget)
+        log.debug("🔄 Αλγόριθμος ανακατανομής | ratio=%.2f, donor_cap=%.2f, solver=%s", redistribute_ratio, max_donor_fraction, solver)
+
+        candidates = self.redistribution_candidates()
+        if not candidates or candidates['total_receiver_weight'] <= 0:
+            return pd.DataFrame()
+
+        donors, receivers = candidates['donors'], candidates['receivers']
+        total_to_redistribute = int(max(candidates['donor_unavailable'].sum() * redistribute_ratio, len(receivers)))
+
+        if solver == 'mincost':
+            transfers = _allocate_min_cost_flow(donors, receivers, candidates['receiver_weights'],
+                                                total_to_redistribute, max_donor_fraction, time_budget)
+            if transfers is not None:
+                return _transfers_frame(donors, receivers, *transfers)
+
+        shares = np.round(total_to_redistribute * candidates['receiver_weights']
+                          / candidates['total_receiver_weight']).astype(np.int64)
+
+        transfers = _allocate_greedy(candidates['donor_unavailable'], shares, max_donor_fraction)
+        return _transfers_frame(donors, receivers, *transfers)
+    
+    @timed_stage('redistribution')
+    def suggest_department_redistribution(self, redistribute_ratio=0.30, max_donor_fraction=0.25, solver='greedy',
+                                          time_budget=REDISTRIBUTION_TIME_BUDGET, parallel=None):
+        """
+        Ανακατανομή ανά τμήμα: κάθε τμήμα (με ≥ 2 ομάδες) λύνεται ανεξάρτητα με δικά του όρια δοτών/δεκτών
+        και τα πλάνα ενώνονται στον ίδιο πίνακα. Τα τμήματα μοιράζονται σε process pool.
+        :param parallel: True/False για εξαναγκασμό, None = παράλληλα από REDISTRIBUTION_PARALLEL_MIN_TEAMS ομάδες
+        """
+        if self._departments is None:
+            summary = self._team_summary()
+            self._departments = [part for _, part in summary.groupby('ΤΜΗΜΑ', observed=True, sort=False) if len(part) >= 2]
+        departments = self._departments
+        if not departments:
+            return pd.DataFrame()
+
+        worker = functools.partial(_redistribute_department, redistribute_ratio=redistribute_ratio,
+                                   max_donor_fraction=max_donor_fraction, solver=solver, time_budget=time_budget)
+        if parallel is None:
+            parallel = len(departments) > 1 and sum(map(len, departments)) >= REDISTRIBUTION_PARALLEL_MIN_TEAMS
+
+        plans = None
+        if parallel:
+            try:
+                pool = _get_redistribution_pool()
+                chunksize = max(1, len(departments) // (4 * (REDISTRIBUTION_WORKERS or os.cpu_count() or 1)))
+                plans = list(pool.map(worker, departments, chunksize=chunksize))
+            except Exception as e:
+                log.warning(f"⚠️ Αποτυχία παράλληλης ανακατανομής ({e}) - σειριακή εκτέλεση")
+        if plans is None:
+            plans = [worker(part) for part in departments]
+
+        plans = [plan for plan in plans if not plan.empty]
+        log.debug(f"🏢 Ανακατανομή ανά τμήμα: {len(departments)} τμήματα, {len(plans)} με μεταφορές"
+                  f"{' (παράλληλα)' if parallel else ''}")
+        return pd.concat(plans, ignore_index=True) if plans else pd.DataFrame()
+    
+    def create_fair_redistribution_flow_chart(self, redistribute_ratio=0.30, max_donor_fraction=0.25,
+                                              redistribution_df=None, max_links=None):
+        """
+        Διάγραμμα ροής που χρησιμοποιεί το τρέχον ratio.
+        :param redistribution_df: έτοιμο πλάνο μεταφορών (π.χ. από get_redistribution_plan) ώστε να μην ξαναϋπολογιστεί
+        :param max_links: μέγιστο πλήθος ροών (None = SANKEY_MAX_LINKS, 0 = όλες)
+        """
+        if redistribution_df is None:
+            redistribution_df = self.suggest_fair_redistribution(
+                redistribute_ratio=redistribute_ratio,
+                max_donor_fraction=max_donor_fraction
+            )
+        
+        if redistribution_df.empty:
+            fig = go.Figure()
+            fig.add_annotation(
+                text="ℹ️ Δεν χρειάζεται ανακατανομή<br><br>" +
+                     "<b>Πιθανοί λόγοι:</b><br>" +
+                     "• Όλες οι ομάδες έχουν παρόμοια επίπεδα αδιάθετων<br>" +
+                     "• Δεν υπάρχει σημαντική διακύμανση για ανακατανομή<br>" +
+                     "• Ανεπαρκή δεδομένα (λιγότερες από 2 ομάδες)<br><br>" +
+                     "<i>Αλγόριθμος: Δότες = πολλά αδιάθετα, Δέκτες = λίγα αδιάθετα</i>",
+                xref="paper", yref="paper",
+                x=0.5, y=0.5, showarrow=False,
+                font=dict(size=14, color="darkblue"),
+                bgcolor="rgba(220,235,255,0.9)",
+                bordercolor="blue",
+                borderwidth=2,
+                borderpad=20
+            )
+            fig.update_layout(
+                title=dict(
+                    text="<b>Έξυπνη Ανακατανομή Αδιάθετων Ραντεβου</b><br>" +
+                         "<sub>Ισορροπημένη κατάσταση - δεν χρειάζεται παρέμβαση</sub>",
+                    x=0.5,
+                    font=dict(size=16)
+                ),
+                height=600,
+                showlegend=False,
+                xaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
+                yaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)'
+            )
+            return fig
+        
+        # Δημιουργία Sankey diagram βασισμένου στις πραγματικές μεταφορές
+        # (μεγαλύτερο όριο ροών → μικρότερο, μέχρι το JSON να χωρά στο SANKEY_JSON_BUDGET)
+        max_links = SANKEY_MAX_LINKS if max_links is None else max_links
+        while True:
+            fig, folded = self._sankey_figure(redistribution_df, max_links)
+            if not max_links or max_links <= SANKEY_MIN_LINKS or len(fig.to_json()) <= SANKEY_JSON_BUDGET:
+                break
+            max_links = max(SANKEY_MIN_LINKS, max_links // 2)
+        if folded:
+            log.debug(f"   🔀 Sankey: {max_links} μεγαλύτερες ροές, {folded} ενώθηκαν σε «Λοιποί»")
+        return fig
+
+    def _sankey_figure(self, redistribution_df, max_links):
+        """Sankey από τις ροές του _sankey_links - επιστρέφει (figure, πλήθος ροών που ενώθηκαν)"""
+        labels, colors, sources, targets, values, folded = _sankey_links(redistribution_df, max_links)
+
+        fig = go.Figure(data=[go.Sankey(
+            node=dict(
+                pad=15,
+                thickness=20,
+                line=dict(color="black", width=0.5),
+                label=labels,
+                color=colors,
+                hovertemplate='%{label}<extra></extra>'
+            ),
+            link=dict(
+                source=sources,
+                target=targets,
+                value=values,
+                color=['rgba(150, 180, 200, 0.4)'] * len(sources),
+                hovertemplate='<b>%{source.label}</b> → <b>%{target.label}</b><br>' +
+                             'Μεταφορά: %{value} ραντεβου<br>' +
+                             'Βελτίωση: -%{value} αδιάθετα για δέκτη<extra></extra>'
+            )
+        )])
+        
+        total_redistributed = sum(values)
+        title = (f"<b>Έξυπνη Ανακατανομή Αδιάθετων Ραντεβου</b><br>" +
+                 f"<sub>Συνολική βελτίωση: {total_redistributed} ραντεβου σε {len(redistribution_df)} μεταφορές</sub><br>" +
+                 f"<sub>Αυτόματος υπολογισμός βαρών βάσει διαθέσιμων ραντεβου</sub>")
+        if folded:
+            title += f"<br><sub>Εμφανίζονται οι {max_links} μεγαλύτερες ροές - οι υπόλοιπες {folded} στους κόμβους «Λοιποί»</sub>"
+        fig.update_layout(
+            title=dict(
+                text=title,
+                x=0.5,
+                font=dict(size=14)
+            ),
+            font=dict(size=11),
+            height=600,
+            margin=dict(t=140 if folded else 120, b=50, l=50, r=50)
+        )
+        
+        return fig, folded
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΠΡΟ-ΣΥΝΑΘΡΟΙΣΜΕΝΟΣ ΚΥΒΟΣ (ΜΗΝΑΣ × ΤΜΗΜΑ/ΟΜΑΔΑ)
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Μετρικές του κύβου - η ΕΓΓΡΑΦΕΣ μετρά γραμμές ώστε να ξεχωρίζουν οι κενοί συνδυασμοί
+CUBE_MEASURES = ['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ', 'ΕΓΓΡΑΦΕΣ']
+_UNAVAILABLE, _AVAILABLE, _BOOKED, _ROWS = range(len(CUBE_MEASURES))
+DEPT_RANKING_N = 15  # πλήθος τμημάτων στην κορυφή και στο τέλος της κατάταξης
+
+
+class AppointmentsCube:
+    """
+    Κύβος με τα αθροίσματα ανά (μήνας, τμήμα, ομάδα), χτισμένος μία φορά κατά τη φόρτωση.
+    Ο άξονας των ομάδων περιέχει μόνο τους συνδυασμούς (τμήμα, ομάδα) που υπάρχουν στα δεδομένα
+    και κρατούνται prefix sums κατά μήκος των μηνών, οπότε κάθε επιλογή περιόδου/τμημάτων/ομάδων
+    απαντάται με λίγα slices πινάκων αντί για σάρωση όλων των γραμμών.
+    """
+
+    def __init__(self, df):
+        dept_values = df['ΤΜΗΜΑ'].astype('category')
+        team_values = df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].astype('category')
+        self.departments = dept_values.cat.categories
+        self.teams = team_values.cat.categories
+        self.dept_codes = {name: code for code, name in enumerate(self.departments)}
+        self.team_codes = {name: code for code, name in enumerate(self.teams)}
+
+        # Ομάδες = υπαρκτοί συνδυασμοί (τμήμα, ομάδα), ταξινομημένοι όπως στο groupby
+        dept_code = dept_values.cat.codes.to_numpy(dtype=np.int64)
+        team_code = team_values.cat.codes.to_numpy(dtype=np.int64)
+        group_keys, group_of_row = np.unique(dept_code * len(self.teams) + team_code, return_inverse=True)
+        self.group_dept = group_keys // len(self.teams)
+        self.group_team = group_keys % len(self.teams)
+
+        month_ord = df['month_ord'].to_numpy(dtype=np.int64)
+        self.first_month = int(month_ord.min())
+        self.n_months = int(month_ord.max()) - self.first_month + 1
+        n_groups = len(group_keys)
+
+        cell = (month_ord - self.first_month) * n_groups + group_of_row.ravel()
+        values = np.zeros((self.n_months * n_groups, len(CUBE_MEASURES)), dtype=np.int64)
+        for k, measure in enumerate(CUBE_MEASURES):
+            if measure == 'ΕΓΓΡΑΦΕΣ':
+                values[:, k] = np.bincount(cell, minlength=len(values))
+            elif measure in df.columns:
+                values[:, k] = np.bincount(cell, weights=df[measure].to_numpy(dtype=np.float64),
+                                           minlength=len(values)).round().astype(np.int64)
+
+        # prefix[m] = άθροισμα των μηνών [0, m) - η γραμμή 0 είναι μηδενική
+        self.prefix = np.zeros((self.n_months + 1, n_groups, len(CUBE_MEASURES)), dtype=np.int64)
+        np.cumsum(values.reshape(self.n_months, n_groups, len(CUBE_MEASURES)), axis=0, out=self.prefix[1:])
+
+    def merged(self, delta):
+        """
+        Νέος κύβος με τις γραμμές του delta προστιθέμενες, χωρίς σάρωση των παλαιών γραμμών: οι μηνιαίες
+        τιμές ανακτώνται από τα prefix sums, τοποθετούνται στους ενωμένους άξονες μηνών/ομάδων και
+        προστίθενται τα αθροίσματα του delta. Ίδιο αποτέλεσμα με AppointmentsCube(όλες οι γραμμές).
+        """
+        parts = [self, AppointmentsCube(delta)]
+        cube = AppointmentsCube.__new__(AppointmentsCube)
+        cube.departments = self.departments.union(parts[1].departments)
+        cube.teams = self.teams.union(parts[1].teams)
+        cube.dept_codes = {name: code for code, name in enumerate(cube.departments)}
+        cube.team_codes = {name: code for code, name in enumerate(cube.teams)}
+
+        # Κλειδιά ομάδων κάθε μέρους στους νέους κωδικούς (ίδια διάταξη με το np.unique του __init__)
+        part_keys = [cube.departments.get_indexer(part.departments[part.group_dept]).astype(np.int64) * len(cube.teams) +
+                     cube.teams.get_indexer(part.teams[part.group_team]) for part in parts]
+        group_keys = np.union1d(*part_keys)
+        cube.group_dept = group_keys // len(cube.teams)
+        cube.group_team = group_keys % len(cube.teams)
+
+        cube.first_month = min(part.first_month for part in parts)
+        cube.n_months = max(part.first_month + part.n_months for part in parts) - cube.first_month
+        values = np.zeros((cube.n_months, len(group_keys), len(CUBE_MEASURES)), dtype=np.int64)
+        for part, keys in zip(parts, part_keys):
+            lo = part.first_month - cube.first_month
+            values[lo:lo + part.n_months, np.searchsorted(group_keys, keys)] += np.diff(part.prefix, axis=0)
+
+        cube.prefix = np.zeros((cube.n_months + 1, len(group_keys), len(CUBE_MEASURES)), dtype=np.int64)
+        np.cumsum(values, axis=0, out=cube.prefix[1:])
+        return cube
+
+    @property
+    def n_groups(self):
+        return len(self.group_dept)
+
+    def month_slice(self, start_ord=None, end_ord=None):
+        """Μετατροπή περιόδου (αύξοντες αριθμοί μηνών) σε [lo, hi) δείκτες μηνών του κύβου - περιλαμβάνονται και οι δύο μήνες"""
+        lo, hi = 0, self.n_months
+        if start_ord is not None and end_ord is not None:
+            lo = start_ord - self.first_month
+            hi = end_ord - self.first_month + 1
+            lo = min(max(lo, 0), self.n_months)
+            hi = max(lo, min(hi, self.n_months))
+        return lo, hi
+
+    def group_index(self, dept_list=None, team_list=None):
+        """Δείκτες των ομάδων του κύβου που ταιριάζουν στα επιλεγμένα τμήματα/ομάδες (κενό = όλα)"""
+        mask = np.ones(self.n_groups, dtype=bool)
+        if dept_list:
+            wanted = np.zeros(len(self.departments), dtype=bool)
+            wanted[[self.dept_codes[d] for d in dept_list if d in self.dept_codes]] = True
+            mask &= wanted[self.group_dept]
+        if team_list:
+            wanted = np.zeros(len(self.teams), dtype=bool)
+            wanted[[self.team_codes[t] for t in team_list if t in self.team_codes]] = True
+            mask &= wanted[self.group_team]
+        return np.flatnonzero(mask)
+
+    def select(self, start_date, end_date, dept_list, team_list):
+        """Επιλογή με τα ίδια κριτήρια με το filter_data"""
+        return self.select_key(normalize_filter_key(start_date, end_date, dept_list, team_list))
+
+    @timed_stage('filter')
+    def select_key(self, key):
+        """Επιλογή με κανονικοποιημένο κλειδί φίλτρων (βλ. normalize_filter_key)"""
+        start_ord, end_ord, dept_list, team_list = key
+        lo, hi = self.month_slice(start_ord, end_ord)
+        return CubeSelection(self, lo, hi, self.group_index(dept_list, team_list))
+
+
+def _memoized(method):
+    """Αποθήκευση του αποτελέσματος μιας μεθόδου του CubeSelection (ανά ορίσματα) στο ίδιο το αντικείμενο"""
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        key = (method.__name__,) + args
+        if key not in self._memo:
+            with METRICS.stage('groupby'):
+                self._memo[key] = method(self, *args)
+        return self._memo[key]
+    return wrapper
+
+
+class CubeSelection:
+    """
+    Αποτέλεσμα επιλογής στον κύβο: αθροίσματα ανά ομάδα, τμήμα και μήνα για την περίοδο/φίλτρα.
+    Οι πίνακες που επιστρέφει έχουν την ίδια μορφή με τα αντίστοιχα groupby πάνω στο φιλτραρισμένο DataFrame.
+    Τα αποτελέσματα κρατούνται στο αντικείμενο (που μοιράζεται μέσω της FILTER_CACHE) και δεν πρέπει να τροποποιούνται.
+    """
+
+    def __init__(self, cube, lo, hi, group_idx):
+        self.cube = cube
+        self.lo, self.hi = lo, hi
+        # Αθροίσματα της περιόδου ανά ομάδα - κρατούνται μόνο όσες έχουν εγγραφές
+        totals = cube.prefix[hi, group_idx] - cube.prefix[lo, group_idx]
+        present = totals[:, _ROWS] > 0
+        self.group_idx = group_idx[present]
+        self.totals = totals[present]
+        self._memo = {}
+
+    @property
+    def empty(self):
+        return len(self.group_idx) == 0
+
+    @_memoized
+    def group_totals(self):
+        """Αθροίσματα ανά (ΤΜΗΜΑ, ΟΝΟΜΑ_ΟΜΑΔΑΣ)"""
+        return pd.DataFrame({
+            'ΤΜΗΜΑ': self.cube.departments[self.cube.group_dept[self.group_idx]],
+            'ΟΝΟΜΑ_ΟΜΑΔΑΣ': self.cube.teams[self.cube.group_team[self.group_idx]],
+            'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': self.totals[:, _UNAVAILABLE],
+            'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': self.totals[:, _AVAILABLE],
+            'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ': self.totals[:, _BOOKED],
+            'ΕΓΓΡΑΦΕΣ': self.totals[:, _ROWS],
+        })
+
+    @_memoized
+    def team_means(self):
+        """Μέσοι όροι ανά γραμμή για κάθε (ΤΜΗΜΑ, ΟΝΟΜΑ_ΟΜΑΔΑΣ), όπως τους χρειάζεται η ανακατανομή"""
+        summary = self.group_totals()  # memoized - δεν τροποποιείται επί τόπου
+        means = {col: (summary[col] / summary['ΕΓΓΡΑΦΕΣ']).round(0).astype(int)
+                 for col in ['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ']}
+        return summary[['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']].assign(**means)
+
+    @_memoized
+    def dept_totals(self, measure='ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'):
+        """Άθροισμα μιας μετρικής ανά τμήμα (μόνο τμήματα με εγγραφές)"""
+        dept_of_group = self.cube.group_dept[self.group_idx]
+        n_depts = len(self.cube.departments)
+        sums = np.bincount(dept_of_group, weights=self.totals[:, CUBE_MEASURES.index(measure)], minlength=n_depts)
+        present = np.bincount(dept_of_group, minlength=n_depts) > 0
+        return pd.Series(sums[present].astype(np.int64), index=self.cube.departments[present], name=measure)
+
+    @_memoized
+    def dept_ranking(self, n=DEPT_RANKING_N):
+        """
+        Τα n τμήματα με τα περισσότερα και τα n με τα λιγότερα αδιάθετα (χωρίς πλήρη ταξινόμηση),
+        σε αύξουσα σειρά για οριζόντιο bar chart. Η στήλη 'ΚΑΤΗΓΟΡΙΑ' είναι 'high' (top, ≥ διάμεσο),
+        'low' (bottom, ≤ διάμεσο) ή 'middle'. Τμήματα με ίσες τιμές μετρούν ξεχωριστά.
+        """
+        dept_stats = self.dept_totals()
+        top = dept_stats.nlargest(n, keep='first')
+        bottom = dept_stats.nsmallest(n, keep='first')
+        median = dept_stats.median()
+
+        ranking = pd.concat([top, bottom[~bottom.index.isin(top.index)]])
+        in_top = np.arange(len(ranking)) < len(top)
+        in_bottom = ranking.index.isin(bottom.index)
+        values = ranking.to_numpy()
+        category = np.where(in_top & (values >= median), 'high',
+                            np.where(in_bottom & (values <= median), 'low', 'middle'))
+        return pd.DataFrame({'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': values, 'ΚΑΤΗΓΟΡΙΑ': category},
+                            index=ranking.index).sort_values('ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', kind='stable')
+
+    @_memoized
+    def monthly_totals(self):
+        """Αθροίσματα ανά μήνα (μόνο μήνες με εγγραφές)"""
+        window = self.cube.prefix[self.lo:self.hi + 1, self.group_idx].sum(axis=1)
+        monthly = np.diff(window, axis=0)
+        present = monthly[:, _ROWS] > 0
+        return pd.DataFrame({
+            'month_ord': np.arange(self.lo, self.hi)[present] + self.cube.first_month,
+            'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': monthly[present, _UNAVAILABLE],
+            'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': monthly[present, _AVAILABLE],
+        })
+
+    @_memoized
+    def monthly_series(self, by='ΤΜΗΜΑ', measure='ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'):
+        """
+        Μηνιαίες σειρές μιας μετρικής ανά τμήμα ή ομάδα (by='ΤΜΗΜΑ' ή 'ΟΝΟΜΑ_ΟΜΑΔΑΣ'):
+        γραμμές οι μήνες της περιόδου (month_ord), στήλες τα τμήματα/ομάδες της επιλογής.
+        Μήνες χωρίς εγγραφές για μια σειρά είναι NaN (κενό στη γραμμή).
+        """
+        columns = [CUBE_MEASURES.index(measure), _ROWS]
+        window = self.cube.prefix[self.lo:self.hi + 1][:, self.group_idx][:, :, columns]
+        monthly = np.diff(window, axis=0).transpose(1, 0, 2)  # (ομάδες, μήνες, [μετρική, εγγραφές])
+
+        if by == 'ΤΜΗΜΑ':
+            codes, names = self.cube.group_dept[self.group_idx], self.cube.departments
+        else:
+            codes, names = self.cube.group_team[self.group_idx], self.cube.teams
+        series, inverse = np.unique(codes, return_inverse=True)
+        sums = np.zeros((len(series),) + monthly.shape[1:], dtype=np.int64)
+        np.add.at(sums, inverse.ravel(), monthly)
+
+        values = np.where(sums[:, :, 1] > 0, sums[:, :, 0], np.nan)
+        return pd.DataFrame(values.T, index=np.arange(self.lo, self.hi) + self.cube.first_month,
+                            columns=names[series])
+
+    @_memoized
+    def kpis(self):
+        """Τα ίδια KPI με το calculate_unavailable_kpis, υπολογισμένα από τον κύβο"""
+        if self.empty:
+            return {}
+
+        total_unavailable = int(self.totals[:, _UNAVAILABLE].sum())
+        total_available = int(self.totals[:, _AVAILABLE].sum())
+        avg_unavailable_rate = float((total_unavailable / total_available * 100) if total_available > 0 else 0)
+
+        dept_unavailable = self.dept_totals()
+        window = self.cube.prefix[self.lo:self.hi + 1, self.group_idx, _ROWS].sum(axis=1)
+        return {
+            'total_unavailable': total_unavailable,
+            'total_available': total_available,
+            'avg_unavailable_rate': round(avg_unavailable_rate, 1),
+            'worst_dept': str(dept_unavailable.idxmax()),
+            'worst_dept_count': int(dept_unavailable.max()),
+            'best_dept': str(dept_unavailable.idxmin()),
+            'best_dept_count': int(dept_unavailable.min()),
+            'total_departments': len(dept_unavailable),
+            'total_teams': len(np.unique(self.cube.group_team[self.group_idx])),
+            'months_analyzed': int((np.diff(window) > 0).sum())
+        }
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΕΥΡΕΤΗΡΙΟ ΓΡΑΜΜΩΝ ΓΙΑ ΦΙΛΤΡΑΡΙΣΜΑ
+# ══════════════════════════════════════════════════════════════════════════════
+
+class RowIndex:
+    """
+    Ευρετήρια θέσεων γραμμών ανά μήνα, τμήμα και ομάδα (bucket = slice ενός argsort).
+    Το φιλτράρισμα ξεκινά από το πιο επιλεκτικό κριτήριο και ελέγχει τα υπόλοιπα μόνο στις υποψήφιες
+    γραμμές, οπότε το κόστος είναι ανάλογο της επιλογής και όχι του συνόλου των δεδομένων.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.month_ord = df['month_ord'].to_numpy()
+        self.first_month = int(self.month_ord.min()) if self.n_rows else 0
+        n_months = int(self.month_ord.max()) - self.first_month + 1 if self.n_rows else 0
+        self.month_order, self.month_offsets = self._buckets(self.month_ord - self.first_month, n_months)
+
+        self.dept_code = df['ΤΜΗΜΑ'].cat.codes.to_numpy()
+        self.team_code = df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].cat.codes.to_numpy()
+        self.dept_codes = {name: code for code, name in enumerate(df['ΤΜΗΜΑ'].cat.categories)}
+        self.team_codes = {name: code for code, name in enumerate(df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].cat.categories)}
+        self.dept_order, self.dept_offsets = self._buckets(self.dept_code, len(self.dept_codes))
+        self.team_order, self.team_offsets = self._buckets(self.team_code, len(self.team_codes))
+
+    @staticmethod
+    def _buckets(codes, n_buckets):
+        """Θέσεις γραμμών ταξινομημένες ανά κωδικό + όρια κάθε κωδικού"""
+        order = np.argsort(codes, kind='stable').astype(np.int64)
+        offsets = np.zeros(n_buckets + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=n_buckets), out=offsets[1:])
+        return order, offsets
+
+    def _codes(self, names, lookup):
+        return np.array(sorted({lookup[name] for name in names if name in lookup}), dtype=np.int64)
+
+    def positions(self, start_date, end_date, dept_list, team_list):
+        """
+        Θέσεις (iloc) των γραμμών που ταιριάζουν στα φίλτρα, σε αύξουσα σειρά.
+        Επιστρέφει None όταν δεν υπάρχει κανένα ενεργό φίλτρο (όλες οι γραμμές).
+        """
+        return self.positions_key(normalize_filter_key(start_date, end_date, dept_list, team_list))
+
+    @timed_stage('filter')
+    def positions_key(self, key):
+        """Όπως το positions, με κανονικοποιημένο κλειδί φίλτρων (βλ. normalize_filter_key)"""
+        start_ord, end_ord, dept_list, team_list = key
+        # Κάθε ενεργό κριτήριο δίνει (πλήθος υποψηφίων, συνάρτηση που επιστρέφει τους υποψήφιους, έλεγχος γραμμών)
+        criteria = []
+        if start_ord is not None and end_ord is not None:
+            lo = start_ord - self.first_month
+            hi = end_ord - self.first_month + 1
+            lo = min(max(lo, 0), len(self.month_offsets) - 1)
+            hi = max(lo, min(hi, len(self.month_offsets) - 1))
+            a, b = self.month_offsets[lo], self.month_offsets[hi]
+            criteria.append((
+                b - a,
+                lambda a=a, b=b: self.month_order[a:b],
+                lambda pos, lo=lo, hi=hi: ((self.month_ord[pos] - self.first_month >= lo) &
+                                           (self.month_ord[pos] - self.first_month < hi))
+            ))
+        for names, lookup, code, order, offsets in [
+            (dept_list, self.dept_codes, self.dept_code, self.dept_order, self.dept_offsets),
+            (team_list, self.team_codes, self.team_code, self.team_order, self.team_offsets),
+        ]:
+            if not names:
+                continue
+            codes = self._codes(names, lookup)
+            wanted = np.zeros(len(offsets) - 1, dtype=bool)
+            wanted[codes] = True
+            criteria.append((
+                int((offsets[codes + 1] - offsets[codes]).sum()),
+                lambda codes=codes, order=order, offsets=offsets: np.concatenate(
+                    [order[offsets[c]:offsets[c + 1]] for c in codes] or [np.empty(0, dtype=np.int64)]),
+                lambda pos, code=code, wanted=wanted: wanted[code[pos]]
+            ))
+
+        if not criteria:
+            return None
+
+        criteria.sort(key=lambda criterion: criterion[0])
+        positions = criteria[0][1]()
+        for _, _, accept in criteria[1:]:
+            positions = positions[accept(positions)]
+        return np.sort(positions)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΚΟΙΝΗ CACHE ΑΠΟΤΕΛΕΣΜΑΤΩΝ ΦΙΛΤΡΑΡΙΣΜΑΤΟΣ
+# ══════════════════════════════════════════════════════════════════════════════
+
+FILTER_CACHE_SIZE = 64  # μέγιστο πλήθος αποθηκευμένων επιλογών (LRU)
+
+
+def normalize_filter_key(start_date, end_date, dept_list, team_list):
+    """
+    Κανονικοποιημένο κλειδί φίλτρων: μήνες αρχής/τέλους (ή None), ταξινομημένα τμήματα και ομάδες.
+    Επιλογές που διαφέρουν μόνο στην ημέρα ή στη σειρά των τμημάτων δίνουν το ίδιο κλειδί.
+    """
+    if start_date and end_date:
+        start_ord, end_ord = (int(x) for x in _month_ordinal([pd.to_datetime(start_date), pd.to_datetime(end_date)]))
+    else:
+        start_ord = end_ord = None
+    return (start_ord, end_ord, tuple(sorted(set(dept_list or []))), tuple(sorted(set(team_list or []))))
+
+
+class LRUCache:
+    """Thread-safe LRU cache με όριο μεγέθους και μετρητές hits/misses"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Ο υπολογισμός γίνεται εκτός lock ώστε να μη μπλοκάρει άλλα callbacks
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def retain(self, keep):
+        """Διατήρηση μόνο των εγγραφών για τις οποίες keep(κλειδί) είναι True"""
+        with self._lock:
+            for key in [key for key in self._data if not keep(key)]:
+                del self._data[key]
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+
+FILTER_CACHE = LRUCache(FILTER_CACHE_SIZE)
+
+
+def get_selection(start_date, end_date, dept_list, team_list):
+    """Επιλογή στον κύβο μέσω της κοινής cache - ίδια φίλτρα από πολλά callbacks υπολογίζονται μία φορά"""
+    data = DATA.get()
+    key = normalize_filter_key(start_date, end_date, dept_list, team_list)
+    return FILTER_CACHE.get_or_compute(('selection', data.version) + key, lambda: data.cube.select_key(key))
+
+
+def get_filter_positions(start_date, end_date, dept_list, team_list):
+    """Θέσεις γραμμών για τα φίλτρα μέσω της κοινής cache (None = όλες οι γραμμές)"""
+    data = DATA.get()
+    key = normalize_filter_key(start_date, end_date, dept_list, team_list)
+    return FILTER_CACHE.get_or_compute(('positions', data.version) + key, lambda: data.row_index.positions_key(key))
+
+
+def get_redistribution_analyzer(start_date, end_date, dept_list, team_list):
+    """
+    Αναλυτής ανακατανομής ανά κατάσταση φίλτρων: οι μέσοι όροι ανά ομάδα και οι δότες/δέκτες
+    υπολογίζονται μία φορά και μένουν στον αναλυτή (βλ. redistribution_candidates)
+    """
+    data = DATA.get()
+    key = normalize_filter_key(start_date, end_date, dept_list, team_list)
+    return FILTER_CACHE.get_or_compute(
+        ('redistribution-analyzer', data.version) + key,
+        lambda: UnavailableAppointmentsAnalyzer(data.df, team_summary=get_selection(start_date, end_date, dept_list, team_list).team_means())
+    )
+
+
+def get_redistribution_plan(start_date, end_date, dept_list, team_list, ratio, max_donor_fraction=0.25,
+                            solver='greedy', scope='hospital'):
+    """
+    Πλάνο μεταφορών ανά (φίλτρα, ratio, όριο δότη, επιλυτή, εύρος) μέσω της κοινής cache.
+    Το DataFrame μοιράζεται μεταξύ διαγράμματος και πίνακα και δεν πρέπει να τροποποιείται.
+    """
+    key = normalize_filter_key(start_date, end_date, dept_list, team_list)
+    ratio, max_donor_fraction = round(float(ratio), 4), round(float(max_donor_fraction), 4)
+    version = DATA.get().version
+    analyzer = get_redistribution_analyzer(start_date, end_date, dept_list, team_list)
+    return FILTER_CACHE.get_or_compute(
+        ('redistribution-plan', version) + key + (ratio, max_donor_fraction, solver, scope),
+        lambda: analyzer.suggest_fair_redistribution(redistribute_ratio=ratio, max_donor_fraction=max_donor_fraction,
+                                                     solver=solver, scope=scope)
+    )
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΠΙΝΑΚΕΣ ΜΕ ΣΕΛΙΔΟΠΟΙΗΣΗ, ΤΑΞΙΝΟΜΗΣΗ ΚΑΙ ΦΙΛΤΡΑ ΣΤΟΝ SERVER
+# ══════════════════════════════════════════════════════════════════════════════
+
+TABLE_PAGE_SIZE = 20
+
+# Στήλες του αναλυτικού πίνακα (όνομα στο DataFrame → όνομα εμφάνισης)
+DETAILED_TABLE_COLUMNS = {
+    'ΤΜΗΜΑ': 'Τμήμα',
+    'ΟΝΟΜΑ_ΟΜΑΔΑΣ': 'Ομάδα',
+    'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': 'Αδιάθετα',
+    'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': 'Διαθέσιμα',
+    'ΠΟΣΟΣΤΟ_ΑΔΙΑΘΕΤΩΝ': 'Ποσοστό %'
+}
+
+# Τελεστές του filter_query του DataTable (τα ισοδύναμα σύμβολα στην ίδια ομάδα)
+_FILTER_OPERATORS = [['ge ', '>='], ['le ', '<='], ['lt ', '<'], ['gt ', '>'], ['ne ', '!='], ['eq ', '='],
+                     ['contains '], ['datestartswith ']]
+
+
+def _split_filter_part(filter_part):
+    """'{Στήλη} τελεστής τιμή' → (στήλη, τελεστής, τιμή) - (None, None, None) αν δεν αναγνωρίζεται"""
+    for operator_type in _FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+                value_part = value_part.strip()
+                if not value_part:
+                    return None, None, None
+                quote = value_part[0]
+                if quote == value_part[-1] and quote in ("'", '"', '`') and len(value_part) > 1:
+                    value = value_part[1:-1].replace('\\' + quote, quote)
+                elif operator_type[0] in ('contains ', 'datestartswith '):
+                    value = value_part
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+
+@timed_stage('filter')
+def apply_table_query(frame, filter_query=None, sort_by=None):
+    """Εφαρμογή του filter_query και του sort_by ενός DataTable (custom mode) σε DataFrame"""
+    if filter_query:
+        mask = np.ones(len(frame), dtype=bool)
+        for part in filter_query.split(' && '):
+            column, operator, value = _split_filter_part(part)
+            if column not in frame.columns:
+                continue
+            series = frame[column]
+            if operator in ('contains', 'datestartswith'):
+                text = series.astype(str)
+                mask &= (text.str.contains(str(value), case=False, regex=False) if operator == 'contains'
+                         else text.str.startswith(str(value))).to_numpy()
+                continue
+            if isinstance(value, float) and not pd.api.types.is_numeric_dtype(series):
+                value = str(int(value)) if value.is_integer() else str(value)
+            comparisons = {'eq': series.__eq__, 'ne': series.__ne__, 'lt': series.__lt__,
+                           'le': series.__le__, 'gt': series.__gt__, 'ge': series.__ge__}
+            try:
+                if pd.api.types.is_numeric_dtype(series) and not isinstance(value, float):
+                    raise TypeError(f"μη αριθμητική τιμή {value!r}")
+                mask &= comparisons[operator](value).to_numpy()
+            except TypeError as e:
+                # Όπως το native φιλτράρισμα του DataTable: ο άκυρος όρος αγνοείται αντί να αδειάζει ο πίνακας
+                log.warning("⚠️ Αγνοείται όρος φίλτρου πίνακα %r: %s", part, e)
+        frame = frame[mask]
+
+    if sort_by:
+        frame = frame.sort_values([s['column_id'] for s in sort_by],
+                                  ascending=[s['direction'] == 'asc' for s in sort_by], kind='stable')
+    return frame
+
+
+def get_table_view(source_key, build, filter_query=None, sort_by=None):
+    """
+    Φιλτραρισμένη/ταξινομημένη όψη ενός πίνακα μέσω της κοινής cache: η αλλαγή σελίδας
+    δεν ξαναϋπολογίζει τίποτα, μόνο κόβει τη σελίδα.
+    :param source_key: κλειδί του πλήρους πίνακα (π.χ. είδος πίνακα + κλειδί φίλτρων)
+    :param build: συνάρτηση που επιστρέφει τον πλήρη πίνακα
+    """
+    sort_key = tuple((s['column_id'], s['direction']) for s in sort_by or [])
+    return FILTER_CACHE.get_or_compute(
+        ('table-view', DATA.get().version) + tuple(source_key) + (filter_query or '', sort_key),
+        lambda: apply_table_query(build(), filter_query, sort_by)
+    )
+
+
+def table_page(view, page_current, page_size=TABLE_PAGE_SIZE):
+    """Μόνο οι γραμμές της τρέχουσας σελίδας - επιστρέφει (records, πλήθος σελίδων, τρέχουσα σελίδα)"""
+    page_size = page_size or TABLE_PAGE_SIZE
+    page_count = max(1, -(-len(view) // page_size))
+    page = min(max(page_current or 0, 0), page_count - 1)
+    return view.iloc[page * page_size:(page + 1) * page_size].to_dict('records'), page_count, page
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΦΟΡΤΩΣΗ ΔΕΔΟΜΕΝΩΝ ΚΑΙ ΑΝΑΛΥΤΗ
+# ══════════════════════════════════════════════════════════════════════════════
+
+class DatasetNotReady(RuntimeError):
+    """Τα δεδομένα δεν έχουν φορτωθεί ακόμη (ή η φόρτωση απέτυχε)"""
+
+
+class Dataset:
+    """
+    Στιγμιότυπο δεδομένων: DataFrame, κύβος, ευρετήριο γραμμών, εύρος ημερομηνιών και λίστες για τα dropdowns.
+    Δεν τροποποιείται μετά τη δημιουργία - μια ανανέωση δημιουργεί νέο στιγμιότυπο με μεγαλύτερο version,
+    ώστε οι εγγραφές της FILTER_CACHE της παλαιότερης έκδοσης να μη χρησιμοποιούνται.
+    """
+
+    def __init__(self, df, version=1, cube=None):
+        self.df = df
+        self.version = version
+        self.cube = cube if cube is not None else AppointmentsCube(df)
+        self.min_date = _ordinal_to_timestamp(df['month_ord'].min()).date()
+        self.max_date = _ordinal_to_timestamp(df['month_ord'].max()).date()
+        self.unique_departments = [d for d in sorted(df['ΤΜΗΜΑ'].unique()) if pd.notna(d) and d != '']
+        self.unique_teams = [t for t in sorted(df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].unique()) if pd.notna(t) and t != '']
+        self.loaded_at = datetime.now()
 
-        
-        return {
-            'total_unavailable': total_unavailable,
-            'total_available': total_available,
-            'avg_unavailable_rate': round(avg_unavailable_rate, 1),
-            'worst_dept': worst_dept,
-            'worst_dept_count': worst_dept_count,
-            'best_dept': best_dept,                 # ← ΝΕΟ
-            'best_dept_count': best_dept_count,     # ← ΝΕΟ
-            'total_departments': int(data['ΤΜΗΜΑ'].nunique()),
-            'total_teams': int(data['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].nunique()),
-            'months_analyzed': int(data['parsed_date'].nunique())
-        }
-    
-    def suggest_fair_redistribution(self, redistribute_ratio=0.30, max_donor_fraction=0.25):
+    @functools.cached_property
+    def row_index(self):
+        """Ευρετήριο γραμμών για το filter_data - χτίζεται την πρώτη φορά που χρειάζεται"""
+        return RowIndex(self.df)
+
+    @functools.cached_property
+    def analyzer(self):
+        """Αναλυτής για όλα τα δεδομένα (τα callbacks χρησιμοποιούν τον αναλυτή ανά φίλτρα της cache)"""
+        return UnavailableAppointmentsAnalyzer(self.df)
+
+    @functools.cached_property
+    def source_rows(self):
+        """Εγγραφές ανά αρχείο προέλευσης (στήλη SOURCE_COLUMN)"""
+        if SOURCE_COLUMN not in self.df.columns:
+            return {}
+        return {str(k): int(v) for k, v in self.df[SOURCE_COLUMN].value_counts(sort=False).items()}
+
+    def merged(self, delta):
         """
-        Νέος αλγόριθμος έξυπνης ανακατανομής.
-        :param redistribute_ratio: ποσοστό από το σύνολο των αδιάθετων των δοτών που θα ανακατανεμηθεί (π.χ. 0.30 = 30%)
-        :param max_donor_fraction: μέγιστο ποσοστό που «δίνει» κάθε δότης σε μία μεταφορά (π.χ. 0.25 = 25%)
+        Νέο στιγμιότυπο (version + 1) με τις γραμμές του delta. Μόνο ο κύβος ενημερώνεται σταδιακά
+        (κόστος ανάλογο του delta και του μεγέθους του κύβου)· το DataFrame αντιγράφεται ολόκληρο από το
+        pd.concat, άρα κάθε προσθήκη κοστίζει O(N) σε χρόνο και μνήμη (προσωρινά δύο αντίγραφα των συμπαγών
+        γραμμών). Η ανάγνωση/καθαρισμός αφορά πάντως μόνο τις νέες γραμμές, όχι ολόκληρα τα CSV.
         """
-        print(f"🔄 Αλγόριθμος ανακατανομής | ratio={redistribute_ratio:.2f}, donor_cap={max_donor_fraction:.2f}")
+        df = _concat_frames([self.df, delta])
+        # Ο κύβος παίρνει τις γραμμές του delta από το ενωμένο frame (κατηγορίες κειμένου, ίδιες με του self.df)
+        return Dataset(df, version=self.version + 1, cube=self.cube.merged(df.iloc[len(self.df):]))
 
-        summary = self.df.groupby(['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']).agg({
-            'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': 'mean',
-            'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': 'mean'
-        }).reset_index().round(0).astype({'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': int, 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': int})
 
-        if summary.empty or len(summary) < 2:
-            return pd.DataFrame()
+class DatasetHolder:
+    """
+    Κάτοχος του τρέχοντος Dataset. Η φόρτωση/ανανέωση γίνεται σε background thread ενώ το dashboard
+    εξυπηρετεί ήδη το layout· το νέο στιγμιότυπο αντικαθιστά το παλιό με μία ανάθεση (τα callbacks
+    παίρνουν πάντα ολόκληρο στιγμιότυπο μέσω get(), ποτέ μείγμα δύο εκδόσεων).
+    """
 
-        mean_unavailable = summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].mean()
-        std_unavailable = summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].std()
-        high_threshold = mean_unavailable + (std_unavailable * 0.5)
-        low_threshold  = mean_unavailable - (std_unavailable * 0.5)
+    def __init__(self, loader, files=()):
+        self.loader = loader
+        self.files = files if callable(files) else list(files)  # λίστα ή συνάρτηση (π.χ. resolve_data_files)
+        self.sources = None  # {αρχείο: _file_signature} του περιεχομένου που έχει φορτωθεί (None = άγνωστο)
+        self._current = None
+        self._load_lock = threading.Lock()
+        self._thread = None
+        self._ready = threading.Event()
+        self.status = 'idle'  # idle | loading | ready | error
+        self.error = None
+        self.load_seconds = None
 
-        donors = summary[summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] > high_threshold].copy()
-        receivers = summary[summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] < low_threshold].copy()
-        if donors.empty or receivers.empty:
-            return pd.DataFrame()
+    @property
+    def current(self):
+        """Το τρέχον Dataset ή None αν δεν έχει φορτωθεί ακόμη"""
+        return self._current
 
-        total_to_redistribute = int(max(donors['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum() * redistribute_ratio, len(receivers)))
+    def get(self):
+        """Το τρέχον Dataset - DatasetNotReady αν δεν υπάρχει ακόμη"""
+        data = self._current
+        if data is None:
+            raise DatasetNotReady(self.error or "Τα δεδομένα φορτώνονται")
+        return data
 
-        receiver_weights = []
-        for _, row in receivers.iterrows():
-            scarcity_weight = max(1, mean_unavailable - row['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] + 1)
-            capacity_weight = row['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'] / max(1, receivers['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].max())
-            total_weight = scarcity_weight * 3 + capacity_weight * 2
-            receiver_weights.append(total_weight)
+    def paths(self):
+        """Τα αρχεία δεδομένων που παρακολουθούνται (για φάκελο/glob: όσα υπάρχουν τώρα)"""
+        return self.files() if callable(self.files) else list(self.files)
 
-        receivers['ΒΑΡΟΣ'] = receiver_weights
-        total_receiver_weight = sum(receiver_weights)
-        if total_receiver_weight <= 0:
-            return pd.DataFrame()
+    def _signatures(self):
+        return {path: signature for path in self.paths() if (signature := _file_signature(path)) is not None}
 
-        receivers['ΠΟΣΟΣΤΟ'] = (receivers['ΒΑΡΟΣ'] / total_receiver_weight * 100).round(1)
-        receivers['ΜΕΡΙΔΙΟ'] = (total_to_redistribute * receivers['ΒΑΡΟΣ'] / total_receiver_weight).round(0).astype(int)
+    def load(self):
+        """Σύγχρονη πλήρης φόρτωση (ή ανανέωση) στο τρέχον thread - επιστρέφει το νέο Dataset ή None σε αποτυχία"""
+        with self._load_lock:
+            self.status = 'loading'
+            started = time.perf_counter()
+            sources = self._signatures()
+            try:
+                df = self.loader()
+                if df.empty:
+                    raise DatasetNotReady("Δεν φορτώθηκαν δεδομένα - το dashboard δεν μπορεί να λειτουργήσει χωρίς δεδομένα")
+                previous = self._current
+                data = Dataset(df, version=previous.version + 1 if previous else 1)
+            except Exception as e:
+                self.status, self.error = 'error', str(e)
+                self.sources = sources
+                log.error(f"❌ ΚΡΙΣΙΜΟ ΣΦΑΛΜΑ: {e}")
+                return None
 
-        transfers = []
-        donors_copy = donors.sort_values('ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', ascending=False).copy()
+            # Αν κάποιο αρχείο άλλαξε όσο διαβαζόταν, δεν ξέρουμε τι φορτώθηκε - ο επόμενος έλεγχος ξαναφορτώνει
+            self.sources = sources if self._signatures() == sources else None
+            return self._publish(data, started, 'load')
 
-        for _, receiver in receivers.iterrows():
-            remaining_needed = receiver['ΜΕΡΙΔΙΟ']
-            if remaining_needed <= 0:
-                continue
-            for donor_idx in donors_copy.index:
-                if remaining_needed <= 0:
-                    break
-                donor = donors_copy.loc[donor_idx]
-                available_from_donor = donor['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']
-                if available_from_donor <= 0:
-                    continue
+    def merge_appended(self, appended):
+        """
+        Σταδιακή ανανέωση: διαβάζονται μόνο οι γραμμές που προστέθηκαν στο τέλος των αρχείων ή τα νέα
+        αρχεία ({αρχείο: νέα υπογραφή}, βλ. DataFileWatcher) και συγχωνεύονται στο τρέχον Dataset.
+        Αν οι νέες γραμμές δεν διαβάζονται (π.χ. γραμμή με επιπλέον πεδία), γίνεται πλήρης φόρτωση με το
+        load(), που κρατά το τρέχον Dataset και καταγράφει status='error' όσο το αρχείο παραμένει χαλασμένο.
+        """
+        with self._load_lock:
+            self.status = 'loading'
+            started = time.perf_counter()
+            try:
+                data = self.get()
+                sources = dict(self.sources)
+                deltas = []
+                for path, signature in appended.items():
+                    offset = sources[path][0] if path in sources else 0
+                    delta = _read_appended_rows(path, offset, signature[0])
+                    log.info(f"🔄 {path}: +{_format_bytes(signature[0] - offset)}, {len(delta):,} νέες εγγραφές")
+                    if not delta.empty:
+                        deltas.append(delta)
+                    sources[path] = signature
+                if deltas:
+                    data = data.merged(_concat_frames(deltas))
+            except Exception as e:
+                log.warning(f"⚠️ Αποτυχία σταδιακής ανανέωσης ({e}) - πλήρης επαναφόρτωση")
+            else:
+                self.sources = sources
+                return self._publish(data, started, 'merge') if deltas else self._finish(data, started, 'merge')
+        return self.load()
 
-                donor_cap = max(1, int(available_from_donor * max_donor_fraction))
-                transfer_amount = min(remaining_needed, available_from_donor, donor_cap)
-
-                if transfer_amount > 0:
-                    donors_copy.loc[donor_idx, 'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] -= transfer_amount
-                    remaining_needed -= transfer_amount
-                    transfers.append({
-                        'Τμήμα': donor['ΤΜΗΜΑ'],
-                        'Από Ομάδα': donor['ΟΝΟΜΑ_ΟΜΑΔΑΣ'],
-                        'Προς Ομάδα': receiver['ΟΝΟΜΑ_ΟΜΑΔΑΣ'],
-                        'Αδιάθετα Δότη (Αρχικά)': int(donor['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']),
-                        'Αδιάθετα Δέκτη (Αρχικά)': int(receiver['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']),
-                        'Προτεινόμενη Μεταφορά': int(transfer_amount),
-                        'Νέα Αδιάθετα Δότη': int(donors_copy.loc[donor_idx, 'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']),
-                        'Νέα Αδιάθετα Δέκτη': max(0, int(receiver['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] - transfer_amount)),
-                        'Βελτίωση Δέκτη': f"+{transfer_amount} (από {receiver['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']} → {receiver['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] + transfer_amount})",
-                        'Αιτιολόγηση': f"Μείωση αδιάθετων: {transfer_amount} ραντεβού από '{donor['ΟΝΟΜΑ_ΟΜΑΔΑΣ']}' στην '{receiver['ΟΝΟΜΑ_ΟΜΑΔΑΣ']}'"
-                    })
-
-        return pd.DataFrame(transfers)
-    
-    def create_fair_redistribution_flow_chart(self, redistribute_ratio=0.30, max_donor_fraction=0.25):
-        """Διάγραμμα ροής που χρησιμοποιεί το τρέχον ratio."""
-        redistribution_df = self.suggest_fair_redistribution(
-            redistribute_ratio=redistribute_ratio,
-            max_donor_fraction=max_donor_fraction
-        )
-        
-        if redistribution_df.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="ℹ️ Δεν χρειάζεται ανακατανομή<br><br>" +
-                     "<b>Πιθανοί λόγοι:</b><br>" +
-                     "• Όλες οι ομάδες έχουν παρόμοια επίπεδα αδιάθετων<br>" +
-                     "• Δεν υπάρχει σημαντική διακύμανση για ανακατανομή<br>" +
-                     "• Ανεπαρκή δεδομένα (λιγότερες από 2 ομάδες)<br><br>" +
-                     "<i>Αλγόριθμος: Δότες = πολλά αδιάθετα, Δέκτες = λίγα αδιάθετα</i>",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=14, color="darkblue"),
-                bgcolor="rgba(220,235,255,0.9)",
-                bordercolor="blue",
-                borderwidth=2,
-                borderpad=20
-            )
-            fig.update_layout(
-                title=dict(
-                    text="<b>Έξυπνη Ανακατανομή Αδιάθετων Ραντεβου</b><br>" +
-                         "<sub>Ισορροπημένη κατάσταση - δεν χρειάζεται παρέμβαση</sub>",
-                    x=0.5,
-                    font=dict(size=16)
-                ),
-                height=600,
-                showlegend=False,
-                xaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
-                yaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            return fig
-        
-        # Δημιουργία Sankey diagram βασισμένου στις πραγματικές μεταφορές
-        sources = []
-        targets = []
-        values = []
-        labels = []
-        colors = []
-        
-        # Συλλογή όλων των μοναδικών ομάδων
-        all_donors = redistribution_df['Από Ομάδα'].unique()
-        all_receivers = redistribution_df['Προς Ομάδα'].unique()
-        
-        # Προσθήκη δοτών
-        for donor in all_donors:
-            labels.append(f"ΔΟΤΗΣ: {donor}")
-            colors.append('rgba(255, 150, 100, 0.8)')  # Πορτοκαλί για δότες με πολλά αδιάθετα
-        
-        # Προσθήκη δεκτών
-        for receiver in all_receivers:
-            if f"ΔΟΤΗΣ: {receiver}" not in labels:  # Αποφυγή διπλών
-                labels.append(f"ΔΕΚΤΗΣ: {receiver}")
-                colors.append('rgba(100, 200, 255, 0.8)')  # Γαλάζιο για δέκτες με λίγα αδιάθετα
-        
-        # Δημιουργία συνδέσεων
-        for _, row in redistribution_df.iterrows():
-            donor_label = f"ΔΟΤΗΣ: {row['Από Ομάδα']}"
-            receiver_label = f"ΔΕΚΤΗΣ: {row['Προς Ομάδα']}"
-            
-            if donor_label in labels and receiver_label in labels:
-                source_idx = labels.index(donor_label)
-                target_idx = labels.index(receiver_label)
-                
-                sources.append(source_idx)
-                targets.append(target_idx)
-                values.append(row['Προτεινόμενη Μεταφορά'])
-        
-        if not sources:  # Fallback αν δεν υπάρχουν συνδέσεις
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Δεν υπάρχουν μεταφορές για εμφάνιση",
-                xref="paper", yref="paper", x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16, color="gray")
-            )
-            fig.update_layout(title="Έξυπνη Ανακατανομή", height=500)
-            return fig
-        
-        fig = go.Figure(data=[go.Sankey(
-            node=dict(
-                pad=15,
-                thickness=20,
-                line=dict(color="black", width=0.5),
-                label=labels,
-                color=colors,
-                hovertemplate='%{label}<extra></extra>'
-            ),
-            link=dict(
-                source=sources,
-                target=targets,
-                value=values,
-                color=['rgba(150, 180, 200, 0.4)'] * len(sources),
-                hovertemplate='<b>%{source.label}</b> → <b>%{target.label}</b><br>' +
-                             'Μεταφορά: %{value} ραντεβου<br>' +
-                             'Βελτίωση: -%{value} αδιάθετα για δέκτη<extra></extra>'
-            )
-        )])
-        
-        total_redistributed = sum(values)
-        fig.update_layout(
-            title=dict(
-                text=f"<b>Έξυπνη Ανακατανομή Αδιάθετων Ραντεβου</b><br>" +
-                     f"<sub>Συνολική βελτίωση: {total_redistributed} ραντεβου σε {len(redistribution_df)} μεταφορές</sub><br>" +
-                     f"<sub>Αυτόματος υπολογισμός βαρών βάσει διαθέσιμων ραντεβου</sub>",
-                x=0.5,
-                font=dict(size=14)
-            ),
-            font=dict(size=11),
-            height=600,
-            margin=dict(t=120, b=50, l=50, r=50)
-        )
-        
-        return fig
+    def _publish(self, data, started, stage):
+        """Ατομική αντικατάσταση του τρέχοντος Dataset + προθέρμανση της cache για τη νέα έκδοση"""
+        cube = data.cube
+        log.info(f"🧊 Κύβος συναθροίσεων: {cube.n_months} μήνες × {cube.n_groups} ομάδες ({_format_bytes(cube.prefix.nbytes)})")
+        log.info(f"📅 Εύρος ημερομηνιών για φιλτράρισμα: {data.min_date} έως {data.max_date}")
+        log.info(f"🏥 Τμήματα: {len(data.unique_departments)} ({data.unique_departments[:3]}...)")
+        log.info(f"👥 Ομάδες: {len(data.unique_teams)} ({data.unique_teams[:3]}...)")
 
-# ══════════════════════════════════════════════════════════════════════════════
-# ΦΟΡΤΩΣΗ ΔΕΔΟΜΕΝΩΝ ΚΑΙ ΑΝΑΛΥΤΗ
-# ══════════════════════════════════════════════════════════════════════════════
+        self._current = data
+        # Τα αποτελέσματα παλαιότερων εκδόσεων δεν θα ξαναζητηθούν - απελευθέρωση μνήμης
+        FILTER_CACHE.retain(lambda key: key[1] == data.version)
+        # Προθέρμανση της cache με την αρχική προβολή (όλη η περίοδος, όλα τα τμήματα/ομάδες)
+        prepare_selection(get_selection(str(data.min_date), str(data.max_date), [], []))
+        log.info(f"🗄️ Cache φίλτρων (LRU {FILTER_CACHE_SIZE}): προθερμάνθηκε η αρχική προβολή")
+        return self._finish(data, started, stage)
+
+    def _finish(self, data, started, stage):
+        self.status, self.error = 'ready', None
+        self.load_seconds = time.perf_counter() - started
+        METRICS.observe('data', stage, self.load_seconds)
+        self._ready.set()
+        log.info(f"✅ Δεδομένα έκδοσης {data.version} έτοιμα σε {self.load_seconds:.2f}s")
+        return data
+
+    def start(self):
+        """Φόρτωση σε background thread (αν δεν τρέχει ήδη μία) - επιστρέφει False αν τρέχει ήδη"""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        self._thread = threading.Thread(target=self.load, name='adiatheta-data-loader', daemon=True)
+        self._thread.start()
+        return True
+
+    def wait(self, timeout=None):
+        """Αναμονή μέχρι να υπάρχει Dataset (ξεκινά τη φόρτωση αν δεν έχει ξεκινήσει) - επιστρέφει get()"""
+        if self._current is None and self.status == 'idle':
+            self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._ready.is_set() and self.status != 'error':
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            self._ready.wait(0.05)
+        return self.get()
+
+    def health(self):
+        """Κατάσταση για το /health"""
+        data = self._current
+        return {
+            'status': self.status,
+            'ready': data is not None,
+            'version': data.version if data else None,
+            'rows': len(data.df) if data else 0,
+            'files': data.source_rows if data else {},
+            'loaded_at': data.loaded_at.isoformat(timespec='seconds') if data else None,
+            'load_seconds': round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            'error': self.error
+        }
+
+
+RELOAD_POLL_SECONDS = 30   # κάθε πόσο ελέγχονται τα αρχεία δεδομένων για αλλαγές (None = χωρίς hot reload)
+
+
+class DataFileWatcher:
+    """
+    Hot reload με polling των αρχείων δεδομένων (χωρίς εξωτερικές υπηρεσίες). Όταν ένα αρχείο μεγαλώνει
+    και το περιεχόμενο που έχει ήδη φορτωθεί μένει ίδιο (νέο μηνιαίο extract στο τέλος του), διαβάζονται
+    μόνο οι νέες γραμμές και συγχωνεύονται στο τρέχον Dataset· το ίδιο και για ένα νέο αρχείο στον φάκελο
+    DATA_SOURCE, που διαβάζεται μόνο του. Κάθε άλλη αλλαγή (αντικατεστημένο ή διαγραμμένο αρχείο) οδηγεί σε
+    πλήρη φόρτωση. Και στις δύο περιπτώσεις τα callbacks συνεχίζουν με
+    το παλιό στιγμιότυπο μέχρι να δημοσιευτεί το νέο.
+    """
+
+    def __init__(self, holder, interval=RELOAD_POLL_SECONDS):
+        self.holder = holder
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
 
-# Φόρτωση δεδομένων και έλεγχος επιτυχίας
-print("🚀 Εκκίνηση Dashboard Αδιάθετων Ραντεβου...")
-df = load_unavailable_appointments_data()
+    def _appended(self, path, known, stat):
+        """Νέα υπογραφή του αρχείου αν άλλαξε μόνο με προσθήκη ολόκληρων γραμμών στο τέλος, αλλιώς None"""
+        size = known[0]
+        if stat.st_size <= size:
+            return None
+        # Ένα πέρασμα: hash του ήδη φορτωμένου περιεχομένου (πρέπει να μην έχει αλλάξει) και μετά των νέων bytes
+        digest = hashlib.blake2b(digest_size=16)
+        block = b''
+        with open(path, 'rb') as fh:
+            while fh.tell() < size:
+                block = fh.read(min(1 << 20, size - fh.tell()))
+                if not block:
+                    return None
+                digest.update(block)
+            # Το παλιό περιεχόμενο πρέπει να τελειώνει σε ολόκληρη γραμμή, αλλιώς η προσθήκη τη συνεχίζει
+            if not block.endswith(b'\n') or digest.hexdigest() != known[2]:
+                return None
+            tail = fh.read(stat.st_size - size)
+        # Μια γραμμή που γράφεται ακόμη περιμένει τον επόμενο έλεγχο (εκτός αν το αρχείο δεν αλλάζει πια)
+        if time.time() - stat.st_mtime < self.interval:
+            end = size + tail.rfind(b'\n') + 1
+            if end == size:
+                return None
+        else:
+            end = stat.st_size
+        digest.update(tail[:end - size])
+        return end, stat.st_mtime_ns, digest.hexdigest()
+
+    def check(self):
+        """Ένας έλεγχος των αρχείων - επιστρέφει 'append', 'reload' ή None (καμία αλλαγή)"""
+        holder = self.holder
+        if holder.status in ('idle', 'loading'):
+            return None  # η τρέχουσα φόρτωση θα καταγράψει τις υπογραφές των αρχείων
+        known = holder.sources
+        stats = {path: os.stat(path) for path in holder.paths() if os.path.exists(path)}
+        if known is not None and stats.keys() == known.keys() and \
+                all((stat.st_size, stat.st_mtime_ns) == known[path][:2] for path, stat in stats.items()):
+            return None
+
+        if known is not None and stats.keys() >= known.keys() and holder.current is not None:
+            appended = {}
+            for path, stat in stats.items():
+                if path not in known:
+                    # Νέο αρχείο: διαβάζεται μόλις σταματήσει να γράφεται
+                    if time.time() - stat.st_mtime >= self.interval and (signature := _file_signature(path)):
+                        appended[path] = signature
+                    continue
+                if (stat.st_size, stat.st_mtime_ns) == known[path][:2]:
+                    continue
+                signature = self._appended(path, known[path], stat)
+                if signature is None:
+                    break
+                appended[path] = signature
+            else:
+                if appended:
+                    holder.merge_appended(appended)
+                    return 'append'
+                return None
 
-# Έλεγχος αν τα δεδομένα φορτώθηκαν επιτυχώς
-if df.empty:
-    print("❌ ΚΡΙΣΙΜΟ ΣΦΑΛΜΑ: Δεν φορτώθηκαν δεδομένα!")
-    print("Το dashboard δεν μπορεί να λειτουργήσει χωρίς δεδομένα.")
-    exit(1)
+        log.info("🔄 Αλλαγή στα αρχεία δεδομένων - πλήρης επαναφόρτωση")
+        holder.load()
+        return 'reload'
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                log.warning(f"⚠️ Σφάλμα ελέγχου αρχείων δεδομένων: {e}")
 
-analyzer = UnavailableAppointmentsAnalyzer(df)
+    def start(self):
+        """Έναρξη polling σε background thread (μία φορά)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='adiatheta-data-watcher', daemon=True)
+            self._thread.start()
 
-# Υπολογισμός εύρους ημερομηνιών για το DatePicker
-min_date = df['parsed_date'].min().date()
-max_date = df['parsed_date'].max().date()
-print(f"📅 Εύρος ημερομηνιών για φιλτράρισμα: {min_date} έως {max_date}")
+    def stop(self):
+        self._stop.set()
 
-# Δημιουργία λιστών για dropdowns με ασφαλείς τιμές
-unique_departments = [d for d in sorted(df['ΤΜΗΜΑ'].unique()) if pd.notna(d) and d != '']
-unique_teams = [t for t in sorted(df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].unique()) if pd.notna(t) and t != '']
 
-print(f"🏥 Τμήματα: {len(unique_departments)} ({unique_departments[:3]}...)")
-print(f"👥 Ομάδες: {len(unique_teams)} ({unique_teams[:3]}...)")
+DATA = DatasetHolder(load_unavailable_appointments_data, files=resolve_data_files)
+DATA_WATCHER = DataFileWatcher(DATA)
 
 # ══════════════════════════════════════════════════════════════════════════════
 # DASH APP SETUP
 # ══════════════════════════════════════════════════════════════════════════════
 
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
-app.title = "Dashboard Αδιάθετων Ραντεβου - 401 ΓΣΝ"
+APP_TITLE = "Dashboard Αδιάθετων Ραντεβου - 401 ΓΣΝ"
+DATA_POLL_INTERVAL_MS = 1000     # πόσο συχνά ο browser ελέγχει αν φορτώθηκαν τα δεδομένα
+DATA_REFRESH_POLL_MS = 15_000    # ...και μετά τη φόρτωση, αν υπάρχει νέα έκδοση (hot reload)
 
 # Χρωματική παλέτα
 colors = {
@@ -505,300 +2626,668 @@ def create_info_alert(content, color="info"):
     )
 
 
+def create_data_status(holder):
+    """Ειδοποίηση όσο τα δεδομένα φορτώνονται ή αν η φόρτωση απέτυχε (τίποτα όταν είναι έτοιμα)"""
+    if holder.current is not None:
+        return None
+    if holder.status == 'error':
+        return create_info_alert([html.Strong("❌ Σφάλμα φόρτωσης δεδομένων: "), str(holder.error)], "danger")
+    return create_info_alert([
+        html.Strong("⏳ Φόρτωση δεδομένων... "),
+        "Το dashboard θα ενημερωθεί αυτόματα μόλις ολοκληρωθεί."
+    ], "warning")
+
+
+TREND_MODES = {
+    'total': 'Σύνολο',
+    'ΤΜΗΜΑ': 'Ανά τμήμα',
+    'ΟΝΟΜΑ_ΟΜΑΔΑΣ': 'Ανά ομάδα'
+}
+TREND_MODE = 'total'          # προεπιλεγμένη προβολή του γραφήματος εξέλιξης
+TREND_MAX_SERIES = 200        # πάνω από τόσες σειρές εμφανίζονται αυτές με τα περισσότερα αδιάθετα
+TREND_POINT_BUDGET = 20_000   # συνολικά σημεία όλων των σειρών πριν ενεργοποιηθεί το downsampling
+TREND_MIN_POINTS = 20         # ελάχιστα σημεία ανά σειρά μετά το downsampling
+
+
+def _minmax_indices(values, n_points):
+    """
+    Downsampling min-max: χωρίζει τη σειρά σε n_points/2 διαστήματα και κρατά το ελάχιστο και το μέγιστο
+    κάθε διαστήματος (με τη χρονική τους σειρά), ώστε οι κορυφές να μη χάνονται.
+    Επιστρέφει τους δείκτες των σημείων που κρατούνται.
+    """
+    n = len(values)
+    if n <= n_points:
+        return np.arange(n)
+    buckets = max(1, n_points // 2)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = values
+    padded = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lows = offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    keep = np.unique(np.concatenate([lows, highs]))
+    return keep[keep < n]
+
+
+def create_trend_series_figure(selection, by):
+    """Μία γραμμή WebGL (Scattergl) ανά τμήμα ή ομάδα από τις μηνιαίες σειρές του κύβου"""
+    series = selection.monthly_series(by)
+    total_series = series.shape[1]
+    if total_series > TREND_MAX_SERIES:
+        series = series[series.sum().nlargest(TREND_MAX_SERIES).index]
+
+    dates = _ordinal_to_timestamp(series.index)
+    n_points = max(TREND_MIN_POINTS, TREND_POINT_BUDGET // max(1, series.shape[1]))
+    downsampled = len(dates) > n_points
+
+    traces = []
+    for name, values in zip(series.columns, series.to_numpy().T):
+        keep = _minmax_indices(values, n_points)
+        traces.append(go.Scattergl(x=dates[keep], y=values[keep], name=str(name), mode='lines',
+                                   line=dict(width=1.5), connectgaps=False))
+
+    label = 'τμήμα' if by == 'ΤΜΗΜΑ' else 'ομάδα'
+    subtitle = f"{series.shape[1]} σειρές"
+    if series.shape[1] < total_series:
+        subtitle += f" (οι {series.shape[1]} με τα περισσότερα αδιάθετα από {total_series})"
+    if downsampled:
+        subtitle += f" · downsampling σε ~{n_points} σημεία/σειρά"
+
+    fig = go.Figure(data=traces)
+    fig.update_layout(
+        title=dict(text=f"Εξέλιξη Αδιάθετων Ραντεβου ανά {label}<br><sub>{subtitle}</sub>"),
+        hovermode='closest',
+        height=500,
+        showlegend=series.shape[1] <= 50
+    )
+    fig.update_xaxes(title_text="Περίοδος")
+    fig.update_yaxes(title_text="Αριθμός Αδιάθετων Ραντεβου")
+    return fig
+
 # ══════════════════════════════════════════════════════════════════════════════
 # MAIN LAYOUT
 # ══════════════════════════════════════════════════════════════════════════════
 
-app.layout = dbc.Container([
+def serve_layout():
+    """
+    Layout ανά φόρτωση σελίδας: εξυπηρετείται αμέσως, ακόμη κι αν τα δεδομένα φορτώνονται ακόμη
+    (τότε τα φίλτρα είναι κενά και συμπληρώνονται από το callback του 'data-version').
+    """
+    data = DATA.current
+    departments = data.unique_departments if data else []
+    teams = data.unique_teams if data else []
+
+    return dbc.Container([
     
-    # HEADER
-    dbc.Row([
-        dbc.Col([
-            html.Div([
-                html.H1([
-                    "🏥 Dashboard Αδιάθετων Ραντεβου"
-                ], className="text-danger mb-2"),
-                html.H4("401 Γενικό Στρατιωτικό Νοσοκομείο Αθηνών", 
-                       className="text-muted mb-3"),
-                create_info_alert([
-                    html.Strong("💡 Οδηγίες: "),
-                    "Μελετήστε πρώτα τις οδηγίες και συστάσεις στο τέλος του dashboard, ώστε να διασφαλίσετε τη σωστή χρήση του."
-                ], "primary"),
-                html.Hr()
+        # HEADER
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    html.H1([
+                        "🏥 Dashboard Αδιάθετων Ραντεβου"
+                    ], className="text-danger mb-2"),
+                    html.H4("401 Γενικό Στρατιωτικό Νοσοκομείο Αθηνών", 
+                           className="text-muted mb-3"),
+                    create_info_alert([
+                        html.Strong("💡 Οδηγίες: "),
+                        "Μελετήστε πρώτα τις οδηγίες και συστάσεις στο τέλος του dashboard, ώστε να διασφαλίσετε τη σωστή χρήση του."
+                    ], "primary"),
+                    html.Hr()
+                ])
             ])
-        ])
-    ]),
+        ]),
     
-    # ΦΙΛΤΡΑ
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H5("🔍 Φίλτρα Ανάλυσης", className="mb-0")
-                ]),
-                dbc.CardBody([
+        # ΦΙΛΤΡΑ
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader([
+                        html.H5("🔍 Φίλτρα Ανάλυσης", className="mb-0")
+                    ]),
+                    dbc.CardBody([
+                        dbc.Row([
+                            dbc.Col([
+                                html.Label("📅 Περίοδος:", className="fw-bold"),
+                                dcc.DatePickerRange(
+                                    id='date-range',
+                                    start_date=data.min_date if data else None,
+                                    end_date=data.max_date if data else None,
+                                    min_date_allowed=data.min_date if data else None,
+                                    max_date_allowed=data.max_date if data else None,
+                                    display_format='MM/YYYY',
+                                    style={'width': '100%'}
+                                )
+                            ], md=4),
+                            dbc.Col([
+                                html.Label([
+                                    "🏢 Τμήματα (πολλαπλή επιλογή):", 
+                                    html.Small(" • Κενό = όλα • Ctrl+Click για πολλά", 
+                                             className="text-muted ms-2")
+                                ], className="fw-bold"),
+                                dcc.Dropdown(
+                                    id='dept-filter',
+                                    options=[{'label': d, 'value': d} for d in departments],
+                                    value=[],  # Κενή λίστα αρχικά = όλα τα τμήματα
+                                    multi=True,  # Επιτρέπει πολλαπλές επιλογές
+                                    placeholder="Επιλέξτε τμήματα (κενό = όλα)",
+                                    clearable=True,
+                                    style={'fontSize': '14px'}
+                                )
+                            ], md=4),
+                            dbc.Col([
+                                html.Label([
+                                    "👥 Ομάδες (πολλαπλή επιλογή):", 
+                                    html.Small(" • Κενό = όλες • Ctrl+Click για πολλές", 
+                                             className="text-muted ms-2")
+                                ], className="fw-bold"),
+                                dcc.Dropdown(
+                                    id='team-filter',
+                                    options=[{'label': t, 'value': t} for t in teams],
+                                    value=[],  # Κενή λίστα αρχικά = όλες οι ομάδες
+                                    multi=True,  # Επιτρέπει πολλαπλές επιλογές
+                                    placeholder="Επιλέξτε ομάδες (κενό = όλες)",
+                                    clearable=True,
+                                    style={'fontSize': '14px'}
+                                )
+                            ], md=4)
+                        ])
+                    ])
+                ], className="mb-4")
+            ])
+        ]),
+    
+        # Κοινή κατάσταση φίλτρων (pipeline wiring) - τα αποτελέσματα μένουν στον server
+        dcc.Store(id='filter-state'),
+        
+        # Κατάσταση φόρτωσης δεδομένων: ο browser ρωτά ανά DATA_POLL_INTERVAL_MS μέχρι να είναι έτοιμα
+        # και στη συνέχεια ανά DATA_REFRESH_POLL_MS για νέα έκδοση (hot reload)
+        html.Div(create_data_status(DATA), id='data-status'),
+        dcc.Interval(id='data-poll', interval=DATA_POLL_INTERVAL_MS if data is None else DATA_REFRESH_POLL_MS,
+                     disabled=data is not None and not RELOAD_POLL_SECONDS),
+        dcc.Store(id='data-version', data=data.version if data else None),
+    
+        # KPI CARDS
+        html.Div(id='kpi-section'),
+    
+        # ΓΡΑΦΗΜΑΤΑ - Μία γραμμή με δύο μεγάλα γραφήματα
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader([
+                        html.H5("📈 Εξέλιξη Αδιάθετων Ραντεβου", className="mb-0"),
+                        html.Small("Παρακολούθηση τάσης αδιάθετων στο χρόνο", className="text-muted")
+                    ]),
+                    dbc.CardBody([
+                        dbc.RadioItems(
+                            id='trend-mode',
+                            options=[{'label': label, 'value': value} for value, label in TREND_MODES.items()],
+                            value=TREND_MODE,
+                            inline=True,
+                            className="mb-2"
+                        ),
+                        dcc.Graph(id="trend-chart")
+                    ])
+                ], className="shadow-sm")
+            ], md=8),
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader([
+                        html.H5("🏆 Κατάταξη Τμημάτων", className="mb-0"),
+                        html.Small("Τμήματα με τα περισσότερα και λιγότερα αδιάθετα ραντεβου", className="text-muted")
+                    ]),
+                    dbc.CardBody([
+                        dcc.Graph(id="dept-ranking")
+                    ])
+                ], className="shadow-sm")
+            ], md=4)
+        ], className="mb-4"),
+    
+        # ΑΝΑΚΑΤΑΝΟΜΗ SECTION
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader([
+                        html.H4("📄 Δίκαιη Ανακατανομή Αδιάθετων Ραντεβου", className="mb-0"),
+                        html.P("Αναλογική κατανομή σε όλες τις ομάδες με βάση τις πραγματικές ανάγκες τους", 
+                               className="text-muted mb-0 mt-2")
+                    ]),
+                    dbc.CardBody([
+                        # Επεξήγηση αλγορίθμου
+                        dbc.Alert([
+                            html.H6("🧠 Βήματα Χρήσης", className="alert-heading mb-3"),
+                            html.P("1. Επιλέξτε περίοδο, το τμήμα και τις ομάδες που θέλετε να αναλύσετε.", className="mb-1"),
+
+                            html.P([
+                                "2. Ρυθμίστε το ποσοστό ανακατανομής με τον διακόπτη (slider), δηλαδή πόσα από τα «περισσευούμενα» ραντεβού των ",
+                                html.Strong("δοτών"),
+                                " θα μοιραστούν στους ",
+                                html.Strong("δέκτες"),
+                                ": μικρό ποσοστό = λίγες μεταφορές ραντεβού, μεγάλο ποσοστό = περισσότερες μεταφορές ραντεβού."
+                            ], className="mb-1"),
+
+                            html.P("3. Ελέγξτε τις προτάσεις στον πίνακα και στο διάγραμμα ροής.", className="mb-0"),
+                            html.P("4. Στο τέλος διαβάστε τις συστάσεις για τη σωστή εφαρμογή τους.", className="mb-0"),
+                        ], color="info", className="mb-4"),
+
+
+                    # Έλεγχος ποσοστού ανακατανομής
                     dbc.Row([
                         dbc.Col([
-                            html.Label("📅 Περίοδος:", className="fw-bold"),
-                            dcc.DatePickerRange(
-                                id='date-range',
-                                start_date=min_date,
-                                end_date=max_date,
-                                display_format='MM/YYYY',
-                                style={'width': '100%'}
-                            )
-                        ], md=4),
-                        dbc.Col([
-                            html.Label([
-                                "🏢 Τμήματα (πολλαπλή επιλογή):", 
-                                html.Small(" • Κενό = όλα • Ctrl+Click για πολλά", 
-                                         className="text-muted ms-2")
-                            ], className="fw-bold"),
-                            dcc.Dropdown(
-                                id='dept-filter',
-                                options=[{'label': d, 'value': d} for d in unique_departments],
-                                value=[],  # Κενή λίστα αρχικά = όλα τα τμήματα
-                                multi=True,  # Επιτρέπει πολλαπλές επιλογές
-                                placeholder="Επιλέξτε τμήματα (κενό = όλα)",
-                                clearable=True,
-                                style={'fontSize': '14px'}
+                            html.Label("🎚️ Ποσοστό Ανακατανομής", className="fw-bold"),
+                            dcc.Slider(
+                                id='redistribution-ratio',
+                                min=0.0,
+                                max=0.6,
+                                step=0.05,
+                                value=0.30,  # default 30%
+                                marks={i/100: f"{i}%" for i in range(0, 61, 10)},  # 0%,10%,...,60%
+                                tooltip={"placement": "bottom", "always_visible": False}
+                            ),
+                            html.Small(
+                                id="redistribution-ratio-text",
+                                className="text-muted",
+                                children="Τρέχον ποσοστό: 30%"
                             )
-                        ], md=4),
+                        ], md=8),
                         dbc.Col([
-                            html.Label([
-                                "👥 Ομάδες (πολλαπλή επιλογή):", 
-                                html.Small(" • Κενό = όλες • Ctrl+Click για πολλές", 
-                                         className="text-muted ms-2")
-                            ], className="fw-bold"),
-                            dcc.Dropdown(
-                                id='team-filter',
-                                options=[{'label': t, 'value': t} for t in unique_teams],
-                                value=[],  # Κενή λίστα αρχικά = όλες οι ομάδες
-                                multi=True,  # Επιτρέπει πολλαπλές επιλογές
-                                placeholder="Επιλέξτε ομάδες (κενό = όλες)",
-                                clearable=True,
-                                style={'fontSize': '14px'}
+                            html.Label("🧮 Αλγόριθμος", className="fw-bold"),
+                            dbc.RadioItems(
+                                id='redistribution-solver',
+                                options=[{'label': label, 'value': value} for value, label in REDISTRIBUTION_SOLVERS.items()],
+                                value=REDISTRIBUTION_SOLVER
+                            ),
+                            html.Label("🏢 Εύρος", className="fw-bold mt-2"),
+                            dbc.RadioItems(
+                                id='redistribution-scope',
+                                options=[{'label': label, 'value': value} for value, label in REDISTRIBUTION_SCOPES.items()],
+                                value=REDISTRIBUTION_SCOPE
                             )
                         ], md=4)
-                    ])
-                ])
-            ], className="mb-4")
-        ])
-    ]),
-    
-    # KPI CARDS
-    html.Div(id='kpi-section'),
-    
-    # ΓΡΑΦΗΜΑΤΑ - Μία γραμμή με δύο μεγάλα γραφήματα
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H5("📈 Εξέλιξη Αδιάθετων Ραντεβου", className="mb-0"),
-                    html.Small("Παρακολούθηση τάσης αδιάθετων στο χρόνο", className="text-muted")
-                ]),
-                dbc.CardBody([
-                    dcc.Graph(id="trend-chart")
-                ])
-            ], className="shadow-sm")
-        ], md=8),
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H5("🏆 Κατάταξη Τμημάτων", className="mb-0"),
-                    html.Small("Τμήματα με τα περισσότερα και λιγότερα αδιάθετα ραντεβου", className="text-muted")
-                ]),
-                dbc.CardBody([
-                    dcc.Graph(id="dept-ranking")
-                ])
-            ], className="shadow-sm")
-        ], md=4)
-    ], className="mb-4"),
-    
-    # ΑΝΑΚΑΤΑΝΟΜΗ SECTION
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H4("📄 Δίκαιη Ανακατανομή Αδιάθετων Ραντεβου", className="mb-0"),
-                    html.P("Αναλογική κατανομή σε όλες τις ομάδες με βάση τις πραγματικές ανάγκες τους", 
-                           className="text-muted mb-0 mt-2")
-                ]),
-                dbc.CardBody([
-                    # Επεξήγηση αλγορίθμου
-                    dbc.Alert([
-                        html.H6("🧠 Βήματα Χρήσης", className="alert-heading mb-3"),
-                        html.P("1. Επιλέξτε περίοδο, το τμήμα και τις ομάδες που θέλετε να αναλύσετε.", className="mb-1"),
-
-                        html.P([
-                            "2. Ρυθμίστε το ποσοστό ανακατανομής με τον διακόπτη (slider), δηλαδή πόσα από τα «περισσευούμενα» ραντεβού των ",
-                            html.Strong("δοτών"),
-                            " θα μοιραστούν στους ",
-                            html.Strong("δέκτες"),
-                            ": μικρό ποσοστό = λίγες μεταφορές ραντεβού, μεγάλο ποσοστό = περισσότερες μεταφορές ραντεβού."
-                        ], className="mb-1"),
-
-                        html.P("3. Ελέγξτε τις προτάσεις στον πίνακα και στο διάγραμμα ροής.", className="mb-0"),
-                        html.P("4. Στο τέλος διαβάστε τις συστάσεις για τη σωστή εφαρμογή τους.", className="mb-0"),
-                    ], color="info", className="mb-4"),
-
-
-                # Έλεγχος ποσοστού ανακατανομής
-                dbc.Row([
-                    dbc.Col([
-                        html.Label("🎚️ Ποσοστό Ανακατανομής", className="fw-bold"),
-                        dcc.Slider(
-                            id='redistribution-ratio',
-                            min=0.0,
-                            max=0.6,
-                            step=0.05,
-                            value=0.30,  # default 30%
-                            marks={i/100: f"{i}%" for i in range(0, 61, 10)},  # 0%,10%,...,60%
-                            tooltip={"placement": "bottom", "always_visible": False}
-                        ),
-                        html.Small(
-                            id="redistribution-ratio-text",
-                            className="text-muted",
-                            children="Τρέχον ποσοστό: 30%"
-                        )
-                    ], md=12)
-                ], className="mb-3"),
+                    ], className="mb-3"),
 
                     
-                    # Γράφημα ροής
-                    dcc.Graph(id="fair-redistribution-flow"),
+                        # Γράφημα ροής
+                        dcc.Graph(id="fair-redistribution-flow"),
                     
-                    html.Hr(),
+                        html.Hr(),
                     
-                    # Πίνακας προτάσεων
-                    html.Div(id="fair-redistribution-table")
-                ])
-            ], className="shadow-sm")
+                        # Πίνακας προτάσεων (σύνοψη + σελίδες του πλάνου από τον server)
+                        html.Div(id="fair-redistribution-table"),
+                        html.Div(id="fair-redistribution-datatable-container", children=[
+                            html.Div(id="fair-redistribution-export-links", className="mb-2"),
+                            dash_table.DataTable(
+                                id='fair-redistribution-datatable',
+                                columns=[{"name": col, "id": col, "type": "numeric" if "Αδιάθετα" in col or "Μεταφορά" in col or "%" in col else "text"}
+                                         for col in TRANSFER_COLUMNS],
+                                data=[],
+                                style_table={'overflowX': 'auto'},
+                                style_cell={'textAlign': 'left','padding': '10px','fontFamily': 'Arial','fontSize': '13px'},
+                                style_header={'backgroundColor': colors['primary'],'color': 'white','fontWeight': 'bold','textAlign': 'center'},
+                                page_action="custom",
+                                page_current=0,
+                                page_size=15,
+                                sort_action="custom",
+                                sort_by=[]
+                            )
+                        ])
+                    ])
+                ], className="shadow-sm")
+            ])
+        ], className="mb-4"),
+
+        # ΠΙΝΑΚΑΣ ΑΔΙΑΘΕΤΩΝ ΑΝΑ ΤΜΗΜΑ ΚΑΙ ΟΜΑΔΑ
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader([
+                        html.H5("📊 Πίνακας Αδιάθετων Ραντεβου ανά Τμήμα και Ομάδα", className="mb-0"),
+                        html.Small("Αναλυτικά στοιχεία αδιάθετων ραντεβου με βάση τα επιλεγμένα φίλτρα", className="text-muted")
+                    ]),
+                    dbc.CardBody([
+                        html.Div(id="detailed-table-section"),
+                        html.Div(id="detailed-table-container", children=[
+                            html.Div(id="detailed-export-links", className="mb-2"),
+                        dash_table.DataTable(
+                            id='detailed-table',
+                            columns=[
+                                {"name": col, "id": col, "type": "numeric" if col in ["Αδιάθετα", "Διαθέσιμα", "Ποσοστό %"] else "text"} 
+                                for col in DETAILED_TABLE_COLUMNS.values()
+                            ],
+                            data=[],
+                            style_table={
+                                'overflowX': 'auto',
+                                'border': '1px solid #dee2e6'
+                            },
+                            style_cell={
+                                'textAlign': 'left',
+                                'padding': '12px',
+                                'fontFamily': 'Arial, sans-serif',
+                                'fontSize': '14px',
+                                'border': '1px solid #dee2e6'
+                            },
+                            style_header={
+                                'backgroundColor': colors['primary'],
+                                'color': 'white',
+                                'fontWeight': 'bold',
+                                'textAlign': 'center',
+                                'fontSize': '14px'
+                            },
+                            style_data_conditional=[
+                                # Alternating row colors
+                                {
+                                    'if': {'row_index': 'odd'},
+                                    'backgroundColor': 'rgba(248, 249, 250, 0.8)'
+                                },
+                                # Red background for high percentages
+                                {
+                                    'if': {
+                                        'filter_query': '{Ποσοστό %} > 25',
+                                    },
+                                    'backgroundColor': 'rgba(220, 53, 69, 0.1)',
+                                    'color': '#dc3545',
+                                    'fontWeight': 'bold'
+                                },
+                                # Orange background for medium percentages  
+                                {
+                                    'if': {
+                                        'filter_query': '{Ποσοστό %} > 15 && {Ποσοστό %} <= 25',
+                                    },
+                                    'backgroundColor': 'rgba(255, 193, 7, 0.1)',
+                                    'color': '#fd7e14',
+                                    'fontWeight': 'bold'
+                                },
+                                # Green background for low percentages
+                                {
+                                    'if': {
+                                        'filter_query': '{Ποσοστό %} <= 15',
+                                    },
+                                    'backgroundColor': 'rgba(40, 167, 69, 0.1)',
+                                    'color': '#28a745',
+                                    'fontWeight': 'bold'
+                                }
+                                # Highlight high unavailable numbers
+                            ],
+                            # Σελιδοποίηση, ταξινόμηση και φίλτρα στον server - στέλνεται μόνο η τρέχουσα σελίδα
+                            page_action="custom",
+                            page_current=0,
+                            page_size=TABLE_PAGE_SIZE,
+                            sort_action="custom",
+                            sort_mode="multi",
+                            sort_by=[],
+                            style_cell_conditional=[
+                                {'if': {'column_id': 'Τμήμα'}, 'minWidth': '180px', 'maxWidth': '250px'},
+                                {'if': {'column_id': 'Ομάδα'}, 'minWidth': '150px', 'maxWidth': '200px'},
+                                {'if': {'column_id': 'Αδιάθετα'}, 'textAlign': 'center', 'minWidth': '100px'},
+                                {'if': {'column_id': 'Διαθέσιμα'}, 'textAlign': 'center', 'minWidth': '100px'},
+                                {'if': {'column_id': 'Ποσοστό %'}, 'textAlign': 'center', 'minWidth': '100px'}
+                            ],
+                            # Additional features
+                            filter_action="custom",
+                            filter_query=""
+                        ),
+                        # Table usage info
+                        html.Hr(),
+                            html.Div([
+                                html.Small([
+                                    html.Strong("💡 Χρήσιμες λειτουργίες:"),
+                                ], className="text-muted"),
+                                html.Ul([
+                                    html.Li("Κάντε κλικ στις κεφαλίδες για ταξινόμηση (ascending/descending).", className="text-muted"),
+                                    html.Li("Χρησιμοποιήστε τα φίλτρα κάτω από τις κεφαλίδες για αναζήτηση ανά στήλη (π.χ. > 20, < 5, ΟΜΑΔΑ 1).", className="text-muted"),
+                                    html.Li("Οι σύνδεσμοι εξαγωγής (πάνω από τον πίνακα) κατεβάζουν όλες τις γραμμές με τα τρέχοντα φίλτρα και ταξινόμηση.", className="text-muted"),
+                                ], style={"marginTop": "6px", "marginBottom": "6px"}),
+
+                                html.Small(html.Strong("🔎 Χρωματική κωδικοποίηση (βάφεται ολόκληρη η γραμμή):"), className="text-muted"),
+                                html.Ul([
+                                    html.Li([
+                                        html.Span("  ", style={"display": "inline-block", "width": "14px", "height": "14px",
+                                                            "backgroundColor": "rgba(40, 167, 69, 0.12)", "border": "1px solid #28a745",
+                                                            "marginRight": "8px", "verticalAlign": "middle"}),
+                                        html.Span("Πράσινο: Ποσοστό % ≤ 15 (χαμηλά αδιάθετα).", className="text-muted"),
+                                    ], style={"listStyleType": "none", "marginLeft": "0"}),
+
+                                    html.Li([
+                                        html.Span("  ", style={"display": "inline-block", "width": "14px", "height": "14px",
+                                                            "backgroundColor": "rgba(255, 193, 7, 0.12)", "border": "1px solid #fd7e14",
+                                                            "marginRight": "8px", "verticalAlign": "middle"}),
+                                        html.Span("Πορτοκαλί: 15 < Ποσοστό % ≤ 25 (μέτρια αδιάθετα).", className="text-muted"),
+                                    ], style={"listStyleType": "none", "marginLeft": "0"}),
+
+                                    html.Li([
+                                        html.Span("  ", style={"display": "inline-block", "width": "14px", "height": "14px",
+                                                            "backgroundColor": "rgba(220, 53, 69, 0.12)", "border": "1px solid #dc3545",
+                                                            "marginRight": "8px", "verticalAlign": "middle"}),
+                                        html.Span("Κόκκινο: Ποσοστό % > 25 (υψηλά αδιάθετα).", className="text-muted"),
+                                    ], style={"listStyleType": "none", "marginLeft": "0"}),
+                                ])
+                            ])
+                        ])
+                    ])
+                ], className="shadow-sm")
+            ])
+        ], className="mb-4"),
+    
+        # ΟΔΗΓΙΕΣ ΚΑΙ ΣΥΣΤΑΣΕΙΣ
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader([
+                        html.H5("💡 Οδηγίες και Συστάσεις", className="mb-0")
+                    ]),
+                    dbc.CardBody([
+                        html.Div(id="recommendations")
+                    ])
+                ], className="shadow-sm")
+            ])
+        ], className="mb-4"),
+    
+        # FOOTER
+        html.Hr(),
+        dbc.Row([
+            dbc.Col([
+                html.P([
+                    "© 2024 401 ΓΣΝ - Dashboard Αδιάθετων Ραντεβου | ",
+                    "Στόχος: Βελτιστοποίηση εξυπηρέτησης ασθενών"
+                ], className="text-center text-muted")
+            ])
         ])
-    ], className="mb-4"),
+    
+    ], fluid=True, style={'backgroundColor': '#f8f9fa', 'minHeight': '100vh', 'padding': '20px'})
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CALLBACKS
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Τρόπος σύνδεσης των callbacks που εξαρτώνται από τα φίλτρα:
+#   'pipeline' - ένα callback υπολογίζει μία φορά την επιλογή ανά αλληλεπίδραση και γράφει το κλειδί της
+#                στο dcc.Store 'filter-state'· KPI, γραφήματα, πίνακες και συστάσεις αποδίδονται από εκεί
+#   'direct'   - κάθε callback ακούει απευθείας τα τέσσερα φίλτρα (αρχική σύνδεση)
+# Ο τρόπος επιλέγεται ανά app: create_app(wiring=...)· αυτή είναι η προεπιλογή.
+CALLBACK_WIRINGS = ('pipeline', 'direct')
+CALLBACK_WIRING = 'pipeline'
+
+# Τα callbacks δηλώνονται σε επίπεδο module και συνδέονται σε κάθε app από το create_app()
+CALLBACK_REGISTRY = []
+FILTER_CALLBACK_REGISTRY = []   # (output, extra_inputs, συνάρτηση) - η σύνδεση εξαρτάται από το wiring του app
+CLIENTSIDE_REGISTRY = []   # (συνάρτηση JavaScript, dependencies) - εκτελούνται στον browser χωρίς round-trip
+
+FILTER_INPUTS = [
+    Input('date-range', 'start_date'),
+    Input('date-range', 'end_date'),
+    Input('dept-filter', 'value'),
+    Input('team-filter', 'value')
+]
+
+
+def prepare_selection(selection):
+    """Υπολογισμός όλων των συναθροίσεων που χρειάζονται τα callbacks (μένουν memoized στο CubeSelection)"""
+    if not selection.empty:
+        selection.kpis()
+        selection.monthly_totals()
+        selection.dept_totals()
+        selection.dept_ranking(DEPT_RANKING_N)
+        selection.group_totals()
+        selection.team_means()
+    return selection
+
+
+def _filter_state(start_date, end_date, dept_list, team_list):
+    """Συμπαγές payload του filter-state: τα φίλτρα όπως τα έδωσε ο χρήστης + κλειδί και έκδοση δεδομένων"""
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'dept_list': list(dept_list or []),
+        'team_list': list(team_list or []),
+        'key': list(normalize_filter_key(start_date, end_date, dept_list, team_list)),
+        'version': DATA.get().version
+    }
+
+
+def _filter_args(state):
+    return state['start_date'], state['end_date'], state['dept_list'], state['team_list']
+
+
+def dashboard_callback(*dependencies, **kwargs):
+    """Δήλωση callback με τα ίδια ορίσματα με το app.callback - η σύνδεση γίνεται στο create_app()"""
+    def register(func):
+        CALLBACK_REGISTRY.append((dependencies, kwargs, func))
+        return func
+    return register
+
+
+def clientside_callback(function, *dependencies):
+    """
+    Δήλωση clientside callback (συνάρτηση JavaScript ως κείμενο) για καθαρά παρουσιαστικές ενημερώσεις
+    που δεν χρειάζονται δεδομένα του server - η σύνδεση γίνεται στο create_app()
+    """
+    CLIENTSIDE_REGISTRY.append((function, dependencies))
+
+
+def filter_callback(*outputs, extra_inputs=()):
+    """
+    Καταχώριση callback που εξαρτάται από τα φίλτρα - συνδέεται από το create_app() σύμφωνα με το wiring του.
+    Η συνάρτηση γράφεται πάντα με ορίσματα (start_date, end_date, dept_list, team_list, *extra).
+    """
+    output = outputs[0] if len(outputs) == 1 else list(outputs)
+
+    def register(func):
+        FILTER_CALLBACK_REGISTRY.append((output, list(extra_inputs), func))
+        return func
+    return register
+
+
+def _from_filter_state(func):
+    """Η μορφή ενός filter_callback για τη σύνδεση 'pipeline': ορίσματα από το payload του filter-state"""
+    @functools.wraps(func)
+    def from_state(state, *extra):
+        if not state:
+            raise dash.exceptions.PreventUpdate
+        return func(*_filter_args(state), *extra)
+    return from_state
+
+
+def _wired_callbacks(wiring=CALLBACK_WIRING):
+    """Όλα τα callbacks του server ως (dependencies, kwargs, συνάρτηση) για τον τρόπο σύνδεσης wiring"""
+    if wiring not in CALLBACK_WIRINGS:
+        raise ValueError(f"Άγνωστος τρόπος σύνδεσης callbacks: {wiring}")
+    callbacks = list(CALLBACK_REGISTRY)
+    if wiring == 'pipeline':
+        callbacks.append(((Output('filter-state', 'data'), FILTER_INPUTS + [Input('data-version', 'data')]), {},
+                          compute_filter_state))
+    for output, extra_inputs, func in FILTER_CALLBACK_REGISTRY:
+        if wiring == 'pipeline':
+            callbacks.append(((output, [Input('filter-state', 'data')] + extra_inputs), {}, _from_filter_state(func)))
+        else:
+            callbacks.append(((output, FILTER_INPUTS + extra_inputs), {}, func))
+    return callbacks
+
+
+@dashboard_callback(
+    Output('data-version', 'data'),
+    Output('data-status', 'children'),
+    Output('data-poll', 'interval'),
+    Output('data-poll', 'disabled'),
+    Input('data-poll', 'n_intervals'),
+    State('data-version', 'data')
+)
+def poll_data_status(n_intervals, current_version):
+    """Έλεγχος για φορτωμένα/νέα δεδομένα - μετά τη φόρτωση το polling αραιώνει (ή σταματά χωρίς hot reload)"""
+    data = DATA.current
+    if data is None:
+        return dash.no_update, create_data_status(DATA), DATA_POLL_INTERVAL_MS, False
+    return (data.version if data.version != current_version else dash.no_update), None, \
+        DATA_REFRESH_POLL_MS, not RELOAD_POLL_SECONDS
+
+
+@dashboard_callback(
+    Output('dept-filter', 'options'),
+    Output('date-range', 'start_date'),
+    Output('date-range', 'end_date'),
+    Output('date-range', 'min_date_allowed'),
+    Output('date-range', 'max_date_allowed'),
+    Input('data-version', 'data'),
+    State('date-range', 'start_date'),
+    State('date-range', 'end_date'),
+    State('date-range', 'min_date_allowed'),
+    State('date-range', 'max_date_allowed'),
+    prevent_initial_call=True
+)
+def update_filters_for_data(version, start_date, end_date, previous_min, previous_max):
+    """
+    Συμπλήρωση των φίλτρων όταν φορτωθούν (νέα) δεδομένα. Η περίοδος του χρήστη διατηρείται· μόνο
+    όρια που ήταν κενά ή στα άκρα των προηγούμενων δεδομένων μετακινούνται στα νέα άκρα.
+    """
+    data = DATA.get()
+    start = data.min_date if not start_date or str(start_date)[:10] == str(previous_min)[:10] else dash.no_update
+    end = data.max_date if not end_date or str(end_date)[:10] == str(previous_max)[:10] else dash.no_update
+    return [{'label': d, 'value': d} for d in data.unique_departments], start, end, data.min_date, data.max_date
 
-    # ΠΙΝΑΚΑΣ ΑΔΙΑΘΕΤΩΝ ΑΝΑ ΤΜΗΜΑ ΚΑΙ ΟΜΑΔΑ
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H5("📊 Πίνακας Αδιάθετων Ραντεβου ανά Τμήμα και Ομάδα", className="mb-0"),
-                    html.Small("Αναλυτικά στοιχεία αδιάθετων ραντεβου με βάση τα επιλεγμένα φίλτρα", className="text-muted")
-                ]),
-                dbc.CardBody([
-                    html.Div(id="detailed-table-section")
-                ])
-            ], className="shadow-sm")
-        ])
-    ], className="mb-4"),
-    
-    # ΟΔΗΓΙΕΣ ΚΑΙ ΣΥΣΤΑΣΕΙΣ
-    dbc.Row([
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H5("💡 Οδηγίες και Συστάσεις", className="mb-0")
-                ]),
-                dbc.CardBody([
-                    html.Div(id="recommendations")
-                ])
-            ], className="shadow-sm")
-        ])
-    ], className="mb-4"),
-    
-    # FOOTER
-    html.Hr(),
-    dbc.Row([
-        dbc.Col([
-            html.P([
-                "© 2024 401 ΓΣΝ - Dashboard Αδιάθετων Ραντεβου | ",
-                "Στόχος: Βελτιστοποίηση εξυπηρέτησης ασθενών"
-            ], className="text-center text-muted")
-        ])
-    ])
-    
-], fluid=True, style={'backgroundColor': '#f8f9fa', 'minHeight': '100vh', 'padding': '20px'})
 
-# ══════════════════════════════════════════════════════════════════════════════
-# CALLBACKS
-# ══════════════════════════════════════════════════════════════════════════════
+def compute_filter_state(start_date, end_date, dept_list, team_list, version=None):
+    """
+    Ένα στάδιο υπολογισμού ανά αλληλεπίδραση (σύνδεση 'pipeline'): επιλογή + όλες οι συναθροίσεις, μία φορά.
+    Γράφει το filter-state από το οποίο αποδίδονται τα filter_callback.
+    """
+    prepare_selection(get_selection(start_date, end_date, dept_list, team_list))
+    return _filter_state(start_date, end_date, dept_list, team_list)
 
 def filter_data(start_date, end_date, dept_list, team_list):
     """
     Φιλτράρισμα δεδομένων με πολλαπλές επιλογές τμημάτων και ομάδων
+    
+    Χρησιμοποιεί το ευρετήριο γραμμών (row_index) και δεν αντιγράφει ολόκληρο το DataFrame:
+    χωρίς φίλτρα επιστρέφεται το ίδιο το df (μην το τροποποιείτε), αλλιώς μόνο οι επιλεγμένες γραμμές.
     """
     try:
-        filtered_df = df.copy()
-        
-        # Debug πληροφορίες
-        print(f"🔍 Φιλτράρισμα δεδομένων:")
-        print(f"   📅 Από: {start_date} έως {end_date}")
-        print(f"   🏢 Τμήματα: {dept_list}")
-        print(f"   👥 Ομάδες: {team_list}")
-        
-        # Φιλτράρισμα ημερομηνιών
-        if start_date and end_date and 'parsed_date' in filtered_df.columns:
-            start_date_dt = pd.to_datetime(start_date)
-            end_date_dt = pd.to_datetime(end_date)
-            
-            mask = (filtered_df['parsed_date'].dt.to_period('M') >= start_date_dt.to_period('M')) & \
-                   (filtered_df['parsed_date'].dt.to_period('M') <= end_date_dt.to_period('M'))
-            filtered_df = filtered_df[mask]
-            print(f"   📊 Μετά το φιλτράρισμα ημερομηνιών: {len(filtered_df)} εγγραφές")
-        
-        # Φιλτράρισμα τμημάτων (πολλαπλή επιλογή)
-        if dept_list and len(dept_list) > 0 and 'ΤΜΗΜΑ' in filtered_df.columns:
-            # Αν έχουν επιλεχθεί συγκεκριμένα τμήματα
-            filtered_df = filtered_df[filtered_df['ΤΜΗΜΑ'].isin(dept_list)]
-            print(f"   📊 Μετά το φιλτράρισμα τμημάτων {dept_list}: {len(filtered_df)} εγγραφές")
-        elif not dept_list or len(dept_list) == 0:
-            # Αν δεν έχει επιλεχθεί κανένα τμήμα, δείχνει όλα
-            print(f"   📊 Εμφάνιση όλων των τμημάτων: {len(filtered_df)} εγγραφές")
-        
-        # Φιλτράρισμα ομάδων (πολλαπλή επιλογή)
-        if team_list and len(team_list) > 0 and 'ΟΝΟΜΑ_ΟΜΑΔΑΣ' in filtered_df.columns:
-            # Αν έχουν επιλεχθεί συγκεκριμένες ομάδες
-            filtered_df = filtered_df[filtered_df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].isin(team_list)]
-            print(f"   📊 Μετά το φιλτράρισμα ομάδων {team_list}: {len(filtered_df)} εγγραφές")
-        elif not team_list or len(team_list) == 0:
-            # Αν δεν έχει επιλεχθεί καμία ομάδα, δείχνει όλες
-            print(f"   📊 Εμφάνιση όλων των ομάδων: {len(filtered_df)} εγγραφές")
+        log.debug("🔍 Φιλτράρισμα δεδομένων: %s έως %s, τμήματα %s, ομάδες %s", start_date, end_date, dept_list, team_list)
         
-        numeric_columns = ['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'ΠΟΣΟΣΤΟ_ΑΔΙΑΘΕΤΩΝ']
-        for col in numeric_columns:
-            if col in filtered_df.columns:
-                filtered_df[col] = filtered_df[col].fillna(0)
+        df = DATA.get().df
+        positions = get_filter_positions(start_date, end_date, dept_list, team_list)
+        if positions is None:
+            log.debug("   📊 Χωρίς φίλτρα - όλες οι εγγραφές: %d", len(df))
+            return df
         
-        # Replace NaN values with empty string for text columns  
-        text_columns = ['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']
-        for col in text_columns:
-            if col in filtered_df.columns:
-                filtered_df[col] = filtered_df[col].fillna('Άγνωστο')
-        
-        print(f"   ✅ Τελικό αποτέλεσμα: {len(filtered_df)} εγγραφές")
-        return filtered_df
+        log.debug("   ✅ Τελικό αποτέλεσμα: %d εγγραφές", len(positions))
+        return df.take(positions)
         
+    except DatasetNotReady:
+        raise
     except Exception as e:
-        print(f"❌ Σφάλμα φιλτραρίσματος: {e}")
-        return df.copy()
-
-@app.callback(
-    Output('kpi-section', 'children'),
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('dept-filter', 'value'),
-     Input('team-filter', 'value')]
-)
+        log.error(f"❌ Σφάλμα φιλτραρίσματος: {e}")
+        return DATA.get().df
+
+@filter_callback(Output('kpi-section', 'children'))
 def update_kpi_cards(start_date, end_date, dept_list, team_list):
-    filtered_df = filter_data(start_date, end_date, dept_list, team_list)
-    kpis = analyzer.calculate_unavailable_kpis(filtered_df)
+    kpis = get_selection(start_date, end_date, dept_list, team_list).kpis()
     
     if not kpis:
         return dbc.Alert("Δεν υπάρχουν δεδομένα για την επιλεγμένη περίοδο", color="warning")
     
     # ✅ ENSURE ALL VALUES ARE STRINGS/NUMBERS, NOT OBJECTS
-    selected_depts = len(dept_list) if dept_list else len(unique_departments)
-    selected_teams = len(team_list) if team_list else len(unique_teams)
+    data = DATA.get()
+    selected_depts = len(dept_list) if dept_list else len(data.unique_departments)
+    selected_teams = len(team_list) if team_list else len(data.unique_teams)
     
     # ✅ ADD SAFETY CHECKS FOR VALUES
     total_unavailable = kpis.get('total_unavailable', 0)
@@ -868,17 +3357,18 @@ def update_kpi_cards(start_date, end_date, dept_list, team_list):
     ])
 
 # --- ΝΕΟΣ CALLBACK: Δυναμικές επιλογές για team-filter ανάλογα με dept-filter ---
-@app.callback(
+@dashboard_callback(
     [Output('team-filter', 'options')],
     [Output('team-filter', 'value')],
-    [Input('dept-filter', 'value')],
+    [Input('dept-filter', 'value'), Input('data-version', 'data')],
     [State('team-filter', 'value')]
 )
-def update_team_options(selected_departments, current_team_values):
+def update_team_options(selected_departments, version, current_team_values):
     """
     Ενημερώνει τις διαθέσιμες ομάδες (team-filter) βάσει των επιλεγμένων τμημάτων.
     Κρατά μόνο όσες επιλεγμένες ομάδες παραμένουν έγκυρες.
     """
+    df = DATA.get().df
     # Αν δεν έχει επιλεγεί τμήμα -> δείξε όλες τις ομάδες
     if not selected_departments:
         all_teams = sorted([t for t in df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].dropna().unique() if t != ''])
@@ -899,34 +3389,30 @@ def update_team_options(selected_departments, current_team_values):
     return options, valid_values
 
 
-@app.callback(
-    Output('trend-chart', 'figure'),
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('dept-filter', 'value'),
-     Input('team-filter', 'value')]
-)
-def update_trend_chart(start_date, end_date, dept_list, team_list):
-    """Γράφημα εξέλιξης αδιάθετων"""
-    filtered_df = filter_data(start_date, end_date, dept_list, team_list)
+@filter_callback(Output('trend-chart', 'figure'), extra_inputs=[Input('trend-mode', 'value')])
+def update_trend_chart(start_date, end_date, dept_list, team_list, mode=TREND_MODE):
+    """Γράφημα εξέλιξης αδιάθετων - σύνολο ή μία σειρά ανά τμήμα/ομάδα"""
+    selection = get_selection(start_date, end_date, dept_list, team_list)
     
-    if filtered_df.empty:
+    if selection.empty:
         return go.Figure().add_annotation(
             text="Δεν υπάρχουν δεδομένα για εμφάνιση",
             xref="paper", yref="paper", x=0.5, y=0.5, showarrow=False
         )
+
+    if mode in ('ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ'):
+        return create_trend_series_figure(selection, mode)
     
     # Ομαδοποίηση ανά μήνα
-    monthly_data = filtered_df.groupby('parsed_date').agg({
-        'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': 'sum',
-        'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': 'sum'
-    }).reset_index()
+    monthly_data = selection.monthly_totals().copy()
+    monthly_data['parsed_date'] = _ordinal_to_timestamp(monthly_data['month_ord'])
 
     # ΥΠΟΛΟΓΙΣΕ σωστά το ποσοστό από τα αθροίσματα
     denom = monthly_data['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].replace(0, np.nan)
     monthly_data['ΠΟΣΟΣΤΟ_ΑΔΙΑΘΕΤΩΝ'] = (monthly_data['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] / denom * 100).fillna(0).round(1)
 
     
+    from plotly.subplots import make_subplots  # μόνο εδώ χρειάζεται - όχι στο import του module
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
     # Γραμμή αδιάθετων
@@ -967,53 +3453,31 @@ def update_trend_chart(start_date, end_date, dept_list, team_list):
     
     return fig
 
-@app.callback(
-    Output('dept-ranking', 'figure'),
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('dept-filter', 'value'),
-     Input('team-filter', 'value')]
-)
+@filter_callback(Output('dept-ranking', 'figure'))
 def update_dept_ranking(start_date, end_date, dept_list, team_list):
-    """Κατάταξη τμημάτων με βάση αδιάθετα - τώρα δείχνει top 15 και bottom 15"""
-    filtered_df = filter_data(start_date, end_date, dept_list, team_list)
+    """Κατάταξη τμημάτων με βάση αδιάθετα - δείχνει top και bottom DEPT_RANKING_N"""
+    selection = get_selection(start_date, end_date, dept_list, team_list)
     
-    if filtered_df.empty:
+    if selection.empty:
         return go.Figure().add_annotation(
             text="Δεν υπάρχουν δεδομένα για εμφάνιση",
             xref="paper", yref="paper", x=0.5, y=0.5, showarrow=False
         )
     
-    # Ομαδοποίηση ανά τμήμα και άθροισμα αδιάθετων
-    dept_stats = filtered_df.groupby('ΤΜΗΜΑ')['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum().sort_values(ascending=False)
-    
-    # ✅ CHANGE: Show both top 15 and bottom 15 departments
-    top_15 = dept_stats.head(15)
-    bottom_15 = dept_stats.tail(15)
-    
-    # Combine them with a separator indicator
-    combined_data = pd.concat([top_15, bottom_15])
-    combined_data = combined_data.drop_duplicates()  # Remove duplicates if dataset is small
-    
-    # Sort for display (highest to lowest)
-    combined_data = combined_data.sort_values(ascending=True)
-    
-    # Colors based on values - red for high, green for low
-    colors_list = []
-    for x in combined_data.values:
-        if x in top_15.values and x >= dept_stats.median():
-            colors_list.append('#e74c3c')  # Red for high unavailable
-        elif x in bottom_15.values and x <= dept_stats.median():
-            colors_list.append('#27ae60')  # Green for low unavailable  
-        else:
-            colors_list.append('#f39c12')  # Orange for middle values
+    # Top/bottom DEPT_RANKING_N τμήματα με την κατηγορία χρώματος τους (από τον κύβο)
+    ranking = selection.dept_ranking(DEPT_RANKING_N)
+    ranking_colors = {
+        'high': '#e74c3c',    # Red for high unavailable
+        'low': '#27ae60',     # Green for low unavailable
+        'middle': '#f39c12'   # Orange for middle values
+    }
     
     fig = go.Figure(go.Bar(
-        x=combined_data.values,
-        y=combined_data.index,
+        x=ranking['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'],
+        y=ranking.index,
         orientation='h',
-        marker_color=colors_list,
-        text=[f'{x:,}' for x in combined_data.values],
+        marker_color=ranking['ΚΑΤΗΓΟΡΙΑ'].map(ranking_colors).tolist(),
+        text=[f'{x:,}' for x in ranking['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].tolist()],
         textposition='outside'
     ))
     
@@ -1027,29 +3491,28 @@ def update_dept_ranking(start_date, end_date, dept_list, team_list):
     
     return fig
 
-@app.callback(
-    [Output('fair-redistribution-flow', 'figure'),
-     Output('fair-redistribution-table', 'children'),
-     Output('redistribution-ratio-text', 'children')],  # ← νέο output για να δείχνουμε το ποσοστό
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('dept-filter', 'value'),
-     Input('team-filter', 'value'),
-     Input('redistribution-ratio', 'value')]            # ← νέο input
+@filter_callback(
+    Output('fair-redistribution-flow', 'figure'),
+    Output('fair-redistribution-table', 'children'),
+    extra_inputs=[Input('redistribution-ratio', 'value'), Input('redistribution-solver', 'value'),
+                  Input('redistribution-scope', 'value')]
 )
-def update_fair_redistribution_analysis(start_date, end_date, dept_list, team_list, ratio):
-    filtered_df = filter_data(start_date, end_date, dept_list, team_list)
-    temp_analyzer = UnavailableAppointmentsAnalyzer(filtered_df)
-
-    # Χρησιμοποίησε το ratio από το slider
-    flow_fig = temp_analyzer.create_fair_redistribution_flow_chart(
-        redistribute_ratio=ratio,
-        max_donor_fraction=0.25  # μπορείς να το κάνεις επίσης slider αργότερα
+def update_fair_redistribution_analysis(start_date, end_date, dept_list, team_list, ratio,
+                                        solver=REDISTRIBUTION_SOLVER, scope=REDISTRIBUTION_SCOPE):
+    # Ο αναλυτής (δότες/δέκτες) μένει στην cache ανά φίλτρα· στο σύρσιμο του slider τρέχει μόνο η κατανομή
+    temp_analyzer = get_redistribution_analyzer(start_date, end_date, dept_list, team_list)
+    redistribution_df = get_redistribution_plan(
+        start_date, end_date, dept_list, team_list, ratio,
+        max_donor_fraction=0.25,  # μπορείς να το κάνεις επίσης slider αργότερα
+        solver=solver,
+        scope=scope
     )
 
-    redistribution_df = temp_analyzer.suggest_fair_redistribution(
+    # Το διάγραμμα και ο πίνακας χρησιμοποιούν το ίδιο πλάνο
+    flow_fig = temp_analyzer.create_fair_redistribution_flow_chart(
         redistribute_ratio=ratio,
-        max_donor_fraction=0.25
+        max_donor_fraction=0.25,
+        redistribution_df=redistribution_df
     )
 
     if redistribution_df.empty:
@@ -1064,37 +3527,63 @@ def update_fair_redistribution_analysis(start_date, end_date, dept_list, team_li
                 html.H5("✅ Επιτυχής Δίκαιη Ανακατανομή!", className="alert-heading text-success"),
                 html.P([
                     f"Συνολική ανακατανομή: ", html.Strong(f"{total_redistributed:,} ραντεβού"),
-                    f" | Ratio: {int(ratio*100)}%"
+                    f" | Ratio: {int(ratio*100)}%" + (" | Ανά τμήμα" if scope == 'department' else "")
                 ], className="mb-2"),
-                html.P("Βάρη δεκτών: 3×σπανιότητα + 2×δυναμικότητα.", className="mb-0 small text-muted")
+                html.P("Βάρη δεκτών: 3×σπανιότητα + 2×δυναμικότητα." if solver == 'greedy' else
+                       "Βέλτιστη ροή: όριο ανά δότη, χωρητικότητα δέκτη (διαθέσιμα − αδιάθετα), κόστος με βάση "
+                       "την ανάγκη του δέκτη" + (", προτίμηση μεταφορών εντός τμήματος." if MCF_DEPT_PENALTY else "."),
+                       className="mb-0 small text-muted")
             ], color="success", className="mb-3"),
-            dash_table.DataTable(
-                columns=[{"name": col, "id": col, "type": "numeric" if "Αδιάθετα" in col or "Μεταφορά" in col or "%" in col else "text"} 
-                         for col in redistribution_df.columns],
-                data=redistribution_df.to_dict('records'),
-                style_table={'overflowX': 'auto'},
-                style_cell={'textAlign': 'left','padding': '10px','fontFamily': 'Arial','fontSize': '13px'},
-                style_header={'backgroundColor': colors['primary'],'color': 'white','fontWeight': 'bold','textAlign': 'center'},
-                sort_action="native",
-                page_size=15
-            )
+            html.H6(f"📋 Προτεινόμενες μεταφορές ({len(redistribution_df):,})", className="mb-2")
         ])
 
-    ratio_text = f"Τρέχον ποσοστό: {int(ratio*100)}%"
-    return flow_fig, table_content, ratio_text
+    return flow_fig, table_content
+
+
+# Το ποσοστό δίπλα στον slider ενημερώνεται στον browser, χωρίς να περιμένει την ανακατανομή
+clientside_callback(
+    """
+    function(ratio) {
+        return 'Τρέχον ποσοστό: ' + Math.round((ratio || 0) * 100) + '%';
+    }
+    """,
+    Output('redistribution-ratio-text', 'children'),
+    Input('redistribution-ratio', 'value')
+)
 
 
-@app.callback(
-    Output('recommendations', 'children'),
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('dept-filter', 'value'),
-     Input('team-filter', 'value')]
+@filter_callback(
+    Output('fair-redistribution-datatable', 'data'),
+    Output('fair-redistribution-datatable', 'page_count'),
+    Output('fair-redistribution-datatable-container', 'style'),
+    Output('fair-redistribution-export-links', 'children'),
+    extra_inputs=[Input('redistribution-ratio', 'value'), Input('redistribution-solver', 'value'),
+                  Input('redistribution-scope', 'value'), Input('fair-redistribution-datatable', 'page_current'),
+                  Input('fair-redistribution-datatable', 'page_size'), Input('fair-redistribution-datatable', 'sort_by')]
 )
+def update_fair_redistribution_page(start_date, end_date, dept_list, team_list, ratio,
+                                    solver=REDISTRIBUTION_SOLVER, scope=REDISTRIBUTION_SCOPE,
+                                    page_current=0, page_size=15, sort_by=None):
+    """Μόνο η ορατή σελίδα του πλάνου ανακατανομής (το πλάνο έρχεται από την cache)"""
+    plan_args = (start_date, end_date, dept_list, team_list, ratio, 0.25, solver, scope)
+    if get_redistribution_plan(*plan_args).empty:
+        return [], 1, {'display': 'none'}, None
+
+    view = get_table_view(
+        ('redistribution',) + normalize_filter_key(start_date, end_date, dept_list, team_list)
+        + (round(float(ratio), 4), solver, scope),
+        lambda: get_redistribution_plan(*plan_args),
+        sort_by=sort_by
+    )
+    records, page_count, _ = table_page(view, page_current, page_size)
+    links = export_links('redistribution', start_date, end_date, dept_list, team_list,
+                         ratio=ratio, solver=solver, scope=scope, sort_by=json.dumps(sort_by) if sort_by else None)
+    return records, page_count, {}, links
+
+@filter_callback(Output('recommendations', 'children'))
 def update_recommendations(start_date, end_date, dept_list, team_list):
     """Συστάσεις και οδηγίες"""
-    filtered_df = filter_data(start_date, end_date, dept_list, team_list)
-    kpis = analyzer.calculate_unavailable_kpis(filtered_df)
+    kpis = get_selection(start_date, end_date, dept_list, team_list).kpis()
     
     recommendations = []
     
@@ -1147,54 +3636,45 @@ def update_recommendations(start_date, end_date, dept_list, team_list):
     
     return html.Div(recommendations)
 
-@app.callback(
-    Output('detailed-table-section', 'children'),
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('dept-filter', 'value'),
-     Input('team-filter', 'value')]
-)
-def update_detailed_table(start_date, end_date, dept_list, team_list):
-    """Πίνακας αδιάθετων ραντεβου ανά τμήμα και ομάδα"""
-    filtered_df = filter_data(start_date, end_date, dept_list, team_list)
-    
-    if filtered_df.empty:
-        return dbc.Alert([
-            html.H5("ℹ️ Δεν υπάρχουν δεδομένα", className="alert-heading"),
-            html.P("Δεν βρέθηκαν δεδομένα για τα επιλεγμένα φίλτρα. Δοκιμάστε να αλλάξετε τα κριτήρια αναζήτησης.", className="mb-0")
-        ], color="warning")
-    
-    # ✅ CORRECTED - Use the right column names
-    summary_stats = filtered_df.groupby(['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']).agg({
-        'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': 'sum',
-        'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': 'sum'
-    }).reset_index()
-    
-    # ✅ CHANGE: Remove the "Σύνολο" column calculation as requested
-    # summary_stats['ΣΥΝΟΛΙΚΑ_ΡΑΝΤΕΒΟΥ'] = summary_stats['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] + summary_stats['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ']
+def _detailed_summary(selection):
+    """Σύνοψη ανά τμήμα/ομάδα με ονόματα στηλών για εμφάνιση, ταξινομημένη κατά αδιάθετα"""
+    summary_stats = selection.group_totals()[['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ', 'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ']]
     
     # Calculate percentage without total column
-    summary_stats['ΠΟΣΟΣΤΟ_ΑΔΙΑΘΕΤΩΝ'] = (
+    summary_stats = summary_stats.assign(ΠΟΣΟΣΤΟ_ΑΔΙΑΘΕΤΩΝ=(
         summary_stats['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] / (summary_stats['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ']) * 100
-    ).round(1)
+    ).round(1))
     
     # Sort by unavailable appointments (descending)
     summary_stats = summary_stats.sort_values('ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', ascending=False)
+    return summary_stats.rename(columns=DETAILED_TABLE_COLUMNS).reset_index(drop=True)
+
+
+def get_detailed_summary(start_date, end_date, dept_list, team_list):
+    """Η σύνοψη του αναλυτικού πίνακα μέσω της κοινής cache (κοινή για info panel και σελίδες)"""
+    key = normalize_filter_key(start_date, end_date, dept_list, team_list)
+    return FILTER_CACHE.get_or_compute(
+        ('detailed-summary', DATA.get().version) + key,
+        lambda: _detailed_summary(get_selection(start_date, end_date, dept_list, team_list))
+    )
+
+
+@filter_callback(Output('detailed-table-section', 'children'))
+def update_detailed_table(start_date, end_date, dept_list, team_list):
+    """Πίνακας αδιάθετων ραντεβου ανά τμήμα και ομάδα"""
+    selection = get_selection(start_date, end_date, dept_list, team_list)
     
-    # ✅ UPDATED - Column mapping without "Σύνολο"
-    display_columns = {
-        'ΤΜΗΜΑ': 'Τμήμα',
-        'ΟΝΟΜΑ_ΟΜΑΔΑΣ': 'Ομάδα',
-        'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': 'Αδιάθετα',
-        'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': 'Διαθέσιμα',
-        'ΠΟΣΟΣΤΟ_ΑΔΙΑΘΕΤΩΝ': 'Ποσοστό %'
-    }
+    if selection.empty:
+        return dbc.Alert([
+            html.H5("ℹ️ Δεν υπάρχουν δεδομένα", className="alert-heading"),
+            html.P("Δεν βρέθηκαν δεδομένα για τα επιλεγμένα φίλτρα. Δοκιμάστε να αλλάξετε τα κριτήρια αναζήτησης.", className="mb-0")
+        ], color="warning")
     
-    summary_stats_renamed = summary_stats.rename(columns=display_columns)
+    summary_stats = get_detailed_summary(start_date, end_date, dept_list, team_list)
     
     # Calculate totals for filter info
-    total_unavailable = summary_stats['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum()
-    total_available = summary_stats['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].sum()
+    total_unavailable = summary_stats['Αδιάθετα'].sum()
+    total_available = summary_stats['Διαθέσιμα'].sum()
     total_appointments = total_unavailable + total_available
     avg_percentage = (total_unavailable / total_appointments * 100) if total_appointments > 0 else 0
     
@@ -1218,136 +3698,893 @@ def update_detailed_table(start_date, end_date, dept_list, team_list):
             ])
         ], color="info", className="mb-3"),
         
-        html.H5(f"📊 Αναλυτικός Πίνακας ({len(summary_stats_renamed)} εγγραφές)", className="mb-3"),
-        
-        dash_table.DataTable(
-            columns=[
-                {"name": col, "id": col, "type": "numeric" if col in ["Αδιάθετα", "Διαθέσιμα", "Ποσοστό %"] else "text"} 
-                for col in summary_stats_renamed.columns
-            ],
-            data=summary_stats_renamed.to_dict('records'),
-            style_table={
-                'overflowX': 'auto',
-                'border': '1px solid #dee2e6'
-            },
-            style_cell={
-                'textAlign': 'left',
-                'padding': '12px',
-                'fontFamily': 'Arial, sans-serif',
-                'fontSize': '14px',
-                'border': '1px solid #dee2e6'
-            },
-            style_header={
-                'backgroundColor': colors['primary'],
-                'color': 'white',
-                'fontWeight': 'bold',
-                'textAlign': 'center',
-                'fontSize': '14px'
-            },
-            style_data_conditional=[
-                # Alternating row colors
-                {
-                    'if': {'row_index': 'odd'},
-                    'backgroundColor': 'rgba(248, 249, 250, 0.8)'
-                },
-                # Red background for high percentages
-                {
-                    'if': {
-                        'filter_query': '{Ποσοστό %} > 25',
-                    },
-                    'backgroundColor': 'rgba(220, 53, 69, 0.1)',
-                    'color': '#dc3545',
-                    'fontWeight': 'bold'
-                },
-                # Orange background for medium percentages  
-                {
-                    'if': {
-                        'filter_query': '{Ποσοστό %} > 15 && {Ποσοστό %} <= 25',
-                    },
-                    'backgroundColor': 'rgba(255, 193, 7, 0.1)',
-                    'color': '#fd7e14',
-                    'fontWeight': 'bold'
-                },
-                # Green background for low percentages
-                {
-                    'if': {
-                        'filter_query': '{Ποσοστό %} <= 15',
-                    },
-                    'backgroundColor': 'rgba(40, 167, 69, 0.1)',
-                    'color': '#28a745',
-                    'fontWeight': 'bold'
-                }
-                # Highlight high unavailable numbers
-            ],
-            sort_action="native",
-            sort_mode="multi",
-            page_size=20,
-            style_cell_conditional=[
-                {'if': {'column_id': 'Τμήμα'}, 'minWidth': '180px', 'maxWidth': '250px'},
-                {'if': {'column_id': 'Ομάδα'}, 'minWidth': '150px', 'maxWidth': '200px'},
-                {'if': {'column_id': 'Αδιάθετα'}, 'textAlign': 'center', 'minWidth': '100px'},
-                {'if': {'column_id': 'Διαθέσιμα'}, 'textAlign': 'center', 'minWidth': '100px'},
-                {'if': {'column_id': 'Ποσοστό %'}, 'textAlign': 'center', 'minWidth': '100px'}
-            ],
-            # Additional features
-            filter_action="native",
-            export_format="xlsx",
-            export_headers="display"
-        ),
-        
-        # Table usage info
-        html.Hr(),
-            html.Div([
-                html.Small([
-                    html.Strong("💡 Χρήσιμες λειτουργίες:"),
-                ], className="text-muted"),
-                html.Ul([
-                    html.Li("Κάντε κλικ στις κεφαλίδες για ταξινόμηση (ascending/descending).", className="text-muted"),
-                    html.Li("Χρησιμοποιήστε τα φίλτρα κάτω από τις κεφαλίδες για αναζήτηση ανά στήλη.", className="text-muted"),
-                    html.Li("Εξαγωγή δεδομένων σε Excel με το κουμπί Export (πάνω δεξιά του πίνακα).", className="text-muted"),
-                ], style={"marginTop": "6px", "marginBottom": "6px"}),
-
-                html.Small(html.Strong("🔎 Χρωματική κωδικοποίηση (βάφεται ολόκληρη η γραμμή):"), className="text-muted"),
-                html.Ul([
-                    html.Li([
-                        html.Span("  ", style={"display": "inline-block", "width": "14px", "height": "14px",
-                                            "backgroundColor": "rgba(40, 167, 69, 0.12)", "border": "1px solid #28a745",
-                                            "marginRight": "8px", "verticalAlign": "middle"}),
-                        html.Span("Πράσινο: Ποσοστό % ≤ 15 (χαμηλά αδιάθετα).", className="text-muted"),
-                    ], style={"listStyleType": "none", "marginLeft": "0"}),
-
-                    html.Li([
-                        html.Span("  ", style={"display": "inline-block", "width": "14px", "height": "14px",
-                                            "backgroundColor": "rgba(255, 193, 7, 0.12)", "border": "1px solid #fd7e14",
-                                            "marginRight": "8px", "verticalAlign": "middle"}),
-                        html.Span("Πορτοκαλί: 15 < Ποσοστό % ≤ 25 (μέτρια αδιάθετα).", className="text-muted"),
-                    ], style={"listStyleType": "none", "marginLeft": "0"}),
-
-                    html.Li([
-                        html.Span("  ", style={"display": "inline-block", "width": "14px", "height": "14px",
-                                            "backgroundColor": "rgba(220, 53, 69, 0.12)", "border": "1px solid #dc3545",
-                                            "marginRight": "8px", "verticalAlign": "middle"}),
-                        html.Span("Κόκκινο: Ποσοστό % > 25 (υψηλά αδιάθετα).", className="text-muted"),
-                    ], style={"listStyleType": "none", "marginLeft": "0"}),
-                ])
-            ])
-
+        html.H5(f"📊 Αναλυτικός Πίνακας ({len(summary_stats)} εγγραφές)", className="mb-3")
     ])
 
+
+@filter_callback(
+    Output('detailed-table', 'data'),
+    Output('detailed-table', 'page_count'),
+    Output('detailed-table-container', 'style'),
+    Output('detailed-export-links', 'children'),
+    extra_inputs=[Input('detailed-table', 'page_current'), Input('detailed-table', 'page_size'),
+                  Input('detailed-table', 'sort_by'), Input('detailed-table', 'filter_query')]
+)
+def update_detailed_table_page(start_date, end_date, dept_list, team_list,
+                               page_current=0, page_size=TABLE_PAGE_SIZE, sort_by=None, filter_query=''):
+    """Μόνο η ορατή σελίδα του αναλυτικού πίνακα (ταξινόμηση/φίλτρα στον server)"""
+    if get_selection(start_date, end_date, dept_list, team_list).empty:
+        return [], 1, {'display': 'none'}, None
+
+    view = get_table_view(
+        ('detailed',) + normalize_filter_key(start_date, end_date, dept_list, team_list),
+        lambda: get_detailed_summary(start_date, end_date, dept_list, team_list),
+        filter_query, sort_by
+    )
+    records, page_count, _ = table_page(view, page_current, page_size)
+    links = export_links('detailed', start_date, end_date, dept_list, team_list,
+                         filter_query=filter_query or None, sort_by=json.dumps(sort_by) if sort_by else None)
+    return records, page_count, {}, links
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΕΞΑΓΩΓΗ ΠΙΝΑΚΩΝ (STREAMING ΑΠΟ ΤΟΝ SERVER)
+# ══════════════════════════════════════════════════════════════════════════════
+
+EXPORT_CHUNK_ROWS = 50_000     # γραμμές ανά κομμάτι CSV
+EXPORT_BUFFER_SIZE = 1 << 16   # bytes ανά κομμάτι που στέλνεται στον browser
+EXPORT_QUEUE_CHUNKS = 16       # κομμάτια σε αναμονή μεταξύ worker thread και απάντησης HTTP
+EXPORT_TABLES = ['detailed', 'redistribution']
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+# Το XLSX θέλει openpyxl και το Parquet pyarrow ή fastparquet - χωρίς αυτά προσφέρεται μόνο CSV
+EXPORT_FORMATS = ['csv'] + (['xlsx'] if importlib.util.find_spec('openpyxl') else []) + \
+                 (['parquet'] if importlib.util.find_spec('pyarrow') or importlib.util.find_spec('fastparquet') else [])
+
+
+def export_links(table, start_date, end_date, dept_list, team_list, **params):
+    """Σύνδεσμοι εξαγωγής για τα τρέχοντα φίλτρα (οι παράμετροι με τιμή None παραλείπονται)"""
+    query = {'start_date': start_date or '', 'end_date': end_date or '',
+             'dept': list(dept_list or []), 'team': list(team_list or [])}
+    query.update({name: value for name, value in params.items() if value is not None})
+    query_string = urllib.parse.urlencode(query, doseq=True)
+
+    links = []
+    for fmt in EXPORT_FORMATS:
+        if links:
+            links.append(" | ")
+        links.append(html.A(fmt.upper(), href=f"/export/{table}.{fmt}?{query_string}"))
+    return html.Small(["⬇️ Εξαγωγή όλων των γραμμών: "] + links, className="text-muted")
+
+
+def _export_frame(table, args):
+    """Ο πίνακας προς εξαγωγή από τις cached συναθροίσεις (ίδια φίλτρα/ταξινόμηση με το dashboard)"""
+    start_date, end_date = args.get('start_date') or None, args.get('end_date') or None
+    dept_list, team_list = args.getlist('dept'), args.getlist('team')
+    sort_by = json.loads(args['sort_by']) if args.get('sort_by') else None
+    key = normalize_filter_key(start_date, end_date, dept_list, team_list)
+
+    if table == 'detailed':
+        return get_table_view(('detailed',) + key,
+                              lambda: get_detailed_summary(start_date, end_date, dept_list, team_list),
+                              args.get('filter_query'), sort_by)
+
+    ratio = float(args.get('ratio', 0.30))
+    solver = args.get('solver', REDISTRIBUTION_SOLVER)
+    scope = args.get('scope', REDISTRIBUTION_SCOPE)
+    if solver not in REDISTRIBUTION_SOLVERS or scope not in REDISTRIBUTION_SCOPES:
+        raise ValueError(f"solver={solver}, scope={scope}")
+    plan_args = (start_date, end_date, dept_list, team_list, ratio, 0.25, solver, scope)
+    return get_table_view(('redistribution',) + key + (round(ratio, 4), solver, scope),
+                          lambda: get_redistribution_plan(*plan_args), sort_by=sort_by)
+
+
+class _QueueWriter(io.RawIOBase):
+    """Μη-seekable αρχείο εξόδου: ό,τι γράφεται μπαίνει στην ουρά που διαβάζει η απάντηση HTTP"""
+
+    def __init__(self, chunks, cancelled):
+        self.chunks = chunks
+        self.cancelled = cancelled
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        _put_chunk(self.chunks, bytes(data), self.cancelled)
+        return len(data)
+
+
+def _put_chunk(chunks, item, cancelled):
+    """Τοποθέτηση στην ουρά χωρίς να κολλήσει ο worker αν ο browser έχει κλείσει τη λήψη"""
+    while True:
+        if cancelled.is_set():
+            raise BrokenPipeError("Η λήψη ακυρώθηκε")
+        try:
+            chunks.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
+
+def _write_export(frame, fmt, out):
+    if fmt == 'csv':
+        out.write(codecs.BOM_UTF8)  # ώστε το Excel να διαβάζει σωστά τα ελληνικά
+        for start in range(0, max(len(frame), 1), EXPORT_CHUNK_ROWS):
+            chunk = frame.iloc[start:start + EXPORT_CHUNK_ROWS]
+            out.write(chunk.to_csv(index=False, header=(start == 0)).encode('utf-8'))
+    elif fmt == 'xlsx':
+        frame.to_excel(out, index=False, engine='openpyxl')
+    else:
+        frame.to_parquet(out, index=False)
+
+
+def export_bytes(frame, fmt):
+    """Ολόκληρο το αρχείο στη μνήμη - για XLSX/Parquet, που ούτως ή άλλως χτίζονται ολόκληρα πριν γραφτούν"""
+    out = io.BytesIO()
+    _write_export(frame, fmt, out)
+    return out.getvalue()
+
+
+def stream_export(frame, fmt='csv'):
+    """
+    Generator με τα bytes του αρχείου (CSV): η σειριοποίηση γίνεται σε worker thread και
+    τα κομμάτια περνούν από ουρά περιορισμένου μεγέθους, οπότε η μνήμη δεν εξαρτάται από τον πίνακα.
+    Τα headers έχουν ήδη σταλεί όταν ξεκινά - ένα σφάλμα εδώ μόνο καταγράφεται και κόβει τη λήψη.
+    """
+    chunks = queue.Queue(maxsize=EXPORT_QUEUE_CHUNKS)
+    cancelled = threading.Event()
+    finished = object()
+
+    def produce():
+        try:
+            with io.BufferedWriter(_QueueWriter(chunks, cancelled), EXPORT_BUFFER_SIZE) as out:
+                _write_export(frame, fmt, out)
+            result = finished
+        except Exception as e:
+            result = e
+        try:
+            _put_chunk(chunks, result, cancelled)
+        except BrokenPipeError:
+            pass
+
+    threading.Thread(target=produce, name=f"export-{fmt}", daemon=True).start()
+
+    def generate():
+        try:
+            while True:
+                item = chunks.get()
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    log.error(f"❌ Σφάλμα εξαγωγής ({fmt}): {item}")
+                    return
+                yield item
+        finally:
+            cancelled.set()
+
+    return generate()
+
+
+def export_table(table, fmt):
+    """Λήψη του αναλυτικού πίνακα ή του πλάνου ανακατανομής ως CSV/XLSX/Parquet"""
+    if table not in EXPORT_TABLES or fmt not in EXPORT_FORMATS:
+        return flask.Response(f"Μη διαθέσιμη εξαγωγή: {table}.{fmt} (διαθέσιμα: {', '.join(EXPORT_FORMATS)})",
+                              status=404, mimetype='text/plain')
+    try:
+        with METRICS.callback(f'export_{table}'):
+            frame = _export_frame(table, flask.request.args)
+    except (ValueError, TypeError) as e:
+        return flask.Response(f"Μη έγκυρες παράμετροι: {e}", status=400, mimetype='text/plain')
+    except DatasetNotReady as e:
+        return flask.Response(f"Τα δεδομένα δεν είναι διαθέσιμα: {e}", status=503, mimetype='text/plain')
+
+    filename = f"adiatheta_{table}_{datetime.now():%Y%m%d_%H%M}.{fmt}"
+    log.info(f"⬇️ Εξαγωγή {filename}: {len(frame):,} γραμμές")
+    if fmt == 'csv':
+        body = stream_export(frame, fmt)
+    else:
+        # Σειριοποίηση πριν από την απάντηση, ώστε ένα σφάλμα να γίνει 500 και όχι κομμένο/κενό αρχείο
+        try:
+            body = export_bytes(frame, fmt)
+        except Exception as e:
+            log.error(f"❌ Σφάλμα εξαγωγής {filename}: {e}")
+            return flask.Response(f"Σφάλμα εξαγωγής ({fmt}): {e}", status=500, mimetype='text/plain')
+    return flask.Response(body, mimetype=EXPORT_MIMETYPES[fmt],
+                          headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+# ══════════════════════════════════════════════════════════════════════════════
+# APP FACTORY
+# ══════════════════════════════════════════════════════════════════════════════
+
+def health():
+    """Κατάσταση δεδομένων: 200 όταν εξυπηρετείται κάποιο Dataset, 503 όσο φορτώνεται ή μετά από σφάλμα"""
+    status = DATA.health()
+    return flask.jsonify(status), 200 if status['ready'] else 503
+
+
+def metrics():
+    """Μετρικές σε μορφή κειμένου Prometheus: ιστογράμματα σταδίων, cache φίλτρων και κατάσταση δεδομένων"""
+    cache = FILTER_CACHE.stats()
+    status = DATA.health()
+    lines = [
+        '# TYPE adiatheta_filter_cache_hits_total counter',
+        f'adiatheta_filter_cache_hits_total {cache["hits"]}',
+        '# TYPE adiatheta_filter_cache_misses_total counter',
+        f'adiatheta_filter_cache_misses_total {cache["misses"]}',
+        '# TYPE adiatheta_filter_cache_entries gauge',
+        f'adiatheta_filter_cache_entries {cache["size"]}',
+        '# TYPE adiatheta_data_ready gauge',
+        f'adiatheta_data_ready {int(status["ready"])}',
+        '# TYPE adiatheta_data_version gauge',
+        f'adiatheta_data_version {status["version"] or 0}',
+        '# TYPE adiatheta_data_rows gauge',
+        f'adiatheta_data_rows {status["rows"]}',
+    ]
+    return flask.Response(METRICS.render() + '\n'.join(lines) + '\n',
+                          content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def profile_control():
+    """
+    GET: κατάσταση του profiler. POST με n (επόμενες εκτελέσεις), threshold (δευτερόλεπτα) και
+    callbacks (ονόματα χωρισμένα με κόμμα): ενεργοποίηση - POST χωρίς παραμέτρους απενεργοποιεί.
+    """
+    if flask.request.method == 'POST':
+        values = flask.request.values
+        try:
+            PROFILER.configure(
+                n=int(values.get('n') or 0),
+                threshold=float(values['threshold']) if values.get('threshold') else None,
+                callbacks=[name.strip() for name in values.get('callbacks', '').split(',') if name.strip()]
+            )
+        except ValueError as e:
+            return flask.jsonify({'error': str(e)}), 400
+    return flask.jsonify(PROFILER.status())
+
+
+def _end_request(response):
+    METRICS.end_request()
+    return response
+
+
+def _instrumented(func):
+    """Καταγραφή της διάρκειας κάθε εκτέλεσης του callback (και των σταδίων του) στα METRICS + PROFILER"""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        with METRICS.callback(name):
+            return PROFILER.call(name, func, args)
+    return wrapper
+
+
+def _prevent_until_ready(func):
+    """Όσο δεν υπάρχουν δεδομένα τα callbacks δεν ενημερώνουν τίποτα (αντί για σφάλμα στον browser)"""
+    @functools.wraps(func)
+    def wrapper(*args):
+        try:
+            return func(*args)
+        except DatasetNotReady:
+            raise dash.exceptions.PreventUpdate
+    return wrapper
+
+
+def create_app(load_data=True, wiring=CALLBACK_WIRING):
+    """
+    Δημιουργία του Dash app: layout, callbacks του CALLBACK_REGISTRY και του CLIENTSIDE_REGISTRY, εξαγωγή πινάκων, /health και /metrics.
+    Τα callbacks των φίλτρων συνδέονται σύμφωνα με το wiring ('pipeline' ή 'direct', βλ. CALLBACK_WIRINGS).
+    Το layout εξυπηρετείται αμέσως· με load_data=True τα δεδομένα φορτώνονται σε background thread
+    (αν δεν έχουν ήδη φορτωθεί) και ξεκινά ο έλεγχος των αρχείων για hot reload (RELOAD_POLL_SECONDS).
+    Για WSGI server: create_app().server
+    """
+    callbacks = _wired_callbacks(wiring)
+    app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+    app.title = APP_TITLE
+    app.layout = serve_layout
+    for dependencies, kwargs, func in callbacks:
+        app.callback(*dependencies, **kwargs)(_instrumented(_prevent_until_ready(func)))
+    for function, dependencies in CLIENTSIDE_REGISTRY:
+        app.clientside_callback(function, *dependencies)
+    app.server.add_url_rule('/export/<table>.<fmt>', view_func=export_table)
+    app.server.add_url_rule('/health', view_func=health)
+    app.server.add_url_rule('/metrics', view_func=metrics)
+    app.server.add_url_rule('/profile', view_func=profile_control, methods=['GET', 'POST'])
+    app.server.before_request(METRICS.begin_request)
+    app.server.after_request(_end_request)
+    if load_data:
+        if DATA.current is None:
+            DATA.start()
+        if RELOAD_POLL_SECONDS:
+            DATA_WATCHER.start()
+    return app
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΣΥΓΚΡΙΣΗ ΣΥΝΔΕΣΗΣ CALLBACKS (CPU ΑΝΑ ΑΛΛΗΛΕΠΙΔΡΑΣΗ)
+# ══════════════════════════════════════════════════════════════════════════════
+
+def compare_callback_wiring(n_interactions=30, seed=0):
+    """
+    Μέτρηση του χρόνου CPU ανά αλληλεπίδραση (αλλαγή φίλτρων) για τα πέντε callbacks των φίλτρων:
+    direct χωρίς κοινή cache, direct με την FILTER_CACHE και pipeline (ένα στάδιο + απόδοση από το filter-state).
+    Επιστρέφει {τρόπος: ms CPU ανά αλληλεπίδραση}.
+    """
+    data = DATA.wait()
+    rng = np.random.default_rng(seed)
+    months = pd.date_range(data.min_date, data.max_date, freq='MS')
+    states = []
+    for _ in range(n_interactions):
+        a, b = sorted(rng.integers(0, len(months), 2))
+        depts = list(rng.choice(data.unique_departments, size=min(len(data.unique_departments), int(rng.integers(0, 4))),
+                                replace=False))
+        states.append((str(months[a].date()), str(months[b].date()), depts, []))
+
+    renderers = [update_kpi_cards, update_trend_chart, update_dept_ranking, update_recommendations, update_detailed_table]
+    from_state = [_from_filter_state(render) for render in renderers]  # όπως τα συνδέει το create_app(wiring='pipeline')
+
+    # Κάθε αλληλεπίδραση (και κάθε τρόπος) ξεκινά με άδεια cache, ώστε επαναλαμβανόμενα φίλτρα να μη
+    # δίνουν hits από προηγούμενες αλληλεπιδράσεις: μετράται μόνο ό,τι μοιράζονται τα callbacks της ίδιας
+    def run_direct():
+        for state in states:
+            FILTER_CACHE.clear()
+            for render in renderers:
+                render(*state)
+
+    def run_pipeline():
+        for state in states:
+            FILTER_CACHE.clear()
+            payload = json.loads(json.dumps(compute_filter_state(*state, data.version)))  # όπως περνά από το dcc.Store
+            for render in from_state:
+                render(payload)
+
+    results = {}
+    original_maxsize = FILTER_CACHE.maxsize
+    run_direct()  # προθέρμανση (imports/templates του plotly) ώστε να μη χρεωθεί στον πρώτο τρόπο
+    for name, run, maxsize in [('direct (χωρίς cache)', run_direct, 0),
+                               ('direct', run_direct, original_maxsize),
+                               ('pipeline', run_pipeline, original_maxsize)]:
+        FILTER_CACHE.maxsize = maxsize
+        started = time.process_time()
+        run()
+        results[name] = (time.process_time() - started) * 1000 / n_interactions
+    FILTER_CACHE.maxsize = original_maxsize
+    FILTER_CACHE.clear()
+
+    baseline = results['direct (χωρίς cache)']
+    print(f"⏱️ CPU ανά αλληλεπίδραση ({n_interactions} τυχαίες αλλαγές φίλτρων):")
+    for name, ms in results.items():
+        print(f"   {name:<22} {ms:8.2f} ms  ({(1 - ms / baseline) * 100:.0f}% εξοικονόμηση)" if name != 'direct (χωρίς cache)'
+              else f"   {name:<22} {ms:8.2f} ms")
+    return results
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΜΕΤΡΗΣΗ ΨΥΧΡΗΣ ΕΚΚΙΝΗΣΗΣ
+# ══════════════════════════════════════════════════════════════════════════════
+
+COLD_START_BUDGET = 1.5       # μέγιστα δευτερόλεπτα από την έναρξη του import μέχρι το πρώτο layout
+COLD_START_TOP_IMPORTS = 10   # πλήθος βαρύτερων imports στην αναφορά
+
+_COLD_START_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {directory!r})
+import {module} as dashboard
+imported = time.perf_counter()
+dashboard.create_app().server.test_client().get('/_dash-layout')
+layout = time.perf_counter()
+try:
+    dashboard.DATA.wait({timeout!r})
+except dashboard.DatasetNotReady:
+    pass
+print(json.dumps({{'import': imported - started, 'layout': layout - started,
+                  'ready': time.perf_counter() - started, 'status': dashboard.DATA.status}}))
+"""
+
+
+def _parse_importtime(stderr, top=COLD_START_TOP_IMPORTS):
+    """Τα βαρύτερα imports πρώτων δύο επιπέδων από την έξοδο του python -X importtime: [(όνομα, ms αθροιστικά)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            rows.append((name.strip(), int(cumulative_us) / 1000))
+    return heapq.nlargest(top, rows, key=lambda row: row[1])
+
+
+def measure_cold_start(timeout=120):
+    """
+    Ψυχρή εκκίνηση σε νέα διεργασία (python -X importtime): χρόνος import του module, πρώτου layout
+    μέσω create_app() και μέχρι να είναι έτοιμα τα δεδομένα, μαζί με τα βαρύτερα imports.
+    Το πρώτο layout συγκρίνεται με το COLD_START_BUDGET.
+    """
+    import subprocess
+    import sys
+
+    directory, filename = os.path.split(os.path.abspath(__file__))
+    script = _COLD_START_SCRIPT.format(directory=directory, module=os.path.splitext(filename)[0], timeout=timeout)
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', script],
+                               capture_output=True, text=True, timeout=timeout + 30)
+    process_seconds = time.perf_counter() - started
+    lines = [line for line in completed.stdout.splitlines() if line.startswith('{')]
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(f"Η μέτρηση ψυχρής εκκίνησης απέτυχε:\n{completed.stderr[-2000:]}")
+
+    result = json.loads(lines[-1])
+    result['process'] = process_seconds
+    result['imports'] = _parse_importtime(completed.stderr)
+
+    within_budget = result['layout'] <= COLD_START_BUDGET
+    print("⏱️ Ψυχρή εκκίνηση (νέα διεργασία):")
+    print(f"   import module        {result['import']:6.2f} s")
+    print(f"   πρώτο layout         {result['layout']:6.2f} s  (όριο {COLD_START_BUDGET:.2f} s {'✅' if within_budget else '❌'})")
+    print(f"   δεδομένα έτοιμα      {result['ready']:6.2f} s  ({result['status']})")
+    print(f"   διεργασία συνολικά   {process_seconds:6.2f} s")
+    print("📦 Βαρύτερα imports (αθροιστικός χρόνος):")
+    for name, ms in result['imports']:
+        print(f"   {name:<40} {ms:8.1f} ms")
+    return result
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΣΥΝΘΕΤΙΚΑ ΔΕΔΟΜΕΝΑ ΚΑΙ BENCHMARK
+# ══════════════════════════════════════════════════════════════════════════════
+
+SYNTHETIC_DEPARTMENTS = 40           # πλήθος τμημάτων στα συνθετικά δεδομένα
+SYNTHETIC_TEAMS_PER_DEPARTMENT = 8   # ομάδες ανά τμήμα
+SYNTHETIC_TEAM_NAMES = 60            # διακριτά ονόματα ομάδων (κοινά μεταξύ τμημάτων, όπως οι κατηγορίες ΛΥΥ)
+SYNTHETIC_MONTHS = 48                # μήνες από το SYNTHETIC_START_MONTH
+SYNTHETIC_START_MONTH = '2021-01'
+SYNTHETIC_CHUNK_ROWS = 500_000       # γραμμές ανά εγγραφή στο αρχείο (σταθερή μνήμη και για 10M γραμμές)
+
+BENCH_ROWS = (10_000, 100_000, 1_000_000)  # μεγέθη αρχείων του benchmark
+BENCH_GROUPS = (100, 1_000, 10_000)        # πλήθη ομάδων στο benchmark της ανακατανομής
+BENCH_STATES = 8                           # καταστάσεις φίλτρων ανά μέγεθος (η πρώτη: χωρίς φίλτρα)
+BENCH_REPEAT = 3                           # επαναλήψεις κάθε μέτρησης
+BENCH_REGRESSION = 1.10                    # λόγος διάμεσου χρόνου πάνω από τον οποίο σημειώνεται επιβράδυνση
+
+
+def generate_synthetic_csv(path, rows, n_departments=SYNTHETIC_DEPARTMENTS,
+                           teams_per_department=SYNTHETIC_TEAMS_PER_DEPARTMENT, n_team_names=SYNTHETIC_TEAM_NAMES,
+                           months=SYNTHETIC_MONTHS, aliases=False, seed=0, chunk_rows=SYNTHETIC_CHUNK_ROWS):
+    """
+    Ρεαλιστικό CSV σε μορφή OPSY: κάθε ομάδα έχει δικό της μέγεθος (lognormal διαθέσιμα) και ποσοστό
+    αδιάθετων (beta, με λίγα «προβληματικά» τμήματα), τα αδιάθετα είναι binomial των διαθέσιμων και τα
+    ραντεβού που κλείστηκαν το υπόλοιπο. Με aliases=True οι στήλες παίρνουν εναλλακτικά ονόματα του
+    COLUMN_MAPPING και η ημερομηνία άλλο από τα DATE_FORMATS (όπως τα πραγματικά exports). Ντετερμινιστικό
+    ανά seed· γράφεται ανά chunk_rows γραμμές. Επιστρέφει το path.
+    """
+    rng = np.random.default_rng(seed)
+    teams_per_department = min(teams_per_department, n_team_names)
+    departments = np.array([f"ΤΜΗΜΑ {d:03d}" for d in range(n_departments)], dtype=object)
+    team_names = np.array([f"ΟΜΑΔΑ {t:02d}" for t in range(n_team_names)], dtype=object)
+
+    # Ομάδες (τμήμα, όνομα ομάδας) με τα δικά τους χαρακτηριστικά
+    group_dept = np.repeat(np.arange(n_departments), teams_per_department)
+    group_team = np.concatenate([rng.choice(n_team_names, teams_per_department, replace=False)
+                                 for _ in range(n_departments)])
+    dept_rate = rng.beta(2, 12, n_departments) * np.where(rng.random(n_departments) < 0.15, 2.5, 1.0)
+    group_rate = np.clip(dept_rate[group_dept] * rng.lognormal(0, 0.35, len(group_dept)), 0.005, 0.9)
+    group_size = rng.lognormal(np.log(80), 0.8, len(group_dept))
+    group_weight = rng.pareto(1.5, len(group_dept)) + 1  # λίγες μεγάλες ομάδες με πολλές εγγραφές
+
+    first_month = pd.Period(SYNTHETIC_START_MONTH, freq='M')
+    if aliases:
+        names = {}
+        for std, alternatives in COLUMN_MAPPING.items():
+            alternatives = [name for name in alternatives if name != std] or [std]
+            names[std] = alternatives[int(rng.integers(len(alternatives)))]
+        date_format = DATE_FORMATS[int(rng.integers(len(DATE_FORMATS)))]
+    else:
+        names = {std: std for std in COLUMN_MAPPING}
+        date_format = '%Y-%m'
+    month_labels = np.array([(first_month + m).to_timestamp().strftime(date_format) for m in range(months)], dtype=object)
+
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as fh:
+        while written < rows:
+            n = min(chunk_rows, rows - written)
+            group = rng.choice(len(group_dept), n, p=group_weight / group_weight.sum())
+            month = rng.integers(0, months, n)
+            # Ήπια εποχικότητα: λιγότερα διαθέσιμα τον Αύγουστο
+            season = 1 - 0.3 * ((month + first_month.month - 1) % 12 == 7)
+            available = np.maximum(1, rng.poisson(group_size[group] * season)).astype(np.int64)
+            unavailable = rng.binomial(available, group_rate[group])
+            chunk = pd.DataFrame({
+                names['ΤΜΗΜΑ']: departments[group_dept[group]],
+                names['ΟΝΟΜΑ_ΟΜΑΔΑΣ']: team_names[group_team[group]],
+                names['ΜΗΝΑΣ-ΕΤΟΣ']: month_labels[month],
+                names['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ']: available,
+                names['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']: unavailable,
+                names['ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ']: available - unavailable,
+            })
+            chunk.to_csv(fh, index=False, header=written == 0)
+            written += n
+    log.info(f"🧪 Συνθετικό CSV {path}: {rows:,} γραμμές, {n_departments} τμήματα × {teams_per_department} ομάδες, "
+             f"{months} μήνες" + (f", στήλες {list(names.values())}, ημερομηνίες {date_format}" if aliases else ""))
+    return path
+
+
+def synthetic_team_summary(n_groups, teams_per_department=SYNTHETIC_TEAMS_PER_DEPARTMENT, seed=0):
+    """
+    Συνθετικός πίνακας μέσων όρων ανά ομάδα (μορφή του CubeSelection.team_means) με n_groups ομάδες και
+    τις ίδιες κατανομές με το generate_synthetic_csv - είσοδος της ανακατανομής χωρίς αρχείο και κύβο.
+    """
+    rng = np.random.default_rng(seed)
+    available = np.maximum(1, rng.lognormal(np.log(80), 0.8, n_groups).round()).astype(np.int64)
+    rate = np.clip(rng.beta(2, 12, n_groups) * rng.lognormal(0, 0.35, n_groups), 0.005, 0.9)
+    return pd.DataFrame({
+        'ΤΜΗΜΑ': [f"ΤΜΗΜΑ {d:03d}" for d in np.arange(n_groups) // max(1, teams_per_department)],
+        'ΟΝΟΜΑ_ΟΜΑΔΑΣ': [f"ΟΜΑΔΑ {g:05d}" for g in range(n_groups)],
+        'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': rng.binomial(available, rate).astype(np.int64),
+        'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': available,
+    })
+
+
+def _bench(func, repeat, setup=None):
+    """Χρόνοι (s) repeat εκτελέσεων του func - το setup (π.χ. άδειασμα cache) τρέχει πριν από κάθε μία, εκτός μέτρησης"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _bench_summary(op, rows, timings):
+    ms = np.asarray(timings) * 1000
+    return {'op': op, 'rows': rows, 'n': len(ms), 'min_ms': round(float(ms.min()), 3),
+            'median_ms': round(float(np.median(ms)), 3), 'p95_ms': round(float(np.percentile(ms, 95)), 3),
+            'mean_ms': round(float(ms.mean()), 3)}
+
+
+def _bench_states(data, n_states, seed):
+    """Τυχαίες καταστάσεις φίλτρων όπως στο compare_callback_wiring - η πρώτη χωρίς φίλτρα (η βαρύτερη)"""
+    rng = np.random.default_rng(seed)
+    months = pd.date_range(data.min_date, data.max_date, freq='MS')
+    states = [(str(data.min_date), str(data.max_date), [], [])]
+    while len(states) < n_states:
+        a, b = sorted(rng.integers(0, len(months), 2))
+        depts = list(rng.choice(data.unique_departments, size=min(len(data.unique_departments), int(rng.integers(0, 4))),
+                                replace=False))
+        states.append((str(months[a].date()), str(months[b].date()), depts, []))
+    return states
+
+
+def run_benchmark(sizes=BENCH_ROWS, repeat=BENCH_REPEAT, n_states=BENCH_STATES, workdir=None, aliases=True, seed=0,
+                  groups=BENCH_GROUPS, **synthetic):
+    """
+    Benchmark σε συνθετικά αρχεία (generate_synthetic_csv, ξαναχρησιμοποιούνται αν υπάρχουν στο workdir·
+    χωρίς workdir δημιουργούνται σε προσωρινό φάκελο που διαγράφεται στο τέλος):
+    φόρτωση (χωρίς και με cache), κύβος και ευρετήριο γραμμών, filter_data, KPIs (αναλυτής και κύβος),
+    suggest_fair_redistribution (greedy / mincost) και κάθε builder γραφήματος μαζί με το JSON του.
+    Οι υπολογισμοί ανά φίλτρα μετρώνται με άδεια FILTER_CACHE (όπως μια νέα αλληλεπίδραση).
+    Επιπλέον η ανακατανομή (κάθε επιλυτής) σε synthetic_team_summary με groups ομάδες, όπου 'rows' = πλήθος ομάδων.
+    Επιστρέφει {'meta': ..., 'results': [{'op', 'rows', 'n', 'min_ms', 'median_ms', 'p95_ms', 'mean_ms'}]}.
+    """
+    import platform
+    import tempfile
+    import plotly.io.json as plotly_json
+
+    temporary = workdir is None
+    workdir = tempfile.mkdtemp(prefix='adiatheta_bench_') if temporary else workdir
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+    previous_level, previous_loader = log.level, DATA.loader
+    log.setLevel(logging.WARNING)  # χωρίς τα μηνύματα φόρτωσης μέσα στις μετρήσεις
+    try:
+        for rows in sizes:
+            path = os.path.join(workdir, f"synthetic_{rows}{'_aliases' if aliases else ''}_{seed}.csv")
+            if not os.path.exists(path):
+                generate_synthetic_csv(path, rows, aliases=aliases, seed=seed, **synthetic)
+            print(f"🧪 {rows:,} γραμμές ({_format_bytes(os.path.getsize(path))})...")
+
+            def record(op, timings):
+                results.append(_bench_summary(op, rows, timings))
+                print(f"   {op:<40} {results[-1]['median_ms']:10.2f} ms (διάμεσος, p95 {results[-1]['p95_ms']:.2f})")
+
+            load = functools.partial(load_unavailable_appointments_data, source=path)
+            record('load', _bench(lambda: load(use_cache=False), repeat))
+            clear_frame_cache(path)
+            df = load(use_cache=True)
+            record('load_cached', _bench(lambda: load(use_cache=True), repeat))
+            clear_frame_cache(path)
+            record('cube', _bench(lambda: AppointmentsCube(df), repeat))
+            record('row_index', _bench(lambda: RowIndex(df), repeat))
+
+            DATA.loader = lambda: df
+            data = DATA.load()
+            states = _bench_states(data, n_states, seed)
+            data.row_index  # το ευρετήριο χτίζεται μία φορά ανά Dataset (μετρήθηκε παραπάνω)
+
+            def per_state(op, func, setup=FILTER_CACHE.clear):
+                timings = []
+                for state in states:
+                    timings += _bench(lambda: func(state), repeat, setup)
+                record(op, timings)
+
+            per_state('filter_data', lambda state: filter_data(*state))
+            filtered = {tuple(map(str, state)): filter_data(*state) for state in states}
+            per_state('calculate_unavailable_kpis',
+                      lambda state: data.analyzer.calculate_unavailable_kpis(filtered[tuple(map(str, state))]))
+            per_state('cube_kpis', lambda state: get_selection(*state).kpis())
+
+            summaries = {tuple(map(str, state)): get_selection(*state).team_means() for state in states}
+            plans = {}
+            for solver in REDISTRIBUTION_SOLVERS:
+                def redistribute(state, solver=solver):
+                    analyzer = UnavailableAppointmentsAnalyzer(None, team_summary=summaries[tuple(map(str, state))])
+                    plans[tuple(map(str, state))] = analyzer.suggest_fair_redistribution(0.30, 0.25, solver=solver)
+                per_state(f'suggest_fair_redistribution[{solver}]', redistribute, setup=None)
+
+            figures = {f'update_trend_chart[{mode}]': functools.partial(update_trend_chart, mode=mode) for mode in TREND_MODES}
+            figures['update_dept_ranking'] = update_dept_ranking
+            for op, build in figures.items():
+                per_state(op, lambda state: build(*state))
+                record(f'{op}:json', [seconds for fig in [build(*state) for state in states]
+                                      for seconds in _bench(lambda: plotly_json.to_json_plotly(fig), repeat)])
+
+            def flow_chart(state):
+                analyzer = UnavailableAppointmentsAnalyzer(None, team_summary=summaries[tuple(map(str, state))])
+                return analyzer.create_fair_redistribution_flow_chart(0.30, redistribution_df=plans[tuple(map(str, state))])
+            per_state('create_fair_redistribution_flow_chart', flow_chart, setup=None)
+
+        for n_groups in groups:
+            summary = synthetic_team_summary(n_groups, synthetic.get('teams_per_department', SYNTHETIC_TEAMS_PER_DEPARTMENT),
+                                             seed=seed)
+            print(f"🧪 Ανακατανομή σε {n_groups:,} ομάδες...")
+            for solver in REDISTRIBUTION_SOLVERS:
+                # Νέος αναλυτής σε κάθε εκτέλεση: δότες/δέκτες και κατανομή, όπως σε νέα κατάσταση φίλτρων
+                timings = _bench(lambda: UnavailableAppointmentsAnalyzer(None, team_summary=summary)
+                                 .suggest_fair_redistribution(0.30, 0.25, solver=solver), repeat)
+                results.append(_bench_summary(f'redistribution_groups[{solver}]', n_groups, timings))
+                print(f"   {results[-1]['op']:<40} {results[-1]['median_ms']:10.2f} ms "
+                      f"(διάμεσος, p95 {results[-1]['p95_ms']:.2f})")
+    finally:
+        log.setLevel(previous_level)
+        DATA.loader = previous_loader
+        if temporary:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+            'states': n_states,
+            'groups': list(groups),
+            'aliases': aliases,
+            'seed': seed,
+            'synthetic': {'departments': synthetic.get('n_departments', SYNTHETIC_DEPARTMENTS),
+                          'teams_per_department': synthetic.get('teams_per_department', SYNTHETIC_TEAMS_PER_DEPARTMENT),
+                          'team_names': synthetic.get('n_team_names', SYNTHETIC_TEAM_NAMES),
+                          'months': synthetic.get('months', SYNTHETIC_MONTHS)},
+        },
+        'results': results
+    }
+
+
+def compare_benchmarks(baseline, current, threshold=BENCH_REGRESSION):
+    """
+    Σύγκριση δύο αποτελεσμάτων του run_benchmark ανά (op, rows) με βάση τον διάμεσο χρόνο.
+    Επιστρέφει τις μετρήσεις που επιβραδύνθηκαν πάνω από το threshold: [(op, rows, λόγος)].
+    """
+    before = {(r['op'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    print(f"📊 Σύγκριση με baseline ({baseline['meta'].get('created_at')}):")
+    for r in current['results']:
+        old = before.get((r['op'], r['rows']))
+        if old is None or old['median_ms'] <= 0:
+            continue
+        ratio = r['median_ms'] / old['median_ms']
+        flag = '🔴' if ratio > threshold else ('🟢' if ratio < 1 / threshold else '  ')
+        print(f"   {flag} {r['op']:<40} {r['rows']:>10,} {old['median_ms']:10.2f} → {r['median_ms']:10.2f} ms (×{ratio:.2f})")
+        if ratio > threshold:
+            regressions.append((r['op'], r['rows'], round(ratio, 3)))
+    return regressions
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ΑΝΑΦΟΡΕΣ ΧΩΡΙΣ DASH (BATCH)
+# ══════════════════════════════════════════════════════════════════════════════
+
+REPORT_WINDOW_MONTHS = 1   # μήνες ανά παράθυρο αναφοράς (1 = μηνιαία, 3 = τρίμηνα, 12 = έτη - ευθυγραμμισμένα στο ημερολόγιο)
+REPORT_WORKERS = None      # διεργασίες για τα παράθυρα της αναφοράς (None = όλοι οι πυρήνες)
+REPORT_ALL_DEPARTMENTS = 'Όλα'
+
+_report_cube = None
+
+
+def _report_windows(cube, window_months):
+    """Παράθυρα (αρχή, τέλος) σε αύξοντες αριθμούς μηνών που καλύπτουν τον κύβο, ευθυγραμμισμένα στο ημερολόγιο"""
+    last = cube.first_month + cube.n_months - 1
+    start = cube.first_month - cube.first_month % window_months
+    return [(lo, lo + window_months - 1) for lo in range(start, last + 1, window_months)]
+
+
+def _init_report_worker(cube):
+    global _report_cube
+    _report_cube = cube
+
+
+def _report_window(window, ratio, max_donor_fraction, solver, scope):
+    """
+    KPI και πλάνα ανακατανομής ενός παραθύρου: όλο το νοσοκομείο (με το επιλεγμένο εύρος) και κάθε τμήμα
+    χωριστά - top-level ώστε να εκτελείται στο process pool της run_batch_report
+    """
+    start_ord, end_ord = window
+    labels = {'ΑΡΧΗ_ΠΕΡΙΟΔΟΥ': _ordinal_to_timestamp(start_ord).strftime('%Y-%m'),
+              'ΤΕΛΟΣ_ΠΕΡΙΟΔΟΥ': _ordinal_to_timestamp(end_ord).strftime('%Y-%m')}
+    kpi_rows, plans = [], []
+    for dept in [None] + list(_report_cube.departments):
+        selection = _report_cube.select_key((start_ord, end_ord, (dept,) if dept else (), ()))
+        if selection.empty:
+            continue
+        analyzer = UnavailableAppointmentsAnalyzer(None, team_summary=selection.team_means())
+        if dept is None and scope == 'department':
+            # Μέσα σε worker του pool δεν ανοίγει δεύτερο pool (daemonic διεργασίες)
+            plan = analyzer.suggest_department_redistribution(ratio, max_donor_fraction, solver, parallel=False)
+        else:
+            plan = analyzer.suggest_fair_redistribution(ratio, max_donor_fraction, solver=solver)
+        name = dept or REPORT_ALL_DEPARTMENTS
+        transferred = int(plan['Προτεινόμενη Μεταφορά'].sum()) if not plan.empty else 0
+        kpi_rows.append({**labels, 'ΤΜΗΜΑ': name, **selection.kpis(),
+                         'transfers': len(plan), 'transferred_appointments': transferred})
+        if not plan.empty:
+            plans.append(plan.assign(**labels, ΕΥΡΟΣ=name if dept else scope))
+    return kpi_rows, plans
+
+
+def run_batch_report(output_dir, window_months=REPORT_WINDOW_MONTHS, fmt='csv', ratio=0.30, max_donor_fraction=0.25,
+                     solver=REDISTRIBUTION_SOLVER, scope=REDISTRIBUTION_SCOPE, source=None, workers=REPORT_WORKERS):
+    """
+    Αναφορά χωρίς Dash (π.χ. προγραμματισμένη εκτέλεση τη νύχτα): φόρτωση με load_unavailable_appointments_data,
+    κύβος και για κάθε παράθυρο window_months μηνών KPI και πλάνο ανακατανομής (UnavailableAppointmentsAnalyzer)
+    για όλο το νοσοκομείο και για κάθε τμήμα. Τα παράθυρα υπολογίζονται παράλληλα και τα αποτελέσματα
+    γράφονται στα kpis.<fmt> και redistribution.<fmt> του output_dir.
+    Επιστρέφει {'kpis': path, 'redistribution': path}.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Μη διαθέσιμη μορφή αναφοράς: {fmt} (διαθέσιμες: {', '.join(EXPORT_FORMATS)})")
+    if solver not in REDISTRIBUTION_SOLVERS or scope not in REDISTRIBUTION_SCOPES:
+        raise ValueError(f"solver={solver}, scope={scope}")
+    if window_months < 1:
+        raise ValueError(f"window_months={window_months}")
+
+    started = time.perf_counter()
+    df = load_unavailable_appointments_data(source=source)
+    if df is None or df.empty:
+        raise ValueError("Δεν βρέθηκαν δεδομένα για την αναφορά")
+    cube = AppointmentsCube(df)
+    del df
+    windows = _report_windows(cube, window_months)
+    workers = min(len(windows), workers or os.cpu_count() or 1)
+    log.info(f"📑 Αναφορά: {len(windows)} παράθυρα × {len(cube.departments) + 1} επιλογές με {workers} διεργασίες...")
+
+    task = functools.partial(_report_window, ratio=ratio, max_donor_fraction=max_donor_fraction, solver=solver, scope=scope)
+    if workers > 1:
+        # Ο κύβος περνά μία φορά σε κάθε worker (με fork χωρίς αντιγραφή) και όχι σε κάθε παράθυρο
+        context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_report_worker, initargs=(cube,)) as pool:
+            results = list(pool.map(task, windows))
+    else:
+        _init_report_worker(cube)
+        results = [task(window) for window in windows]
+
+    kpis = pd.DataFrame([row for rows, _ in results for row in rows])
+    plans = [plan for _, window_plans in results for plan in window_plans]
+    lead = ['ΑΡΧΗ_ΠΕΡΙΟΔΟΥ', 'ΤΕΛΟΣ_ΠΕΡΙΟΔΟΥ', 'ΕΥΡΟΣ']
+    redistribution = pd.concat(plans, ignore_index=True) if plans else pd.DataFrame(columns=lead + TRANSFER_COLUMNS)
+    redistribution = redistribution[lead + [col for col in redistribution.columns if col not in lead]]
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name, frame in [('kpis', kpis), ('redistribution', redistribution)]:
+        paths[name] = os.path.join(output_dir, f'{name}.{fmt}')
+        with open(paths[name], 'wb') as fh:
+            _write_export(frame, fmt, fh)
+    log.info(f"✅ Αναφορά σε {time.perf_counter() - started:.2f}s: {len(kpis):,} γραμμές KPI, "
+             f"{len(redistribution):,} μεταφορές → {output_dir}")
+    return paths
+
 # ══════════════════════════════════════════════════════════════════════════════
 # RUN APP
 # ══════════════════════════════════════════════════════════════════════════════
 
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Dashboard Αδιάθετων Ραντεβου - 401 ΓΣΝ")
+    parser.add_argument('--compare-wiring', type=int, metavar='N', default=0,
+                        help="μέτρηση CPU ανά αλληλεπίδραση (direct vs pipeline) σε N τυχαίες αλλαγές φίλτρων και έξοδος")
+    parser.add_argument('--wiring', default=CALLBACK_WIRING, choices=CALLBACK_WIRINGS,
+                        help="σύνδεση των callbacks των φίλτρων: pipeline (κοινό filter-state) ή direct")
+    parser.add_argument('--cold-start', action='store_true',
+                        help="μέτρηση ψυχρής εκκίνησης (import, πρώτο layout, έτοιμα δεδομένα) σε νέα διεργασία και έξοδος")
+    parser.add_argument('--data', metavar='ΦΑΚΕΛΟΣ|GLOB', default=None,
+                        help="φόρτωση όλων των CSV ενός φακέλου ή glob (παράλληλα) αντί για τα DATA_FILES")
+    parser.add_argument('--log-level', default=LOG_LEVEL, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="επίπεδο μηνυμάτων (DEBUG: λεπτομέρειες φίλτρων/ανακατανομής ανά αλληλεπίδραση)")
+    parser.add_argument('--profile', type=int, metavar='N', default=0,
+                        help=f"προφίλ (cProfile) των επόμενων N εκτελέσεων callbacks στον φάκελο {PROFILE_DIR}")
+    parser.add_argument('--profile-slow', type=float, metavar='ΔΕΥΤ', default=None,
+                        help="προφίλ όσων εκτελέσεων callbacks διαρκούν τουλάχιστον τόσα δευτερόλεπτα")
+    parser.add_argument('--generate', metavar='CSV', default=None,
+                        help="δημιουργία συνθετικού CSV μορφής OPSY (--rows, --departments, --teams-per-department, --aliases) και έξοδος")
+    parser.add_argument('--benchmark', metavar='JSON', nargs='?', const='benchmark_results.json', default=None,
+                        help="benchmark σε συνθετικά δεδομένα μεγέθους --rows, αποτελέσματα σε JSON και έξοδος")
+    parser.add_argument('--baseline', metavar='JSON', default=None,
+                        help="σύγκριση του --benchmark με προηγούμενο αποτέλεσμα (έξοδος 1 αν υπάρχει επιβράδυνση)")
+    parser.add_argument('--rows', default=','.join(map(str, BENCH_ROWS)),
+                        help="πλήθος γραμμών (λίστα με κόμμα για το --benchmark, π.χ. 10000,1000000)")
+    parser.add_argument('--groups', default=','.join(map(str, BENCH_GROUPS)),
+                        help="πλήθη ομάδων για την ανακατανομή στο --benchmark (λίστα με κόμμα, κενό = χωρίς)")
+    parser.add_argument('--departments', type=int, default=SYNTHETIC_DEPARTMENTS, help="τμήματα στα συνθετικά δεδομένα")
+    parser.add_argument('--teams-per-department', type=int, default=SYNTHETIC_TEAMS_PER_DEPARTMENT,
+                        help="ομάδες ανά τμήμα στα συνθετικά δεδομένα")
+    parser.add_argument('--aliases', action='store_true',
+                        help="εναλλακτικά ονόματα στηλών και format ημερομηνίας στο --generate")
+    parser.add_argument('--repeat', type=int, default=BENCH_REPEAT, help="επαναλήψεις κάθε μέτρησης του --benchmark")
+    parser.add_argument('--report', metavar='ΦΑΚΕΛΟΣ', default=None,
+                        help="αναφορά KPI και ανακατανομής ανά τμήμα και παράθυρο μηνών χωρίς dashboard (με --data για άλλα αρχεία) και έξοδος")
+    parser.add_argument('--window-months', type=int, default=REPORT_WINDOW_MONTHS,
+                        help="μήνες ανά παράθυρο του --report (1 = μηνιαία, 3 = τρίμηνα, 12 = έτη)")
+    parser.add_argument('--format', default='csv', choices=EXPORT_FORMATS, help="μορφή αρχείων του --report")
+    parser.add_argument('--ratio', type=float, default=0.30, help="ποσοστό ανακατανομής του --report")
+    parser.add_argument('--solver', default=REDISTRIBUTION_SOLVER, choices=list(REDISTRIBUTION_SOLVERS),
+                        help="επιλυτής ανακατανομής του --report")
+    parser.add_argument('--scope', default=REDISTRIBUTION_SCOPE, choices=list(REDISTRIBUTION_SCOPES),
+                        help="εύρος ανακατανομής για όλο το νοσοκομείο στο --report")
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+    rows = [int(value.replace('_', '')) for value in args.rows.split(',') if value.strip()]
+    synthetic = {'n_departments': args.departments, 'teams_per_department': args.teams_per_department}
+    if args.generate:
+        generate_synthetic_csv(args.generate, rows[0], aliases=args.aliases, **synthetic)
+        raise SystemExit(0)
+    if args.benchmark:
+        groups = [int(value.replace('_', '')) for value in args.groups.split(',') if value.strip()]
+        report = run_benchmark(rows, repeat=args.repeat, groups=groups, **synthetic)
+        with open(args.benchmark, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=1)
+        print(f"💾 Αποτελέσματα: {args.benchmark}")
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as fh:
+                raise SystemExit(1 if compare_benchmarks(json.load(fh), report) else 0)
+        raise SystemExit(0)
+    if args.profile or args.profile_slow is not None:
+        PROFILER.configure(n=args.profile, threshold=args.profile_slow)
+    if args.data:
+        DATA_SOURCE = args.data
+    if args.report:
+        run_batch_report(args.report, window_months=args.window_months, fmt=args.format, ratio=args.ratio,
+                         solver=args.solver, scope=args.scope)
+        raise SystemExit(0)
+    if args.compare_wiring:
+        DATA.load()
+        compare_callback_wiring(args.compare_wiring)
+        raise SystemExit(0)
+    if args.cold_start:
+        result = measure_cold_start()
+        raise SystemExit(0 if result['layout'] <= COLD_START_BUDGET else 1)
+    
+    print("🚀 Εκκίνηση Dashboard Αδιάθετων Ραντεβου...")
+    app = create_app(wiring=args.wiring)
+    
     print("\n" + "="*60)
     print("🏥 DASHBOARD ΑΔΙΑΘΕΤΩΝ ΡΑΝΤΕΒΟΥ - 401 ΓΣΝ")
     print("="*60)
     print("✅ Dashboard αρχικοποιήθηκε με επιτυχία!")
-    print(f"📊 Συνολικές εγγραφές: {len(df):,}")
-    print(f"❌ Συνολικά αδιάθετα: {df['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum():,}")
-    print(f"🏥 Τμήματα: {df['ΤΜΗΜΑ'].nunique()}")
-    print(f"👥 Ομάδες: {df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].nunique()}")
-    print(f"📅 Περίοδος: {df['ΜΗΝΑΣ-ΕΤΟΣ'].min()} έως {df['ΜΗΝΑΣ-ΕΤΟΣ'].max()}")
+    print("⏳ Τα δεδομένα φορτώνονται στο παρασκήνιο - κατάσταση στο /health")
     
     print("\n🎯 ΣΤΟΧΟΙ DASHBOARD:")
     print("   • Παρακολούθηση αδιάθετων ραντεβου")
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import adiatheta_mono_v8_weighted as dashboard  # noqa: E402
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """Εγγραφή CSV μορφής OPSY στο tmp_path από λίστα γραμμών (ΤΜΗΜΑ, ΟΜΑΔΑ, αδιάθετα, διαθέσιμα, μήνας)"""
+    def write(name, rows, header='ΤΜΗΜΑ,ΟΝΟΜΑ_ΟΜΑΔΑΣ,ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ,ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ,ΜΗΝΑΣ-ΕΤΟΣ'):
+        path = tmp_path / name
+        path.write_text('\n'.join([header] + [','.join(map(str, row)) for row in rows]) + '\n', encoding='utf-8')
+        return str(path)
+    return write
+
+
+@pytest.fixture(scope='session')
+def synthetic_frame(tmp_path_factory):
+    """Συμπαγές DataFrame (όπως μετά τη φόρτωση) από μικρό συνθετικό CSV - κοινό για όλα τα tests"""
+    path = str(tmp_path_factory.mktemp('synthetic') / 'synthetic.csv')
+    dashboard.generate_synthetic_csv(path, 4000, n_departments=12, teams_per_department=5, months=14, seed=7)
+    return dashboard._with_source(dashboard._load_data_file(path, use_cache=False, verbose=False), path)
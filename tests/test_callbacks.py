@@ -0,0 +1,23 @@
+import pytest
+
+from conftest import dashboard
+
+
+def _dependencies(wiring):
+    app = dashboard.create_app(load_data=False, wiring=wiring)
+    return app.server.test_client().get('/_dash-dependencies').get_json()
+
+
+@pytest.mark.parametrize('wiring', dashboard.CALLBACK_WIRINGS)
+def test_create_app_wires_filter_callbacks(wiring):
+    dependencies = _dependencies(wiring)
+    inputs = {d['output']: {f"{i['id']}.{i['property']}" for i in d['inputs']} for d in dependencies}
+    assert ('filter-state.data' in inputs) == (wiring == 'pipeline')
+    expected = 'filter-state.data' if wiring == 'pipeline' else 'date-range.start_date'
+    assert expected in inputs['kpi-section.children']
+    assert len(dependencies) == len(_dependencies(wiring))  # δεύτερο app, ίδια σύνδεση
+
+
+def test_create_app_rejects_unknown_wiring():
+    with pytest.raises(ValueError):
+        dashboard.create_app(load_data=False, wiring='bogus')
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import dashboard
+
+
+@pytest.fixture(scope='module')
+def plan():
+    summary = dashboard.synthetic_team_summary(1_500, seed=2)
+    plan = dashboard.UnavailableAppointmentsAnalyzer(None, team_summary=summary).suggest_fair_redistribution(0.4, 0.1)
+    assert plan.groupby(['Από Ομάδα', 'Προς Ομάδα']).ngroups > 200
+    return plan
+
+
+@pytest.mark.parametrize('max_links', [5, 20, 80])
+def test_sankey_folds_tail_and_keeps_donor_totals(plan, max_links):
+    labels, colors, sources, targets, values, folded = dashboard._sankey_links(plan, max_links)
+    pairs = plan.groupby(['Από Ομάδα', 'Προς Ομάδα']).ngroups
+
+    assert len(labels) == len(colors)
+    assert len(values) <= 3 * max_links + 1
+    assert folded == pairs - max_links
+    assert len(set(zip(sources, targets))) == len(values)  # μία ροή ανά ζεύγος κόμβων
+    assert sum(values) == plan['Προτεινόμενη Μεταφορά'].sum()
+
+    # Κάθε δότης που εμφανίζεται κρατά ολόκληρο το σύνολό του (οι υπόλοιπες ροές του πάνε στους «Λοιποί δέκτες»)
+    outgoing = pd.Series(values).groupby(np.asarray(sources)).sum()
+    donor_totals = plan.groupby('Από Ομάδα')['Προτεινόμενη Μεταφορά'].sum()
+    shown = {i: label.removeprefix('ΔΟΤΗΣ: ') for i, label in enumerate(labels) if label.startswith('ΔΟΤΗΣ: ')}
+    assert shown
+    for node, donor in shown.items():
+        assert outgoing[node] == donor_totals[donor]
+    if len(shown) < len(donor_totals):
+        assert 'Λοιποί δότες' in labels
+
+
+@pytest.mark.parametrize('max_links', [0, None, 10 ** 6])
+def test_sankey_without_folding_aggregates_pairs(plan, max_links):
+    labels, _, sources, targets, values, folded = dashboard._sankey_links(plan, max_links)
+    flows = plan.groupby(['Από Ομάδα', 'Προς Ομάδα'])['Προτεινόμενη Μεταφορά'].sum()
+    assert folded == 0 and len(values) == len(flows)
+    result = {(labels[s].removeprefix('ΔΟΤΗΣ: '), labels[t].removeprefix('ΔΕΚΤΗΣ: ')): v
+              for s, t, v in zip(sources, targets, values)}
+    assert result == flows.to_dict()
+
+
+def _department_selection(unavailable):
+    """Επιλογή κύβου με ένα τμήμα ανά τιμή του unavailable (μία ομάδα, ένας μήνας)"""
+    n = len(unavailable)
+    df = pd.DataFrame({
+        'ΤΜΗΜΑ': pd.Categorical([f"ΤΜΗΜΑ {i:04d}" for i in range(n)]),
+        'ΟΝΟΜΑ_ΟΜΑΔΑΣ': pd.Categorical(['ΟΜΑΔΑ'] * n),
+        'month_ord': np.full(n, 640, dtype=np.int32),
+        'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': np.asarray(unavailable, dtype=np.int64),
+        'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': np.asarray(unavailable, dtype=np.int64) + 10,
+    })
+    return dashboard.AppointmentsCube(df).select(None, None, [], [])
+
+
+def test_dept_ranking_keeps_tied_departments():
+    # Το αρχικό drop_duplicates() στις τιμές κρατούσε ένα μόνο από τα ισόβαθμα τμήματα
+    ranking = _department_selection([50] * 6 + [20] * 10 + [3] * 6).dept_ranking(5)
+    assert len(ranking) == 10 and ranking.index.is_unique
+    assert ranking['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].tolist() == [3] * 5 + [50] * 5
+    assert ranking['ΚΑΤΗΓΟΡΙΑ'].tolist() == ['low'] * 5 + ['high'] * 5
+
+
+@pytest.mark.parametrize('n', [1, 15, 40])
+def test_dept_ranking_on_thousands_of_departments(n):
+    values = np.random.default_rng(n).integers(0, 25, 3_000)  # πολλές ισοβαθμίες
+    ranking = _department_selection(values).dept_ranking(n)
+    median = np.median(values)
+
+    assert len(ranking) == 2 * n and ranking.index.is_unique
+    ranked = ranking['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy()
+    assert (np.diff(ranked) >= 0).all()
+    assert (ranked[:n] == np.sort(values)[:n]).all() and (ranked[n:] == np.sort(values)[-n:]).all()
+    expected = np.where(ranked[:n] <= median, 'low', 'middle').tolist() + \
+        np.where(ranked[n:] >= median, 'high', 'middle').tolist()
+    assert ranking['ΚΑΤΗΓΟΡΙΑ'].tolist() == expected
+
+
+def test_dept_ranking_with_fewer_departments_than_n():
+    ranking = _department_selection([4, 9, 1]).dept_ranking(15)
+    assert ranking['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].tolist() == [1, 4, 9]
+
+
+@pytest.mark.parametrize('n, n_points', [(1_000, 100), (997, 64), (50, 7), (10, 20)])
+def test_minmax_downsampling_keeps_extremes(n, n_points):
+    values = np.random.default_rng(n).normal(size=n).cumsum()
+    values[n // 3] = 100.0    # απομονωμένη κορυφή
+    values[2 * n // 3] = -100.0
+    keep = dashboard._minmax_indices(values, n_points)
+
+    assert (np.diff(keep) > 0).all() and keep[0] >= 0 and keep[-1] < n
+    assert len(keep) <= max(n_points, 2)
+    assert n // 3 in keep and 2 * n // 3 in keep
+    assert values[keep].max() == values.max() and values[keep].min() == values.min()
+    if n <= n_points:
+        assert len(keep) == n
+
+
+def test_minmax_downsampling_with_missing_months():
+    values = np.full(500, np.nan)
+    values[::7] = np.arange(len(values[::7]), dtype=float)
+    keep = dashboard._minmax_indices(values, 40)
+    assert np.isfinite(values[keep]).all()  # κάθε διάστημα έχει τιμές - τα NaN δεν επιλέγονται
+    assert values[keep].min() == 0 and values[keep].max() == np.nanmax(values)
+
+    # Μήνες χωρίς εγγραφές στη μέση: ένα NaN μένει στο κενό ώστε η γραμμή να μην ενώνει τις δύο πλευρές
+    values = np.arange(500, dtype=float)
+    values[150:350] = np.nan
+    keep = dashboard._minmax_indices(values, 40)
+    assert np.isnan(values[keep[(keep > 150) & (keep < 350)]]).any()
+    assert values[keep][np.isfinite(values[keep])].min() == 0 and np.nanmax(values[keep]) == 499
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import dashboard
+
+
+def _reference_filter(df, start_date, end_date, dept_list, team_list):
+    """Η μάσκα του αρχικού filter_data (σύγκριση μηνών, isin τμημάτων/ομάδων) πάνω στο συμπαγές DataFrame"""
+    mask = np.ones(len(df), dtype=bool)
+    if start_date and end_date:
+        month = dashboard._ordinal_to_timestamp(df['month_ord'].to_numpy()).to_period('M')
+        mask &= (month >= pd.to_datetime(start_date).to_period('M')) & (month <= pd.to_datetime(end_date).to_period('M'))
+    if dept_list:
+        mask &= df['ΤΜΗΜΑ'].isin(dept_list).to_numpy()
+    if team_list:
+        mask &= df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].isin(team_list).to_numpy()
+    return mask
+
+
+def _reference_kpis(data):
+    """Το αρχικό calculate_unavailable_kpis (groupby στο φιλτραρισμένο DataFrame)"""
+    if data.empty:
+        return {}
+    total_unavailable = int(data['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum())
+    total_available = int(data['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].sum())
+    avg_unavailable_rate = float((total_unavailable / total_available * 100) if total_available > 0 else 0)
+    dept_unavailable = data.groupby('ΤΜΗΜΑ', observed=True)['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum()
+    return {
+        'total_unavailable': total_unavailable,
+        'total_available': total_available,
+        'avg_unavailable_rate': round(avg_unavailable_rate, 1),
+        'worst_dept': str(dept_unavailable.idxmax()),
+        'worst_dept_count': int(dept_unavailable.max()),
+        'best_dept': str(dept_unavailable.idxmin()),
+        'best_dept_count': int(dept_unavailable.min()),
+        'total_departments': int(data['ΤΜΗΜΑ'].nunique()),
+        'total_teams': int(data['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].nunique()),
+        'months_analyzed': int(data['month_ord'].nunique())
+    }
+
+
+def _random_filters(df, seed):
+    """Τυχαία φίλτρα όπως από το UI: περίοδος με τυχαίες ημέρες (ή καμία) και υποσύνολα τμημάτων/ομάδων"""
+    rng = np.random.default_rng(seed)
+    first, last = int(df['month_ord'].min()), int(df['month_ord'].max())
+    if rng.random() < 0.2:
+        start_date = end_date = None
+    else:
+        # Και περίοδοι που ξεκινούν πριν ή τελειώνουν μετά τα δεδομένα
+        months = np.sort(rng.integers(first - 2, last + 3, 2))
+        start_date, end_date = (str((dashboard._ordinal_to_timestamp(m) + pd.Timedelta(days=int(rng.integers(0, 28)))).date())
+                                for m in months)
+    departments = list(df['ΤΜΗΜΑ'].cat.categories)
+    teams = list(df['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].cat.categories)
+    dept_list = list(rng.choice(departments, int(rng.integers(0, 5)), replace=False))
+    team_list = list(rng.choice(teams, int(rng.integers(0, 4)), replace=False))
+    if rng.random() < 0.2:
+        dept_list.append('ΑΝΥΠΑΡΚΤΟ ΤΜΗΜΑ')
+    return start_date, end_date, dept_list, team_list
+
+
+@pytest.fixture(scope='module')
+def dataset(synthetic_frame):
+    return dashboard.Dataset(synthetic_frame)
+
+
+@pytest.fixture
+def current(dataset, monkeypatch):
+    """Το dataset ως τρέχον (DATA) για filter_data/get_selection, με άδεια cache φίλτρων"""
+    holder = dashboard.DatasetHolder(lambda: dataset.df)
+    holder._current = dataset
+    monkeypatch.setattr(dashboard, 'DATA', holder)
+    dashboard.FILTER_CACHE.clear()
+    yield dataset
+    dashboard.FILTER_CACHE.clear()
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_filter_data_matches_reference(current, seed):
+    df = current.df
+    filters = _random_filters(df, seed)
+    mask = _reference_filter(df, *filters)
+
+    positions = current.row_index.positions(*filters)
+    expected = np.arange(len(df)) if positions is None else positions
+    assert (np.flatnonzero(mask) == expected).all()
+    pd.testing.assert_frame_equal(dashboard.filter_data(*filters), df[mask])
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_cube_selection_matches_groupby(dataset, seed):
+    df = dataset.df
+    filters = _random_filters(df, seed)
+    data = df[_reference_filter(df, *filters)]
+    selection = dataset.cube.select(*filters)
+
+    assert selection.kpis() == _reference_kpis(data)
+    assert selection.empty == data.empty
+    if data.empty:
+        return
+
+    measures = ['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'ΡΑΝΤΕΒΟΥ_ΠΟΥ_ΚΛΕΙΣΤΗΚΑΝ']
+    groups = data.groupby(['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ'], observed=True)
+    expected = groups[measures].sum().assign(ΕΓΓΡΑΦΕΣ=groups.size()).reset_index()
+    expected[['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']] = expected[['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']].astype(str)
+    pd.testing.assert_frame_equal(selection.group_totals(), expected, check_dtype=False)
+
+    means = groups[['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ']].mean().round(0).astype(int).reset_index()
+    means[['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']] = means[['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ']].astype(str)
+    pd.testing.assert_frame_equal(selection.team_means(), means, check_dtype=False)
+
+    dept = data.groupby('ΤΜΗΜΑ', observed=True)['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].sum()
+    pd.testing.assert_series_equal(selection.dept_totals('ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'), dept,
+                                   check_dtype=False, check_index_type=False, check_categorical=False, check_names=False)
+
+    monthly = data.groupby('month_ord')[['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ']].sum().reset_index()
+    pd.testing.assert_frame_equal(selection.monthly_totals(), monthly, check_dtype=False)
+
+    series = data.pivot_table(index='month_ord', columns='ΟΝΟΜΑ_ΟΜΑΔΑΣ', values='ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ',
+                              aggfunc='sum', observed=True)
+    result = selection.monthly_series('ΟΝΟΜΑ_ΟΜΑΔΑΣ').loc[series.index, series.columns.astype(str)]
+    np.testing.assert_array_equal(result.to_numpy(), series.to_numpy(dtype=float))
@@ -0,0 +1,37 @@
+import codecs
+import io
+
+import pandas as pd
+import pytest
+
+from conftest import dashboard
+
+
+@pytest.fixture
+def client(synthetic_frame, monkeypatch):
+    """Test client του Flask με το συνθετικό Dataset ως τρέχον"""
+    holder = dashboard.DatasetHolder(lambda: synthetic_frame)
+    monkeypatch.setattr(dashboard, 'DATA', holder)
+    assert holder.load() is not None
+    return dashboard.create_app(load_data=False).server.test_client()
+
+
+def test_csv_export_streams_all_rows(client):
+    response = client.get('/export/detailed.csv')
+    assert response.status_code == 200
+    body = response.get_data()
+    assert body.startswith(codecs.BOM_UTF8)
+    frame = pd.read_csv(io.BytesIO(body[len(codecs.BOM_UTF8):]))
+    assert len(frame) == len(dashboard.get_detailed_summary(None, None, [], []))
+
+
+def test_failed_binary_export_returns_500(client, monkeypatch):
+    def broken(frame, fmt, out):
+        raise ImportError("Missing optional dependency 'openpyxl'")
+
+    monkeypatch.setattr(dashboard, 'EXPORT_FORMATS', dashboard.EXPORT_FORMATS + ['xlsx'])
+    monkeypatch.setattr(dashboard, '_write_export', broken)
+    response = client.get('/export/detailed.xlsx')
+    assert response.status_code == 500
+    assert 'openpyxl' in response.get_data(as_text=True)
+    assert 'Content-Disposition' not in response.headers
@@ -0,0 +1,120 @@
+import os
+import threading
+import tracemalloc
+
+import pandas as pd
+
+from conftest import dashboard
+
+
+NUMERIC_CODES = [(101, 12, 3, 10, '2023-01'), (101, 13, 0, 8, '2023-01'),
+                 (102, 12, 7, 10, '2023-02'), (102, 14, 1, 5, '2023-03')]
+
+
+def test_cache_round_trip_keeps_dtypes(write_csv):
+    path = write_csv('numeric_codes.csv', NUMERIC_CODES)
+    fresh = dashboard._load_data_file(path, use_cache=True, verbose=False)
+    cached = dashboard._load_data_file(path, use_cache=True, verbose=False)
+    assert dashboard._load_frame_cache(path) is not None
+
+    assert (cached.dtypes == fresh.dtypes).all()
+    for col in ['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ', 'ΚΑΤΗΓΟΡΙΑ_ΑΔΙΑΘΕΤΩΝ']:
+        assert cached[col].cat.categories.dtype == fresh[col].cat.categories.dtype
+    assert list(fresh['ΤΜΗΜΑ'].cat.categories) == ['101', '102']
+    pd.testing.assert_frame_equal(cached, fresh)
+
+
+def test_chunked_load_matches_full_load(write_csv):
+    # Το πρώτο chunk έχει μόνο αριθμητικούς κωδικούς ομάδων, το δεύτερο κείμενο και τμήματα σε άλλη σειρά
+    rows = [('Z1', 12, i, 10, f'2023-0{1 + i % 5}') for i in range(5)] + \
+           [('A1', 'A12', i, 10, f'2023-0{1 + i % 5}') for i in range(5)] + \
+           [('Z1', '', 2, 4, '2023-06'), ('A1', 13, 1, 3, 'xx')]
+    path = write_csv('mixed_codes.csv', rows)
+    chunked = dashboard._load_data_file(path, use_cache=False, chunksize=5, verbose=False)
+    full = dashboard._load_data_file(path, use_cache=False, verbose=False)
+    assert chunked is not None and len(chunked) == 11
+    pd.testing.assert_frame_equal(chunked, full)
+
+
+def test_appended_rows_stop_at_snapshot_end(write_csv):
+    path = write_csv('growing.csv', NUMERIC_CODES[:2])
+    first_end = os.path.getsize(path)
+    with open(path, 'a', encoding='utf-8') as fh:
+        fh.write('103,15,4,9,2023-04\n')
+    second_end = os.path.getsize(path)
+    with open(path, 'a', encoding='utf-8') as fh:
+        fh.write('104,16,6,9,2023-05\n105,1')  # γράφονται μετά το στιγμιότυπο - δεν πρέπει να διαβαστούν
+
+    # offset 0 (νέο αρχείο): μόνο οι γραμμές έως το end, χωρίς να μετρηθεί το μήκος της κεφαλίδας δύο φορές
+    snapshot = dashboard._read_appended_rows(path, 0, second_end)
+    assert snapshot['ΤΜΗΜΑ'].astype(str).tolist() == ['101', '101', '103']
+
+    delta = dashboard._read_appended_rows(path, first_end, second_end)
+    assert delta['ΤΜΗΜΑ'].astype(str).tolist() == ['103']
+    assert dashboard._read_appended_rows(path, second_end, second_end).empty
+
+
+def test_mixed_dtype_files_combine(write_csv, tmp_path):
+    write_csv('numeric.csv', NUMERIC_CODES)
+    first = dashboard.load_unavailable_appointments_data(use_cache=True, source=str(tmp_path))
+    # Δεύτερη φόρτωση: numeric.csv από την cache, text.csv φρέσκο
+    write_csv('text.csv', [('Z1', 'A12', 5, 10, '2023-02'), ('101', 'B7', 2, 6, '2023-03')])
+    mixed = dashboard.load_unavailable_appointments_data(use_cache=True, source=str(tmp_path))
+
+    assert len(first) == 4 and len(mixed) == 6
+    assert list(mixed['ΤΜΗΜΑ'].cat.categories) == ['101', '102', 'Z1']
+    assert list(mixed['ΟΝΟΜΑ_ΟΜΑΔΑΣ'].cat.categories) == ['12', '13', '14', 'A12', 'B7']
+
+
+def test_concat_and_merge_coerce_category_dtypes(write_csv):
+    text = dashboard._with_source(dashboard._load_data_file(
+        write_csv('text.csv', [('Z1', 'A12', 5, 10, '2023-02')]), use_cache=False, verbose=False), 'text.csv')
+    numeric = text.copy()
+    numeric['ΤΜΗΜΑ'] = pd.Categorical([101])
+    numeric['ΟΝΟΜΑ_ΟΜΑΔΑΣ'] = pd.Categorical([12])
+    empty = numeric.iloc[:0]
+
+    combined = dashboard._concat_frames([text, numeric, empty])
+    assert list(combined['ΤΜΗΜΑ'].cat.categories) == ['101', 'Z1']
+    assert combined['ΤΜΗΜΑ'].cat.categories.dtype == object
+
+    merged = dashboard.Dataset(text).merged(numeric)
+    expected = dashboard.Dataset(combined)
+    pd.testing.assert_frame_equal(merged.df, expected.df)
+    assert list(merged.cube.departments) == list(expected.cube.departments)
+    assert (merged.cube.prefix == expected.cube.prefix).all()
+    assert merged.unique_teams == ['12', 'A12']
+
+
+def test_parallel_ingest_from_thread(write_csv, tmp_path, monkeypatch):
+    write_csv('a.csv', NUMERIC_CODES)
+    write_csv('b.csv', [('Z1', 'A12', 5, 10, '2023-02')])
+    files = dashboard.resolve_data_files(str(tmp_path))
+    monkeypatch.setattr(dashboard, 'INGEST_WORKERS', 1)
+    serial = dashboard._ingest_files(files, use_cache=False)
+
+    # Όπως ο loader/watcher του dashboard: το pool ξεκινά από background thread
+    monkeypatch.setattr(dashboard, 'INGEST_WORKERS', 2)
+    assert dashboard._process_pool_context().get_start_method() != 'fork'
+    results = []
+    loader = threading.Thread(target=lambda: results.append(dashboard._ingest_files(files, use_cache=False)))
+    loader.start()
+    loader.join(60)
+    assert not loader.is_alive()
+    pd.testing.assert_frame_equal(results[0], serial)
+
+
+def test_chunked_load_keeps_only_compact_chunks(tmp_path):
+    path = str(tmp_path / 'synthetic.csv')
+    dashboard.generate_synthetic_csv(path, 60_000, aliases=True, seed=11)
+    peaks = {}
+    for chunksize in [None, 5_000]:
+        tracemalloc.start()
+        df = dashboard._load_data_file(path, use_cache=False, chunksize=chunksize, verbose=False)
+        peaks[chunksize] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if chunksize is None:
+            full = df
+    pd.testing.assert_frame_equal(df, full)
+    # Συσσωρεύονται μόνο συμπαγή chunks: η μέγιστη μνήμη μένει πολύ κάτω από της πλήρους ανάγνωσης
+    assert peaks[5_000] < 0.5 * peaks[None]
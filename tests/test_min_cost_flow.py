@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import dashboard
+
+
+def _reference_min_cost_flow(n_nodes, edges, source, sink, max_flow):
+    """Successive shortest paths με Bellman-Ford, μία διαδρομή τη φορά - αργό αλλά απλό σημείο αναφοράς"""
+    graph = [[] for _ in range(n_nodes)]
+    for u, v, capacity, cost in edges:
+        graph[u].append([v, capacity, cost, len(graph[v])])
+        graph[v].append([u, 0, -cost, len(graph[u]) - 1])
+
+    flow = cost = 0
+    while flow < max_flow:
+        dist = [None] * n_nodes
+        previous = [None] * n_nodes
+        dist[source] = 0
+        for _ in range(n_nodes):
+            changed = False
+            for u in range(n_nodes):
+                if dist[u] is None:
+                    continue
+                for i, (v, capacity, edge_cost, _) in enumerate(graph[u]):
+                    if capacity > 0 and (dist[v] is None or dist[u] + edge_cost < dist[v]):
+                        dist[v], previous[v], changed = dist[u] + edge_cost, (u, i), True
+            if not changed:
+                break
+        if dist[sink] is None:
+            break
+        path, v = [], sink
+        while v != source:
+            u, i = previous[v]
+            path.append((u, i))
+            v = u
+        push = min([max_flow - flow] + [graph[u][i][1] for u, i in path])
+        for u, i in path:
+            edge = graph[u][i]
+            edge[1] -= push
+            graph[edge[0]][edge[3]][1] += push
+        flow += push
+        cost += push * dist[sink]
+    return flow, cost
+
+
+def _random_network(rng, n_nodes, n_edges):
+    edges = []
+    for _ in range(n_edges):
+        u, v = rng.choice(n_nodes, 2, replace=False)
+        edges.append((int(u), int(v), int(rng.integers(0, 6)), int(rng.integers(0, 10))))
+    return edges
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_min_cost_flow_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    n_nodes = int(rng.integers(4, 9))
+    edges = _random_network(rng, n_nodes, int(rng.integers(n_nodes, 3 * n_nodes)))
+    max_flow = int(rng.integers(1, 15))
+
+    network = dashboard._MinCostFlow(n_nodes)
+    handles = [network.add_edge(u, v, capacity, cost) for u, v, capacity, cost in edges]
+    flow, cost, completed = network.solve(0, 1, max_flow)
+
+    assert completed
+    assert (flow, cost) == _reference_min_cost_flow(n_nodes, edges, 0, 1, max_flow)
+
+    # Εφικτότητα: χωρητικότητες και διατήρηση ροής σε κάθε ενδιάμεσο κόμβο
+    balance = np.zeros(n_nodes, dtype=np.int64)
+    for (u, v, capacity, edge_cost), handle in zip(edges, handles):
+        amount = network.flow(handle)
+        assert 0 <= amount <= capacity
+        balance[u] -= amount
+        balance[v] += amount
+    assert balance[0] == -flow and balance[1] == flow
+    assert not balance[2:].any()
+
+
+def _summary(unavailable, available, departments):
+    return pd.DataFrame({
+        'ΤΜΗΜΑ': departments,
+        'ΟΝΟΜΑ_ΟΜΑΔΑΣ': [f"ΟΜΑΔΑ {i:03d}" for i in range(len(unavailable))],
+        'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': np.asarray(unavailable, dtype=np.int64),
+        'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': np.asarray(available, dtype=np.int64),
+    })
+
+
+def _random_summary(seed, n_groups):
+    rng = np.random.default_rng(seed)
+    unavailable = rng.integers(0, 40, n_groups)
+    unavailable[rng.choice(n_groups, 2, replace=False)] += 60  # λίγοι καθαροί δότες
+    available = unavailable + rng.integers(0, 25, n_groups)
+    departments = [f"ΤΜΗΜΑ {d}" for d in rng.integers(0, 3, n_groups)]
+    return _summary(unavailable, available, departments)
+
+
+def _problem(summary, ratio, cap):
+    """Είσοδοι του _allocate_min_cost_flow όπως τους ετοιμάζει το suggest_fair_redistribution"""
+    candidates = dashboard.UnavailableAppointmentsAnalyzer(None, team_summary=summary).redistribution_candidates()
+    donors, receivers = candidates['donors'], candidates['receivers']
+    total = int(max(candidates['donor_unavailable'].sum() * ratio, len(receivers)))
+    return donors, receivers, candidates['receiver_weights'], total
+
+
+def _reference_allocation_cost(donors, receivers, weights, total, cap):
+    """(ροή, κόστος) του ίδιου προβλήματος σε πλήρη διμερή γράφο δότης → δέκτης, χωρίς ομαδοποιήσεις"""
+    levels = dashboard.MCF_COST_LEVELS
+    if weights.max() > weights.min():
+        level = np.rint((weights.max() - weights) / (weights.max() - weights.min()) * (levels - 1)).astype(int)
+    else:
+        level = np.zeros(len(weights), dtype=int)
+    unavailable = donors['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy()
+    supply = np.where(unavailable > 0, np.minimum(np.maximum(1, (unavailable * cap).astype(int)), unavailable), 0)
+    capacity = np.maximum(0, receivers['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].to_numpy() - receivers['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy())
+
+    n_donors, n_receivers = len(donors), len(receivers)
+    edges = [(0, 2 + d, int(supply[d]), 0) for d in range(n_donors)]
+    edges += [(2 + n_donors + r, 1, int(capacity[r]), 0) for r in range(n_receivers)]
+    for d, donor_dept in enumerate(donors['ΤΜΗΜΑ']):
+        for r, receiver_dept in enumerate(receivers['ΤΜΗΜΑ']):
+            penalty = 0 if donor_dept == receiver_dept else dashboard.MCF_DEPT_PENALTY
+            edges.append((2 + d, 2 + n_donors + r, total, int(level[r]) + penalty))
+    return _reference_min_cost_flow(2 + n_donors + n_receivers, edges, 0, 1, total), level, supply, capacity
+
+
+@pytest.mark.parametrize('seed', range(12))
+@pytest.mark.parametrize('ratio, cap', [(0.30, 0.25), (0.6, 0.5), (0.1, 0.05)])
+@pytest.mark.parametrize('penalty', [0, dashboard.MCF_COST_LEVELS])
+def test_allocation_is_feasible_and_optimal(seed, ratio, cap, penalty, monkeypatch):
+    monkeypatch.setattr(dashboard, 'MCF_DEPT_PENALTY', penalty)
+    summary = _random_summary(seed, 14)
+    donors, receivers, weights, total = _problem(summary, ratio, cap)
+    if donors.empty or receivers.empty:
+        pytest.skip('χωρίς καθαρούς δότες/δέκτες')
+
+    donor_idx, receiver_idx, amounts, donor_before = dashboard._allocate_min_cost_flow(
+        donors, receivers, weights, total, cap, time_budget=None)
+    (expected_flow, expected_cost), level, supply, capacity = _reference_allocation_cost(
+        donors, receivers, weights, total, cap)
+
+    assert (amounts > 0).all()
+    assert amounts.sum() == expected_flow <= total
+    assert (np.bincount(donor_idx, weights=amounts, minlength=len(donors)) <= supply).all()
+    assert (np.bincount(receiver_idx, weights=amounts, minlength=len(receivers)) <= capacity).all()
+
+    donor_dept = donors['ΤΜΗΜΑ'].to_numpy()[donor_idx]
+    receiver_dept = receivers['ΤΜΗΜΑ'].to_numpy()[receiver_idx]
+    penalty = np.where(donor_dept == receiver_dept, 0, dashboard.MCF_DEPT_PENALTY)
+    assert int((amounts * (level[receiver_idx] + penalty)).sum()) == expected_cost
+
+    # Υπόλοιπο κάθε δότη πριν από κάθε μεταφορά του
+    unavailable = donors['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].to_numpy()
+    given = {}
+    for d, amount, before in zip(donor_idx.tolist(), amounts.tolist(), donor_before.tolist()):
+        assert before == unavailable[d] - given.get(d, 0)
+        given[d] = given.get(d, 0) + amount
+
+
+def test_receiver_capacity_limits_total():
+    # Ένας δέκτης χωρίς περιθώριο (διαθέσιμα = αδιάθετα) δεν παίρνει τίποτα
+    summary = _summary([90, 80, 2, 1, 3, 40], [100, 100, 2, 11, 3, 60], ['Α', 'Α', 'Α', 'Β', 'Β', 'Β'])
+    plan = dashboard.UnavailableAppointmentsAnalyzer(None, team_summary=summary).suggest_fair_redistribution(
+        0.5, 0.5, solver='mincost')
+    received = plan.groupby('Προς Ομάδα')['Προτεινόμενη Μεταφορά'].sum()
+    assert 'ΟΜΑΔΑ 002' not in received and 'ΟΜΑΔΑ 004' not in received
+    assert received.get('ΟΜΑΔΑ 003', 0) <= 10
+
+
+@pytest.mark.parametrize('penalty, receiver', [(0, 'ΟΜΑΔΑ 002'), (dashboard.MCF_COST_LEVELS, 'ΟΜΑΔΑ 001')])
+def test_department_penalty_only_when_configured(penalty, receiver, monkeypatch):
+    # Η ΟΜΑΔΑ 002 (άλλο τμήμα, 0 αδιάθετα) έχει μεγαλύτερη ανάγκη από την ΟΜΑΔΑ 001 (ίδιο τμήμα με τον δότη)
+    monkeypatch.setattr(dashboard, 'MCF_DEPT_PENALTY', penalty)
+    summary = _summary([100, 10, 0, 30, 30, 30], [120, 40, 40, 60, 60, 60], ['Α', 'Α', 'Β', 'Α', 'Β', 'Β'])
+    plan = dashboard.UnavailableAppointmentsAnalyzer(None, team_summary=summary).suggest_fair_redistribution(
+        0.1, 0.5, solver='mincost')
+    assert plan['Προς Ομάδα'].tolist() == [receiver]
+    assert plan['Προτεινόμενη Μεταφορά'].tolist() == [10]
+
+
+def test_time_budget_falls_back_to_greedy():
+    summary = dashboard.synthetic_team_summary(400, seed=5)
+    analyzer = dashboard.UnavailableAppointmentsAnalyzer(None, team_summary=summary)
+    donors, receivers, weights, total = _problem(summary, 0.3, 0.25)
+    assert dashboard._allocate_min_cost_flow(donors, receivers, weights, total, 0.25, time_budget=1e-9) is None
+
+    fallback = analyzer.suggest_fair_redistribution(0.3, 0.25, solver='mincost', time_budget=1e-9)
+    greedy = analyzer.suggest_fair_redistribution(0.3, 0.25, solver='greedy')
+    assert not greedy.empty
+    pd.testing.assert_frame_equal(fallback, greedy)
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import dashboard
+
+
+def _reference_greedy(summary, redistribute_ratio=0.30, max_donor_fraction=0.25):
+    """Η αρχική υλοποίηση της άπληστης ανακατανομής (iterrows), όπως ήταν πριν από το _allocate_greedy"""
+    if summary.empty or len(summary) < 2:
+        return pd.DataFrame()
+
+    mean_unavailable = summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].mean()
+    std_unavailable = summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].std()
+    high_threshold = mean_unavailable + (std_unavailable * 0.5)
+    low_threshold = mean_unavailable - (std_unavailable * 0.5)
+
+    donors = summary[summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] > high_threshold].copy()
+    receivers = summary[summary['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] < low_threshold].copy()
+    if donors.empty or receivers.empty:
+        return pd.DataFrame()
+
+    total_to_redistribute = int(max(donors['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'].sum() * redistribute_ratio, len(receivers)))
+
+    receiver_weights = []
+    for _, row in receivers.iterrows():
+        scarcity_weight = max(1, mean_unavailable - row['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] + 1)
+        capacity_weight = row['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'] / max(1, receivers['ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ'].max())
+        receiver_weights.append(scarcity_weight * 3 + capacity_weight * 2)
+
+    receivers['ΒΑΡΟΣ'] = receiver_weights
+    total_receiver_weight = sum(receiver_weights)
+    if total_receiver_weight <= 0:
+        return pd.DataFrame()
+    receivers['ΜΕΡΙΔΙΟ'] = (total_to_redistribute * receivers['ΒΑΡΟΣ'] / total_receiver_weight).round(0).astype(int)
+
+    transfers = []
+    donors_copy = donors.sort_values('ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', ascending=False).copy()
+    for _, receiver in receivers.iterrows():
+        remaining_needed = receiver['ΜΕΡΙΔΙΟ']
+        if remaining_needed <= 0:
+            continue
+        for donor_idx in donors_copy.index:
+            if remaining_needed <= 0:
+                break
+            donor = donors_copy.loc[donor_idx]
+            available_from_donor = donor['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']
+            if available_from_donor <= 0:
+                continue
+
+            donor_cap = max(1, int(available_from_donor * max_donor_fraction))
+            transfer_amount = min(remaining_needed, available_from_donor, donor_cap)
+
+            if transfer_amount > 0:
+                donors_copy.loc[donor_idx, 'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] -= transfer_amount
+                remaining_needed -= transfer_amount
+                transfers.append({
+                    'Τμήμα': donor['ΤΜΗΜΑ'],
+                    'Από Ομάδα': donor['ΟΝΟΜΑ_ΟΜΑΔΑΣ'],
+                    'Προς Ομάδα': receiver['ΟΝΟΜΑ_ΟΜΑΔΑΣ'],
+                    'Αδιάθετα Δότη (Αρχικά)': int(donor['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']),
+                    'Αδιάθετα Δέκτη (Αρχικά)': int(receiver['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']),
+                    'Προτεινόμενη Μεταφορά': int(transfer_amount),
+                    'Νέα Αδιάθετα Δότη': int(donors_copy.loc[donor_idx, 'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']),
+                    'Νέα Αδιάθετα Δέκτη': max(0, int(receiver['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] - transfer_amount)),
+                    'Βελτίωση Δέκτη': f"+{transfer_amount} (από {receiver['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ']} → "
+                                      f"{receiver['ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ'] + transfer_amount})",
+                    'Αιτιολόγηση': f"Μείωση αδιάθετων: {transfer_amount} ραντεβού από '{donor['ΟΝΟΜΑ_ΟΜΑΔΑΣ']}' "
+                                   f"στην '{receiver['ΟΝΟΜΑ_ΟΜΑΔΑΣ']}'"
+                })
+    return pd.DataFrame(transfers)
+
+
+def _summary(unavailable, available=None):
+    unavailable = list(unavailable)
+    available = list(available) if available is not None else [max(1, 2 * u) for u in unavailable]
+    return pd.DataFrame({
+        'ΤΜΗΜΑ': [f"ΤΜΗΜΑ {i % 3}" for i in range(len(unavailable))],
+        'ΟΝΟΜΑ_ΟΜΑΔΑΣ': [f"ΟΜΑΔΑ {i:03d}" for i in range(len(unavailable))],
+        'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ': np.asarray(unavailable, dtype=np.int64),
+        'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ': np.asarray(available, dtype=np.int64),
+    })
+
+
+def _greedy(summary, ratio, cap):
+    analyzer = dashboard.UnavailableAppointmentsAnalyzer(None, team_summary=summary)
+    return analyzer.suggest_fair_redistribution(ratio, cap, solver='greedy')
+
+
+FIXED_CASES = {
+    'ties': _summary([50, 50, 50, 3, 3, 3, 10, 10]),
+    'single_donor_many_receivers': _summary([200, 1, 2, 2, 1, 0, 1, 3]),
+    'small_donors_cap_floor': _summary([6, 5, 5, 0, 0, 0, 1, 1], available=[6, 5, 5, 9, 9, 9, 9, 9]),
+    'zero_available_receivers': _summary([40, 35, 0, 0, 1, 12], available=[80, 70, 0, 0, 1, 20]),
+    'no_donors': _summary([7, 7, 7, 7]),
+    'single_group': _summary([12]),
+}
+
+
+@pytest.mark.parametrize('case', sorted(FIXED_CASES))
+@pytest.mark.parametrize('ratio, cap', [(0.30, 0.25), (0.6, 0.05), (0.05, 1.0), (0.0, 0.25)])
+def test_greedy_matches_reference_on_fixed_inputs(case, ratio, cap):
+    summary = FIXED_CASES[case]
+    pd.testing.assert_frame_equal(_greedy(summary, ratio, cap), _reference_greedy(summary, ratio, cap))
+
+
+@pytest.mark.parametrize('n_groups, seed', [(20, 0), (60, 2), (150, 2), (400, 5)])
+@pytest.mark.parametrize('ratio, cap', [(0.30, 0.25), (0.45, 0.1)])
+def test_greedy_matches_reference_on_synthetic_summaries(n_groups, seed, ratio, cap):
+    summary = dashboard.synthetic_team_summary(n_groups, seed=seed)
+    expected = _reference_greedy(summary, ratio, cap)
+    assert not expected.empty
+    pd.testing.assert_frame_equal(_greedy(summary, ratio, cap), expected)
+
+
+def test_greedy_respects_donor_cap_and_balances():
+    summary = dashboard.synthetic_team_summary(300, seed=3)
+    plan = _greedy(summary, 0.5, 0.2)
+    before = plan['Αδιάθετα Δότη (Αρχικά)']
+    moved = plan['Προτεινόμενη Μεταφορά']
+    assert (moved >= 1).all()
+    assert (moved <= np.maximum(1, (before * 0.2).astype(int))).all()
+    assert (plan['Νέα Αδιάθετα Δότη'] == before - moved).all()
+    assert (plan['Νέα Αδιάθετα Δότη'] >= 0).all()
+
+
+def test_allocate_greedy_edge_cases():
+    empty = dashboard._allocate_greedy(np.array([0, 0], dtype=np.int64), np.array([3, 2]), 0.25)
+    assert all(len(part) == 0 for part in empty)
+
+    none_needed = dashboard._allocate_greedy(np.array([10, 8], dtype=np.int64), np.array([0, 0]), 0.25)
+    assert all(len(part) == 0 for part in none_needed)
+
+    # Ο δότης των 3 δίνει 1 ανά μεταφορά (max(1, int(3 × 0.25))) έως να αδειάσει
+    donor_idx, receiver_idx, amounts, donor_before = dashboard._allocate_greedy(
+        np.array([3], dtype=np.int64), np.array([1, 1, 1, 1]), 0.25)
+    assert amounts.tolist() == [1, 1, 1]
+    assert receiver_idx.tolist() == [0, 1, 2]
+    assert donor_before.tolist() == [3, 2, 1]
+
+
+@pytest.mark.parametrize('solver', ['greedy', 'mincost'])
+def test_parallel_department_redistribution_matches_serial(solver, caplog):
+    analyzer = dashboard.UnavailableAppointmentsAnalyzer(None, team_summary=dashboard.synthetic_team_summary(600, seed=4))
+    serial = analyzer.suggest_department_redistribution(0.3, 0.25, solver=solver, parallel=False)
+    parallel = analyzer.suggest_department_redistribution(0.3, 0.25, solver=solver, parallel=True)
+    assert not serial.empty
+    assert 'σειριακή εκτέλεση' not in caplog.text  # το pool δούλεψε πράγματι
+    pd.testing.assert_frame_equal(parallel, serial)
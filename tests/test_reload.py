@@ -0,0 +1,87 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import dashboard
+
+
+ROWS = [('101', 'Α1', 3, 10, '2023-01'), ('101', 'Α2', 0, 8, '2023-01'),
+        ('102', 'Β1', 7, 10, '2023-02'), ('102', 'Β2', 1, 5, '2023-02')]
+
+
+def _line(row):
+    return ','.join(map(str, row)) + '\n'
+
+
+@pytest.fixture
+def watched(write_csv, tmp_path, monkeypatch):
+    """Holder + watcher πάνω σε έναν φάκελο με ένα CSV (χωρίς cache, έλεγχος χωρίς αναμονή)"""
+    path = write_csv('data.csv', ROWS)
+    loader = functools.partial(dashboard.load_unavailable_appointments_data, use_cache=False, source=str(tmp_path))
+    holder = dashboard.DatasetHolder(loader, files=lambda: dashboard.resolve_data_files(str(tmp_path)))
+    monkeypatch.setattr(dashboard, 'DATA', holder)  # η προθέρμανση της cache διαβάζει το DATA
+    assert holder.load() is not None
+    return path, holder, dashboard.DataFileWatcher(holder, interval=0)
+
+
+def _append(path, *lines):
+    with open(path, 'a', encoding='utf-8') as fh:
+        fh.write(''.join(lines))
+
+
+def test_malformed_append_does_not_block_reload(watched):
+    path, holder, watcher = watched
+    _append(path, _line(('103', 'Γ1', 4, 9, '2023-03')), '104,Δ1,2,6,2023-03,extra\n')
+
+    assert watcher.check() == 'append'
+    assert holder.status == 'error' and holder.error
+    assert holder.current.version == 1 and len(holder.current.df) == len(ROWS)
+    assert watcher.check() is None  # ίδιο χαλασμένο αρχείο - δεν ξαναδιαβάζεται σε κάθε έλεγχο
+
+    # Διόρθωση του αρχείου: ο επόμενος έλεγχος φορτώνει ξανά και το dashboard συνεχίζει
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write('ΤΜΗΜΑ,ΟΝΟΜΑ_ΟΜΑΔΑΣ,ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ,ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ,ΜΗΝΑΣ-ΕΤΟΣ\n')
+        fh.write(''.join(_line(row) for row in ROWS + [('103', 'Γ1', 4, 9, '2023-03')]))
+    assert watcher.check() == 'reload'
+    assert holder.status == 'ready' and holder.health()['status'] == 'ready'
+    assert len(holder.current.df) == len(ROWS) + 1
+
+
+def _assert_same_cube(cube, expected):
+    assert list(cube.departments) == list(expected.departments)
+    assert list(cube.teams) == list(expected.teams)
+    assert (cube.group_dept == expected.group_dept).all() and (cube.group_team == expected.group_team).all()
+    assert (cube.first_month, cube.n_months) == (expected.first_month, expected.n_months)
+    assert (cube.prefix == expected.prefix).all()
+
+
+def test_appended_extract_matches_full_reload(watched, tmp_path):
+    path, holder, watcher = watched
+    extract = str(tmp_path.parent / 'extract.csv')
+    dashboard.generate_synthetic_csv(extract, 300, n_departments=3, teams_per_department=2, months=3, seed=4)
+    columns = ['ΤΜΗΜΑ', 'ΟΝΟΜΑ_ΟΜΑΔΑΣ', 'ΑΔΙΑΘΕΤΑ_ΡΑΝΤΕΒΟΥ', 'ΔΙΑΘΕΣΙΜΑ_ΡΑΝΤΕΒΟΥ', 'ΜΗΝΑΣ-ΕΤΟΣ']
+    _append(path, pd.read_csv(extract)[columns].to_csv(index=False, header=False))
+
+    assert watcher.check() == 'append'
+    merged = holder.current
+    full = dashboard.Dataset(holder.loader(), version=merged.version)
+    assert merged.version == 2 and len(merged.df) == len(ROWS) + 300
+
+    pd.testing.assert_frame_equal(merged.df, full.df)
+    _assert_same_cube(merged.cube, full.cube)
+    assert merged.unique_departments == full.unique_departments and merged.unique_teams == full.unique_teams
+    for dept_list in [[], ['101'], ['ΤΜΗΜΑ 001', '102']]:
+        key = dashboard.normalize_filter_key(str(merged.min_date), str(merged.max_date), dept_list, [])
+        assert merged.cube.select_key(key).kpis() == full.cube.select_key(key).kpis()
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_cube_merged_matches_rebuild(synthetic_frame, seed):
+    rng = np.random.default_rng(seed)
+    # Το delta μοιράζεται μήνες και ομάδες με τη βάση και μπορεί να επεκτείνει τους μήνες προς τα πίσω
+    in_delta = rng.random(len(synthetic_frame)) < rng.uniform(0.02, 0.5)
+    base, delta = synthetic_frame[~in_delta], synthetic_frame[in_delta]
+    merged = dashboard.AppointmentsCube(base).merged(delta)
+    _assert_same_cube(merged, dashboard.AppointmentsCube(pd.concat([base, delta])))
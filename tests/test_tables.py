@@ -0,0 +1,30 @@
+import logging
+
+import pandas as pd
+import pytest
+
+from conftest import dashboard
+
+
+FRAME = pd.DataFrame({
+    'Τμήμα': ['Α', 'Β', 'Γ', 'Δ'],
+    'Ποσοστό %': [5.0, 12.5, 30.0, 18.0],
+    'Αδιάθετα': [3, 10, 25, 7],
+})
+
+
+def test_filter_query_applies_valid_terms():
+    result = dashboard.apply_table_query(FRAME, '{Ποσοστό %} > 10 && {Τμήμα} contains "Γ"')
+    assert result['Τμήμα'].tolist() == ['Γ']
+
+
+def test_malformed_term_is_skipped_and_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger='adiatheta'):
+        result = dashboard.apply_table_query(FRAME, '{Ποσοστό %} > abc && {Αδιάθετα} ge 7')
+    assert result['Τμήμα'].tolist() == ['Β', 'Γ', 'Δ']
+    assert 'abc' in caplog.text
+
+
+@pytest.mark.parametrize('query', ['{Ποσοστό %} > abc', '{Αδιάθετα} eq xyz', '{Αδιάθετα} le "7"'])
+def test_malformed_term_alone_keeps_all_rows(query):
+    pd.testing.assert_frame_equal(dashboard.apply_table_query(FRAME, query), FRAME)